@@ -7,13 +7,15 @@ and convert to Q8.8 hex format for Verilog
 import torch
 import os
 import sys
+from pathlib import Path
 
-def float_to_hex_q88(fval):
-    """Convert float to Q8.8 hex (16-bit signed)"""
-    ival = int(round(fval * 256))
-    if ival < 0:
-        ival = ival + 0x10000
-    return f"{(ival & 0xffff):04X}"
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tools"))
+from qformat import Q8_8, encode_hex, from_float  # noqa: E402
+
+def write_hex_q88(path, values):
+    """Write floats as Q8.8 hex (16-bit signed, upper-case), one per line"""
+    raw = from_float(values, Q8_8, rounding="nearest_even", overflow="wrap")
+    Path(path).write_bytes(encode_hex(raw, Q8_8).upper())
 
 # Check if checkpoint file exists
 checkpoint_path = "D--300.ckpt"  # Adjust path as needed
@@ -79,13 +81,8 @@ if layer3_weight_key and layer3_bias_key:
     weights_l3 = disc_state[layer3_weight_key].flatten().numpy()
     biases_l3 = disc_state[layer3_bias_key].numpy()
     
-    with open("hex_data/Discriminator_Layer3_Weights_All.hex", "w") as f:
-        for w in weights_l3:
-            f.write(float_to_hex_q88(w) + "\n")
-    
-    with open("hex_data/Discriminator_Layer3_Biases_All.hex", "w") as f:
-        for b in biases_l3:
-            f.write(float_to_hex_q88(b) + "\n")
+    write_hex_q88("hex_data/Discriminator_Layer3_Weights_All.hex", weights_l3)
+    write_hex_q88("hex_data/Discriminator_Layer3_Biases_All.hex", biases_l3)
     
     print(f"✓ Exported Layer 3: {len(weights_l3)} weights, {len(biases_l3)} biases")
 else:
@@ -100,13 +97,8 @@ if layer4_weight_key and layer4_bias_key:
     weights_l4 = disc_state[layer4_weight_key].flatten().numpy()
     biases_l4 = disc_state[layer4_bias_key].numpy()
     
-    with open("hex_data/Discriminator_Layer4_Weights_All.hex", "w") as f:
-        for w in weights_l4:
-            f.write(float_to_hex_q88(w) + "\n")
-    
-    with open("hex_data/Discriminator_Layer4_Biases_All.hex", "w") as f:
-        for b in biases_l4:
-            f.write(float_to_hex_q88(b) + "\n")
+    write_hex_q88("hex_data/Discriminator_Layer4_Weights_All.hex", weights_l4)
+    write_hex_q88("hex_data/Discriminator_Layer4_Biases_All.hex", biases_l4)
     
     print(f"✓ Exported Layer 4: {len(weights_l4)} weights, {len(biases_l4)} biases")
 else:
@@ -3,6 +3,11 @@
 Verify Layer 2 Discriminator Biases
 Compares expected vs actual hex values
 """
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tools"))
+from qformat import Q8_8, from_float, to_float, wrap  # noqa: E402
 
 # Expected biases from user (Float and Hex Q8.8)
 expected_biases = [
@@ -30,19 +35,11 @@ expected_biases = [
 
 def hex_to_float_q88(hex_val):
     """Convert 16-bit hex to Q8.8 float"""
-    # Handle as signed 16-bit
-    if hex_val > 0x7fff:
-        val = hex_val - 0x10000
-    else:
-        val = hex_val
-    return val / 256.0
+    return float(to_float(wrap(hex_val, Q8_8.width), Q8_8))
 
 def float_to_hex_q88(fval):
     """Convert Q8.8 float to 16-bit hex"""
-    ival = int(round(fval * 256))
-    if ival < 0:
-        ival = ival + 0x10000
-    return ival & 0xffff
+    return int(from_float(fval, Q8_8, rounding="nearest_even", overflow="wrap")) & 0xffff
 
 print("=" * 70)
 print("LAYER 2 DISCRIMINATOR BIAS VERIFICATION")
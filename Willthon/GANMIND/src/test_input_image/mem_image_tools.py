@@ -1,15 +1,30 @@
 #!/usr/bin/env python3
 """Utility helpers to convert 28x28 Q8.8 .mem files to human-friendly images and back.
 
-The script does not depend on external libraries. It writes/reads ASCII PGM (P2) files,
-which can be opened by most image viewers (e.g., IrfanView, GIMP) or converted to PNG
-with ImageMagick (`magick input.pgm output.png`).
+Hex decoding/encoding goes through tools/hex_io.py (numpy). It writes/reads
+PGM files, either ASCII (P2) or binary (P5, one byte per pixel, far smaller
+and faster to parse). Both open in most image viewers (e.g., IrfanView, GIMP)
+or convert to PNG with ImageMagick (`magick input.pgm output.png`).
+
+A .mem file may hold N frames back-to-back (N x 784 lines), as score_dataset
+and the ``batch-*`` / ``join`` / ``split`` commands do, so thousands of frames
+need not be thousands of files. Conversions work on (N, 784) uint8 arrays.
+Containers name their frames with ``// Image: <name>`` headers, the same
+layout ``ingest_images.py --mode q88`` writes, so either tool reads the other's.
 """
 from __future__ import annotations
 
 import argparse
+import re
+import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tools"))
+from hex_io import decode_hex, encode_hex, encode_image_frame, image_names  # noqa: E402
+from qformat import Q8_8, from_int, to_int, wrap  # noqa: E402
 
 WIDTH = 28
 HEIGHT = 28
@@ -18,72 +33,200 @@ Q_FRAC = 8
 MAX_INT = 255
 
 
+PGM_SUFFIX = ".pgm"
+MEM_SUFFIX = ".mem"
+SOURCE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp", PGM_SUFFIX, MEM_SUFFIX)  # dropped from header names
+_PGM_HEADER_RE = re.compile(rb"(P[25])((?:\s+|#[^\n]*\n)+)(\d+)((?:\s+|#[^\n]*\n)+)(\d+)"
+                            rb"((?:\s+|#[^\n]*\n)+)(\d+)\s")
+
+
+def q88_to_u8(values: np.ndarray) -> np.ndarray:
+    """Q8.8 words -> 8-bit pixels (integer part, clamped to 0..255)."""
+    return np.clip(to_int(wrap(values, Q8_8.width), Q8_8), 0, MAX_INT).astype(np.uint8)
+
+
+def u8_to_q88(pixels: np.ndarray) -> np.ndarray:
+    """8-bit pixels -> Q8.8 words (pixel << Q_FRAC, 16-bit wrap as in the .mem files)."""
+    return from_int(np.clip(np.asarray(pixels), 0, MAX_INT), Q8_8)
+
+
+def read_named_mem_frames(path: Path) -> Tuple[List[Optional[str]], np.ndarray]:
+    """``// Image:`` name (None where absent) and (N, 784) uint8 pixels of each frame."""
+    data = path.read_bytes()
+    try:
+        q88 = decode_hex(data)
+        if q88.size == 0 or q88.size % PIXELS:
+            raise ValueError(f"Expected a multiple of {PIXELS} entries, found {q88.size}")
+        names = image_names(data, PIXELS, q88.size // PIXELS)
+    except ValueError as exc:
+        raise ValueError(f"{path}: {exc}") from exc
+    return names, q88_to_u8(q88).reshape(-1, PIXELS)
+
+
+def read_mem_frames(path: Path) -> np.ndarray:
+    """All frames of a .mem file as an (N, 784) uint8 array."""
+    return read_named_mem_frames(path)[1]
+
+
+def write_mem_frames(path: Path, frames: np.ndarray) -> None:
+    """Write (N, 784) pixels as one back-to-back multi-frame .mem file."""
+    frames = np.asarray(frames)
+    if frames.size == 0 or frames.size % PIXELS:
+        raise ValueError(f"Expected a multiple of {PIXELS} pixels, found {frames.size}")
+    path.write_bytes(encode_hex(u8_to_q88(frames)))
+
+
 def read_mem(path: Path) -> List[int]:
-    lines = [ln.strip() for ln in path.read_text().splitlines() if ln.strip()]
-    if len(lines) != PIXELS:
-        raise ValueError(f"Expected {PIXELS} entries, found {len(lines)} in {path}")
-    values = []
-    for idx, token in enumerate(lines):
-        try:
-            raw = int(token, 16)
-        except ValueError as exc:
-            raise ValueError(f"Line {idx+1}: '{token}' is not hex") from exc
-        q88 = raw if raw < (1 << 15) else raw - (1 << 16)
-        val = max(0, min(MAX_INT, q88 >> Q_FRAC))
-        values.append(val)
-    return values
+    frames = read_mem_frames(path)
+    if frames.shape[0] != 1:
+        raise ValueError(f"Expected {PIXELS} entries, found {frames.size} in {path}")
+    return frames[0].tolist()
 
 
 def write_mem(path: Path, pixels: List[int]) -> None:
     if len(pixels) != PIXELS:
         raise ValueError(f"Expected {PIXELS} pixels, found {len(pixels)}")
-    lines = []
-    for val in pixels:
-        clamped = max(0, min(MAX_INT, val))
-        q88 = clamped << Q_FRAC
-        lines.append(f"{q88 & 0xFFFF:04x}")
-    path.write_text("\n".join(lines) + "\n")
+    write_mem_frames(path, np.asarray(pixels))
+
+
+def encode_pgm(pixels: np.ndarray, binary: bool = True) -> bytes:
+    """One 28x28 frame as P5 (binary) or P2 (ASCII) PGM bytes."""
+    frame = np.clip(np.asarray(pixels).reshape(HEIGHT, WIDTH), 0, MAX_INT).astype(np.uint8)
+    header = f"{'P5' if binary else 'P2'}\n{WIDTH} {HEIGHT}\n{MAX_INT}\n".encode()
+    if binary:
+        return header + frame.tobytes()
+    rows = "\n".join(" ".join(map(str, row)) for row in frame.tolist())
+    return header + rows.encode() + b"\n"
+
 
+def decode_pgm(data: bytes, name: str = "<pgm>") -> np.ndarray:
+    """A 28x28 P2 or P5 PGM as 784 uint8 pixels, rescaled from its max value to 0..255."""
+    match = _PGM_HEADER_RE.match(data)
+    if not match:
+        raise ValueError(f"{name}: only PGM (P2/P5) files are supported")
+    magic = match.group(1)
+    width, height, max_val = int(match.group(3)), int(match.group(5)), int(match.group(7))
+    if (width, height) != (WIDTH, HEIGHT):
+        raise ValueError(f"{name}: expected {WIDTH}x{HEIGHT}, got {width}x{height}")
+    if not 0 < max_val < 65536:
+        raise ValueError(f"{name}: invalid max value in PGM header")
+    body = data[match.end():]
+    if magic == b"P5":
+        dtype = np.dtype(np.uint8 if max_val < 256 else ">u2")
+        if len(body) < PIXELS * dtype.itemsize:
+            raise ValueError(f"{name}: expected {PIXELS} pixels, found {len(body) // dtype.itemsize}")
+        values = np.frombuffer(body, dtype=dtype, count=PIXELS).astype(np.float64)
+    else:
+        tokens = body.split()
+        if len(tokens) != PIXELS:
+            raise ValueError(f"{name}: expected {PIXELS} pixels, found {len(tokens)}")
+        values = np.array(tokens, dtype=np.float64)
+    return np.clip(np.rint(values * (MAX_INT / max_val)), 0, MAX_INT).astype(np.uint8)
 
-def write_pgm(path: Path, pixels: List[int]) -> None:
-    header = f"P2\n{WIDTH} {HEIGHT}\n{MAX_INT}\n"
-    body_lines = []
-    for row in range(HEIGHT):
-        start = row * WIDTH
-        row_vals = " ".join(str(pixels[start + col]) for col in range(WIDTH))
-        body_lines.append(row_vals)
-    path.write_text(header + "\n".join(body_lines) + "\n")
+
+def write_pgm(path: Path, pixels: List[int], binary: bool = False) -> None:
+    path.write_bytes(encode_pgm(np.asarray(pixels), binary))
 
 
 def read_pgm(path: Path) -> List[int]:
-    with path.open("r") as f:
-        magic = f.readline().strip()
-        if magic != "P2":
-            raise ValueError("Only ASCII PGM (P2) files are supported")
-        dims_line = f.readline().strip()
-        while dims_line.startswith("#"):
-            dims_line = f.readline().strip()
-        width, height = map(int, dims_line.split())
-        if (width, height) != (WIDTH, HEIGHT):
-            raise ValueError(f"Expected {WIDTH}x{HEIGHT}, got {width}x{height}")
-        max_val_line = f.readline().strip()
-        max_val = int(max_val_line)
-        if max_val <= 0:
-            raise ValueError("Invalid max value in PGM header")
-        tokens = [token for token in f.read().split() if token]
-    if len(tokens) != PIXELS:
-        raise ValueError(f"Expected {PIXELS} pixels, found {len(tokens)}")
-    pixels = []
-    for token in tokens:
-        val = int(token)
-        val = int(round(val * (MAX_INT / max_val)))
-        pixels.append(max(0, min(MAX_INT, val)))
-    return pixels
-
-
-def mem_to_pgm(mem_path: Path, pgm_path: Path) -> None:
+    return decode_pgm(path.read_bytes(), str(path)).tolist()
+
+
+def _frame_names(stem: str, count: int) -> List[str]:
+    return [stem] if count == 1 else [f"{stem}_{idx:05d}" for idx in range(count)]
+
+
+def _header_name(header: str) -> str:
+    """``cat.png`` (as ingest_images names a frame) -> ``cat``; other names unchanged."""
+    path = Path(header)
+    return path.stem if path.suffix.lower() in SOURCE_SUFFIXES else header
+
+
+def unique_names(names: Sequence[str]) -> List[str]:
+    """`names` with repeats suffixed ``_2``, ``_3``, ... so no two frames share a file."""
+    taken = set(names)
+    used: Set[str] = set()
+    out: List[str] = []
+    for name in names:
+        if name in used:
+            idx = 2
+            while f"{name}_{idx}" in taken:
+                idx += 1
+            name = f"{name}_{idx}"
+            taken.add(name)
+        used.add(name)
+        out.append(name)
+    return out
+
+
+def _check_unique(names: Sequence[str]) -> None:
+    if len(set(names)) != len(names):
+        dupes = sorted({name for name in names if names.count(name) > 1})
+        raise ValueError(f"Duplicate frame names would overwrite each other: {', '.join(dupes)}")
+
+
+def _inputs(source: Path, suffix: str) -> List[Path]:
+    if source.is_dir():
+        paths = sorted(p for p in source.iterdir() if p.suffix.lower() == suffix)
+        if not paths:
+            raise ValueError(f"No {suffix} files in {source}")
+        return paths
+    return [source]
+
+
+def load_mem_dir(source: Path) -> Tuple[List[str], np.ndarray]:
+    """(names, (N, 784) uint8) for a .mem file or every .mem file in a directory.
+
+    Frames are named from their ``// Image:`` headers, falling back to the
+    file stem; repeated names (e.g. a file listed twice) are made unique.
+    """
+    names: List[str] = []
+    chunks: List[np.ndarray] = []
+    for path in _inputs(source, MEM_SUFFIX):
+        headers, frames = read_named_mem_frames(path)
+        defaults = _frame_names(path.stem, frames.shape[0])
+        names.extend(_header_name(header) if header else default for header, default in zip(headers, defaults))
+        chunks.append(frames)
+    return unique_names(names), np.concatenate(chunks)
+
+
+def load_pgm_dir(source: Path) -> Tuple[List[str], np.ndarray]:
+    """(names, (N, 784) uint8) for a .pgm file or every .pgm file in a directory."""
+    paths = _inputs(source, PGM_SUFFIX)
+    frames = np.empty((len(paths), PIXELS), dtype=np.uint8)
+    for idx, path in enumerate(paths):
+        frames[idx] = decode_pgm(path.read_bytes(), str(path))
+    return [p.stem for p in paths], frames
+
+
+def write_pgm_dir(out_dir: Path, names: Sequence[str], frames: np.ndarray, binary: bool = True) -> None:
+    _check_unique(names)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, frame in zip(names, frames):
+        (out_dir / f"{name}{PGM_SUFFIX}").write_bytes(encode_pgm(frame, binary))
+
+
+def write_mem_dir(out_dir: Path, names: Sequence[str], frames: np.ndarray) -> None:
+    _check_unique(names)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, frame in zip(names, frames):
+        write_mem_frames(out_dir / f"{name}{MEM_SUFFIX}", frame)
+
+
+def write_container(path: Path, names: Sequence[str], frames: np.ndarray) -> None:
+    """Multi-frame .mem with a ``// Image: <name>`` header before each frame."""
+    frames = np.asarray(frames)
+    if frames.size == 0 or frames.size % PIXELS:
+        raise ValueError(f"Expected a multiple of {PIXELS} pixels, found {frames.size}")
+    frames = frames.reshape(-1, PIXELS)
+    if len(names) != frames.shape[0]:
+        raise ValueError(f"{len(names)} names for {frames.shape[0]} frames")
+    path.write_bytes(b"".join(encode_image_frame(name, u8_to_q88(frame)) for name, frame in zip(names, frames)))
+
+
+def mem_to_pgm(mem_path: Path, pgm_path: Path, binary: bool = False) -> None:
     pixels = read_mem(mem_path)
-    write_pgm(pgm_path, pixels)
+    write_pgm(pgm_path, pixels, binary)
     print(f"Wrote PGM image to {pgm_path}")
 
 
@@ -97,20 +240,64 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Convert between 28x28 Q8.8 .mem and PGM images")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
-    mem2pgm = sub.add_parser("mem-to-pgm", help="Convert .mem to ASCII PGM")
+    mem2pgm = sub.add_parser("mem-to-pgm", help="Convert .mem to PGM (ASCII P2 unless --p5)")
     mem2pgm.add_argument("mem", type=Path)
     mem2pgm.add_argument("pgm", type=Path)
+    mem2pgm.add_argument("--p5", action="store_true", help="Write binary P5")
 
-    pgm2mem = sub.add_parser("pgm-to-mem", help="Convert ASCII PGM to .mem")
+    pgm2mem = sub.add_parser("pgm-to-mem", help="Convert PGM (P2 or P5) to .mem")
     pgm2mem.add_argument("pgm", type=Path)
     pgm2mem.add_argument("mem", type=Path)
 
+    batch2pgm = sub.add_parser("batch-mem-to-pgm",
+                               help="Every frame of a (multi-frame) .mem file or directory -> one PGM each")
+    batch2pgm.add_argument("source", type=Path)
+    batch2pgm.add_argument("out_dir", type=Path)
+    batch2pgm.add_argument("--p2", action="store_true", help="Write ASCII P2 instead of binary P5")
+
+    batch2mem = sub.add_parser("batch-pgm-to-mem",
+                               help="A PGM file or directory -> one multi-frame .mem (or one per image with --split)")
+    batch2mem.add_argument("source", type=Path)
+    batch2mem.add_argument("out", type=Path)
+    batch2mem.add_argument("--split", action="store_true", help="Write one .mem per image into OUT (a directory)")
+
+    join = sub.add_parser("join", help="Concatenate .mem files (or a directory of them) into one container")
+    join.add_argument("out", type=Path)
+    join.add_argument("sources", type=Path, nargs="+")
+
+    split = sub.add_parser("split", help="Split a multi-frame .mem into one .mem per frame")
+    split.add_argument("mem", type=Path)
+    split.add_argument("out_dir", type=Path)
+
     args = parser.parse_args()
 
-    if args.cmd == "mem-to-pgm":
-        mem_to_pgm(args.mem, args.pgm)
-    elif args.cmd == "pgm-to-mem":
-        pgm_to_mem(args.pgm, args.mem)
+    try:
+        if args.cmd == "mem-to-pgm":
+            mem_to_pgm(args.mem, args.pgm, args.p5)
+        elif args.cmd == "pgm-to-mem":
+            pgm_to_mem(args.pgm, args.mem)
+        elif args.cmd == "batch-mem-to-pgm":
+            names, frames = load_mem_dir(args.source)
+            write_pgm_dir(args.out_dir, names, frames, binary=not args.p2)
+            print(f"Wrote {len(names)} PGM images to {args.out_dir}")
+        elif args.cmd == "batch-pgm-to-mem":
+            names, frames = load_pgm_dir(args.source)
+            if args.split:
+                write_mem_dir(args.out, names, frames)
+            else:
+                write_container(args.out, names, frames)
+            print(f"Wrote {len(names)} frames to {args.out}")
+        elif args.cmd == "join":
+            loaded = [load_mem_dir(source) for source in args.sources]
+            names = unique_names([name for chunk, _ in loaded for name in chunk])
+            write_container(args.out, names, np.concatenate([frames for _, frames in loaded]))
+            print(f"Wrote {len(names)} frames to {args.out}")
+        elif args.cmd == "split":
+            names, frames = load_mem_dir(args.mem)
+            write_mem_dir(args.out_dir, names, frames)
+            print(f"Wrote {len(names)} .mem files to {args.out_dir}")
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
 
 
 if __name__ == "__main__":
@@ -7,22 +7,24 @@ This script requires Pillow (pip install pillow) for PNG/JPG round-trips.
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 from typing import List, Tuple
 
+import numpy as np
 from PIL import Image, ImageDraw
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tools"))
+from hex_io import encode_hex, read_hex  # noqa: E402
+from qformat import Q8_8, from_int, to_int  # noqa: E402
+
 WIDTH = 28
 HEIGHT = 28
 PIXELS = WIDTH * HEIGHT
-Q_FRAC = 8
+MAX_INT = 255
 DEFAULT_PREFIX = Path(__file__).with_suffix("")
 
 
-def _clamp(val: int, lo: int = 0, hi: int = 255) -> int:
-    return max(lo, min(hi, val))
-
-
 def draw_number_two() -> List[int]:
     """Create a stylized '2' path using Pillow drawing primitives."""
     img = Image.new("L", (WIDTH, HEIGHT), 0)
@@ -36,33 +38,25 @@ def draw_number_two() -> List[int]:
     # Bottom bar
     draw.rectangle((4, 21, 24, 24), fill=255)
     # Anti-alias / blur not required, keep crisp for mem export
-    pixels = list(img.getdata())
-    return pixels
+    return np.asarray(img, dtype=np.uint8).reshape(-1).tolist()
 
 
 def write_mem(path: Path, pixels: List[int]) -> None:
     if len(pixels) != PIXELS:
         raise ValueError(f"Expected {PIXELS} pixels, got {len(pixels)}")
-    q_vals = [(pix << Q_FRAC) & 0xFFFF for pix in (_clamp(p) for p in pixels)]
-    path.write_text("\n".join(f"{val:04x}" for val in q_vals) + "\n")
+    path.write_bytes(encode_hex(from_int(np.clip(np.asarray(pixels), 0, MAX_INT), Q8_8)))
 
 
 def read_mem(path: Path) -> List[int]:
-    lines = [ln.strip() for ln in path.read_text().splitlines() if ln.strip()]
-    if len(lines) != PIXELS:
-        raise ValueError(f"Expected {PIXELS} entries, found {len(lines)}")
-    pixels: List[int] = []
-    for token in lines:
-        raw = int(token, 16)
-        if raw >= 1 << 15:
-            raw -= 1 << 16
-        pixels.append(_clamp(raw >> Q_FRAC))
-    return pixels
+    raw = read_hex(path)
+    if raw.size != PIXELS:
+        raise ValueError(f"Expected {PIXELS} entries, found {raw.size}")
+    return np.clip(to_int(raw, Q8_8), 0, MAX_INT).tolist()
 
 
 def pixels_to_image(pixels: List[int], png_path: Path, jpg_path: Path) -> None:
-    img = Image.new("L", (WIDTH, HEIGHT))
-    img.putdata([_clamp(p) for p in pixels])
+    frame = np.clip(np.asarray(pixels), 0, MAX_INT).astype(np.uint8).reshape(HEIGHT, WIDTH)
+    img = Image.fromarray(frame, mode="L")
     png_path.parent.mkdir(parents=True, exist_ok=True)
     jpg_path.parent.mkdir(parents=True, exist_ok=True)
     img.save(png_path, format="PNG")
@@ -72,8 +66,7 @@ def pixels_to_image(pixels: List[int], png_path: Path, jpg_path: Path) -> None:
 
 def image_to_pixels(image_path: Path) -> List[int]:
     img = Image.open(image_path).convert("L").resize((WIDTH, HEIGHT))
-    vals = list(img.getdata())
-    return [_clamp(v) for v in vals]
+    return np.asarray(img, dtype=np.uint8).reshape(-1).tolist()
 
 
 def generate_assets(output_dir: Path) -> Tuple[Path, Path, Path]:
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Full-domain lookup tables for the Q8.8 activation blocks.
+
+Every activation in the datapath maps one signed 16-bit word to another, so
+the whole function fits in a 65,536-entry int16 table. ``apply`` evaluates it
+over an array of any shape as a single gather, indexed by the input's
+two's-complement bit pattern.
+
+Covered blocks: ``sigmoid`` (src/interfaces/sigmoid_approx.v, the one on the
+datapath) and the Q8.8 modules of the repository-root activations.v,
+``lrelu_16``, ``sigmoid_16_3``, ``sigmoid_16_5`` and ``tanh_16_5``. Their
+parameters are the RTL's parameters/localparams plus LRELU_16's slope input
+``a`` (default 51, i.e. 0.2 as in the notebook's LeakyReLU).
+
+Tables are built from a vectorized closed form that mirrors the RTL and are
+saved as .npy under build/activation_lut. The file name is a digest of the
+activation name, its parameters and its formula revision, so changing
+SAT_LIMIT (or Q_FRAC, or ``a``) builds a new table instead of reusing a stale
+one.
+
+    python tools/activation_lut.py build          # build/refresh every table
+    python tools/activation_lut.py check          # tables vs closed form and RTL defaults
+    python tools/activation_lut.py list
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Tuple
+
+import numpy as np
+
+import qformat
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = REPO_ROOT / "build" / "activation_lut"
+RTL_DIR = REPO_ROOT / "src" / "interfaces"
+ACTIVATIONS_V = REPO_ROOT.parents[1] / "activations.v"
+
+DOMAIN = 1 << 16
+# Every int16 input, in table order (index i holds the word whose bits are i).
+DOMAIN_VALUES = np.arange(DOMAIN, dtype=np.uint16).view(np.int16)
+
+
+class Activation(NamedTuple):
+    name: str
+    formula: Callable[..., np.ndarray]  # (int32 array, **params) -> int32 array
+    defaults: Dict[str, int]
+    revision: int          # bump when `formula` changes
+    rtl: Tuple[Path, str, Dict[str, str]]  # (RTL file, module, param -> RTL parameter name)
+
+
+def sigmoid_formula(x: np.ndarray, q_frac: int, sat_limit: int) -> np.ndarray:
+    """sigmoid_approx: 0.5 + x/4, clamped to [0, 1] and saturated at +/-sat_limit."""
+    one_q = 1 << q_frac
+    approx = np.clip((1 << (q_frac - 1)) + (x >> 2), 0, one_q)
+    approx = np.where(x >= sat_limit, one_q, approx)
+    return np.where(x <= -sat_limit, 0, approx)
+
+
+def lrelu_16_formula(x: np.ndarray, a: int) -> np.ndarray:
+    """LRELU_16: x > 0 ? x : (a*x) >>> 8, with the product taken at the 16-bit assignment width."""
+    product = qformat.wrap(qformat.wrap(a, 16).astype(np.int64) * x, 16).astype(np.int32)
+    return np.where(x > 0, x, product >> 8)
+
+
+def sigmoid_16_3_formula(x: np.ndarray, pos2: int, neg2: int, one: int) -> np.ndarray:
+    """sigmoid_16_3: 0.5 + x/4 between NEG2 and POS2, 0 / ONE outside."""
+    return np.select([x > pos2, x < neg2], [one, 0], ((x >> 1) + one) >> 1)
+
+
+def sigmoid_16_5_formula(x: np.ndarray, b1: int, b2: int, nb1: int, nb2: int,
+                         one: int, a125: int, val15: int, val875: int) -> np.ndarray:
+    """sigmoid_16_5: five segments, slope 1/8 on the outer pair and 1/4 in the middle."""
+    return np.select(
+        [x >= b1, x <= nb1, (x > nb1) & (x < nb2), (x < b1) & (x > b2)],
+        [one, 0, ((((x << 1) + val15) >> 2) + a125) >> 1, ((((x << 1) - val15) >> 2) + val875) >> 1],
+        ((x >> 1) + one) >> 1,
+    )
+
+
+def tanh_16_5_formula(x: np.ndarray, b1: int, b2: int, nb1: int, nb2: int) -> np.ndarray:
+    """tanh_16_5: identity in the middle, slope 1/2 on the outer pair, +/-1.0 outside."""
+    return np.select(
+        [x >= b1, x <= nb1, (x > nb1) & (x < nb2), (x < b1) & (x > b2)],
+        [256, -256, ((x << 1) + 64) >> 2, ((x << 1) - 64) >> 2],
+        x,
+    )
+
+
+def _localparams(*names: str) -> Dict[str, str]:
+    return {name.lower(): name for name in names}
+
+
+ACTIVATIONS: Dict[str, Activation] = {
+    "sigmoid": Activation(
+        "sigmoid",
+        sigmoid_formula,
+        {"q_frac": 8, "sat_limit": 1024},
+        1,
+        (RTL_DIR / "sigmoid_approx.v", "sigmoid_approx", {"q_frac": "Q_FRAC", "sat_limit": "SAT_LIMIT"}),
+    ),
+    "lrelu_16": Activation(
+        "lrelu_16",
+        lrelu_16_formula,
+        {"a": 51},  # an input port, not a parameter
+        1,
+        (ACTIVATIONS_V, "LRELU_16", {}),
+    ),
+    "sigmoid_16_3": Activation(
+        "sigmoid_16_3",
+        sigmoid_16_3_formula,
+        {"pos2": 512, "neg2": -512, "one": 256},
+        1,
+        (ACTIVATIONS_V, "sigmoid_16_3", _localparams("POS2", "NEG2", "ONE")),
+    ),
+    "sigmoid_16_5": Activation(
+        "sigmoid_16_5",
+        sigmoid_16_5_formula,
+        {"b1": 448, "b2": 192, "nb1": -448, "nb2": -192, "one": 256, "a125": 32, "val15": 384, "val875": 224},
+        1,
+        (ACTIVATIONS_V, "sigmoid_16_5",
+         _localparams("B1", "B2", "NB1", "NB2", "ONE", "A125", "VAL15", "VAL875")),
+    ),
+    "tanh_16_5": Activation(
+        "tanh_16_5",
+        tanh_16_5_formula,
+        {"b1": 192, "b2": 64, "nb1": -192, "nb2": -64},
+        1,
+        (ACTIVATIONS_V, "tanh_16_5", _localparams("B1", "B2", "NB1", "NB2")),
+    ),
+}
+
+
+def _resolve(name: str, params: Dict[str, int]) -> Tuple[Activation, Dict[str, int]]:
+    try:
+        act = ACTIVATIONS[name]
+    except KeyError:
+        raise ValueError(f"Unknown activation {name!r}; known: {', '.join(sorted(ACTIVATIONS))}") from None
+    unknown = set(params) - set(act.defaults)
+    if unknown:
+        raise ValueError(f"{name}: unknown parameters {sorted(unknown)}")
+    return act, {**act.defaults, **{k: int(v) for k, v in params.items()}}
+
+
+def table_key(name: str, **params: int) -> str:
+    act, resolved = _resolve(name, params)
+    payload = json.dumps({"name": name, "params": resolved, "revision": act.revision}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def compute_table(name: str, **params: int) -> np.ndarray:
+    """Evaluate the closed form over the whole int16 domain."""
+    act, resolved = _resolve(name, params)
+    values = act.formula(DOMAIN_VALUES.astype(np.int32), **resolved)
+    return np.asarray(values).astype(np.int16)
+
+
+def table_path(name: str, cache_dir: Path = CACHE_DIR, **params: int) -> Path:
+    return cache_dir / f"{name}-{table_key(name, **params)}.npy"
+
+
+def _load_or_build(name: str, params: Tuple[Tuple[str, int], ...], cache_dir: Path) -> np.ndarray:
+    path = table_path(name, cache_dir, **dict(params))
+    if path.exists():
+        table = np.load(path)
+        if table.shape == (DOMAIN,) and table.dtype == np.int16:
+            return table
+    table = compute_table(name, **dict(params))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp.npy")
+    np.save(tmp, table)
+    tmp.replace(path)
+    return table
+
+
+@lru_cache(maxsize=None)
+def _cached(name: str, params: Tuple[Tuple[str, int], ...], cache_dir: Path) -> np.ndarray:
+    table = _load_or_build(name, params, cache_dir)
+    table.setflags(write=False)
+    return table
+
+
+def get_table(name: str, cache_dir: Path = CACHE_DIR, **params: int) -> np.ndarray:
+    """The (65536,) int16 table for `name`, from memory, disk or freshly built."""
+    _, resolved = _resolve(name, params)
+    return _cached(name, tuple(sorted(resolved.items())), cache_dir)
+
+
+def apply(name: str, values: np.ndarray, **params: int) -> np.ndarray:
+    """Activation over an array of any shape; inputs are taken as int16 words."""
+    table = get_table(name, **params)
+    words = np.asarray(values).astype(np.int16, copy=False)
+    return table[words.view(np.uint16)]
+
+
+def rtl_defaults(act: Activation) -> Dict[str, int]:
+    """Parameter/localparam values declared by the activation's RTL module."""
+    from cycle_estimator import module_params
+
+    rtl_file, module, mapping = act.rtl
+    declared = module_params(rtl_file, module)
+    return {param: declared[rtl_name] for param, rtl_name in mapping.items() if rtl_name in declared}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build and check full-domain activation LUTs")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="Build the table for every activation at its RTL defaults")
+    sub.add_parser("check", help="Compare cached tables with the closed form and the RTL")
+    sub.add_parser("list", help="Show activations, parameters and cache files")
+    args = parser.parse_args()
+
+    failures = 0
+    for act in ACTIVATIONS.values():
+        params = {**act.defaults, **rtl_defaults(act)}
+        path = table_path(act.name, args.cache_dir, **params)
+        if args.command == "list":
+            state = "cached" if path.exists() else "missing"
+            print(f"{act.name:12s} rev {act.revision}  {json.dumps(params, sort_keys=True)}  {path.name} ({state})")
+        elif args.command == "build":
+            get_table(act.name, args.cache_dir, **params)
+            print(f"{act.name:12s} -> {path}")
+        else:
+            if params != act.defaults:
+                print(f"[WARN] {act.name}: RTL defaults {params} differ from the model's {act.defaults}")
+            table = get_table(act.name, args.cache_dir, **params)
+            if not np.array_equal(table, compute_table(act.name, **params)):
+                print(f"[FAIL] {act.name}: {path.name} differs from the closed form")
+                failures += 1
+            else:
+                print(f"[ OK ] {act.name}: {DOMAIN} entries")
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""Benchmarks for the Python tooling on the regression path, with a baseline.
+
+Each benchmark prepares its inputs once, then times the operation ``--repeat``
+times (the median is reported) and measures peak traced memory in one extra
+run under tracemalloc. Inputs come in two sizes: the real data in the tree
+(weight dumps, test_circle.mem, the digit '2' fixture) and a scaled-up
+variant whose size grows with ``--scale``.
+
+    python tools/bench.py                  # run, compare with build/bench_baseline.json
+    python tools/bench.py --save           # run and record the baseline
+    python tools/bench.py --only 'hex_*'   # subset (fnmatch on names)
+
+With a baseline, a benchmark fails when its median time exceeds the baseline by
+more than ``--threshold`` percent, or its peak memory by more than
+``--mem-threshold`` percent. The exit code is 1 on any regression. Benchmarks
+that are missing from the baseline are reported as new and never fail.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import fnmatch
+import importlib.util
+import io
+import json
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+import compute_gan_serial_golden as golden
+import hex_io
+from expand_layers import expand, select_layers
+from gan_model import GANModel
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BASELINE_PATH = REPO_ROOT / "build" / "bench_baseline.json"
+CIRCLE_MEM = REPO_ROOT / "src" / "test_input_image" / "test_circle.mem"
+NUMBER_TWO_PNG = REPO_ROOT / "src" / "test_input_number_two" / "test_number_two.png"
+
+Setup = Callable[[Path, int], Callable[[], object]]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Setup  # (scratch dir, scale) -> timed callable
+    help: str
+
+
+class Result(NamedTuple):
+    name: str
+    median_s: float
+    min_s: float
+    peak_bytes: int
+
+
+def _load_script(path: Path) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+def _quiet(fn: Callable[[], object]) -> Callable[[], object]:
+    def run() -> object:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def _golden_single(scratch: Path, scale: int) -> Callable[[], object]:
+    gold = golden.load_golden_weights("hex", as_lists=False)
+    return lambda: golden.compute_stages(gold, golden.ENGINES["numpy"])
+
+
+def _golden_batch(scratch: Path, scale: int) -> Callable[[], object]:
+    gold = golden.load_golden_weights("hex", as_lists=False)
+    seeds = golden.lfsr_seed_matrix(64 * scale)
+    return lambda: golden.compute_stages_batch(gold, seeds)
+
+
+def _model_pipeline(scratch: Path, scale: int) -> Callable[[], object]:
+    model = GANModel.load("hex")
+    seeds = golden.lfsr_seed_matrix(64 * scale)
+    return lambda: model.full_pipeline(seeds)
+
+
+def _golden_weights(scratch: Path, scale: int) -> Callable[[], object]:
+    return lambda: golden.load_golden_weights("hex", as_lists=False)
+
+
+def _hex_scaled_file(scratch: Path, scale: int) -> Path:
+    path = scratch / f"scaled_{scale}.hex"
+    if not path.exists():
+        values = np.random.default_rng(0).integers(-32768, 32768, (1 << 20) * scale)
+        hex_io.write_hex(path, values)
+    return path
+
+
+def _hex_load(scratch: Path, scale: int) -> Callable[[], object]:
+    path = golden.HEX_DIR / golden.WEIGHT_FILES["gen_l2_w"]
+    return lambda: golden.load_hex(path)
+
+
+def _hex_load_scaled(scratch: Path, scale: int) -> Callable[[], object]:
+    path = _hex_scaled_file(scratch, scale)
+    return lambda: hex_io.read_hex(path)
+
+
+def _hex_write_scaled(scratch: Path, scale: int) -> Callable[[], object]:
+    values = hex_io.read_hex(_hex_scaled_file(scratch, scale))
+    out = scratch / "write.hex"
+    return lambda: golden.write_hex(out, values)
+
+
+def _mem_image(scratch: Path, scale: int) -> Callable[[], object]:
+    tools = _load_script(REPO_ROOT / "src" / "test_input_image" / "mem_image_tools.py")
+    frames = 64 * scale
+    pgm, mem = scratch / "circle.pgm", scratch / "circle.mem"
+
+    def run() -> None:
+        for _ in range(frames):
+            tools.write_pgm(pgm, tools.read_mem(CIRCLE_MEM))
+            tools.write_mem(mem, tools.read_pgm(pgm))
+    return run
+
+
+def _mem_image_batch(scratch: Path, scale: int) -> Callable[[], object]:
+    tools = _load_script(REPO_ROOT / "src" / "test_input_image" / "mem_image_tools.py")
+    frames = np.repeat(tools.read_mem_frames(CIRCLE_MEM), 64 * scale, axis=0)
+    names = [f"f{idx:05d}" for idx in range(frames.shape[0])]
+    container, pgm_dir = scratch / "batch.mem", scratch / "batch_pgm"
+    tools.write_container(container, names, frames)
+
+    def run() -> None:
+        tools.write_pgm_dir(pgm_dir, *tools.load_mem_dir(container))
+        tools.write_container(container, *tools.load_pgm_dir(pgm_dir))
+    return run
+
+
+def _number_two(scratch: Path, scale: int) -> Callable[[], object]:
+    tools = _load_script(REPO_ROOT / "src" / "test_input_number_two" / "number_two_tools.py")
+    frames = 16 * scale
+    png, jpg, mem = scratch / "two.png", scratch / "two.jpg", scratch / "two.mem"
+
+    def run() -> None:
+        for _ in range(frames):
+            tools.image_to_mem(NUMBER_TWO_PNG, mem)
+            tools.mem_to_images(mem, png, jpg)
+    return _quiet(run)
+
+
+def _expand_disc(scratch: Path, scale: int) -> Callable[[], object]:
+    out = scratch / "expanded"
+    return lambda: expand(select_layers(["disc"]), out_dir=out)
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    b.name: b
+    for b in (
+        Benchmark("golden_single", _golden_single, "compute_stages for the testbench seed, numpy engine"),
+        Benchmark("golden_batch", _golden_batch, "compute_stages_batch over 64*scale LFSR seeds"),
+        Benchmark("model_pipeline", _model_pipeline, "warm GANModel.full_pipeline over 64*scale seeds"),
+        Benchmark("golden_weights", _golden_weights, "load_golden_weights from the raw hex dumps"),
+        Benchmark("hex_load", _hex_load, "load_hex of the 64K-entry gen_l2 weight dump"),
+        Benchmark("hex_load_scaled", _hex_load_scaled, "read_hex of 1M*scale values"),
+        Benchmark("hex_write_scaled", _hex_write_scaled, "write_hex of 1M*scale values"),
+        Benchmark("mem_image_roundtrip", _mem_image, "mem -> PGM -> mem, 64*scale frames"),
+        Benchmark("mem_image_batch", _mem_image_batch, "multi-frame mem -> P5 directory -> mem, 64*scale frames"),
+        Benchmark("number_two_roundtrip", _number_two, "png -> mem -> png/jpg, 16*scale frames"),
+        Benchmark("expand_disc", _expand_disc, "expand_layers --layers disc"),
+    )
+}
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def measure(bench: Benchmark, scratch: Path, scale: int, repeat: int) -> Result:
+    fn = bench.setup(scratch, scale)
+    fn()  # warm-up: imports, page cache, lazy tables
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(bench.name, statistics.median(times), min(times), peak)
+
+
+def compare(results: List[Result], baseline: Dict[str, dict], threshold: float,
+            mem_threshold: float) -> List[str]:
+    """One line per regression beyond the thresholds."""
+    failures: List[str] = []
+    for res in results:
+        base = baseline.get(res.name)
+        if base is None:
+            continue
+        slower = 100.0 * (res.median_s / base["median_s"] - 1.0) if base["median_s"] else 0.0
+        bigger = 100.0 * (res.peak_bytes / base["peak_bytes"] - 1.0) if base["peak_bytes"] else 0.0
+        if slower > threshold:
+            failures.append(f"{res.name}: median {res.median_s * 1e3:.2f} ms is {slower:+.1f}% vs baseline")
+        if bigger > mem_threshold:
+            failures.append(f"{res.name}: peak {res.peak_bytes / 1e6:.2f} MB is {bigger:+.1f}% vs baseline")
+    return failures
+
+
+def load_baseline(path: Path) -> Optional[dict]:
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the golden/hex/image tooling")
+    parser.add_argument("--only", action="append", default=None, help="fnmatch pattern on names (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark (median reported)")
+    parser.add_argument("--scale", type=int, default=1, help="Size multiplier for the scaled inputs")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="Record this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Allowed median slowdown in percent")
+    parser.add_argument("--mem-threshold", type=float, default=20.0, help="Allowed peak memory growth in percent")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for bench in BENCHMARKS.values():
+            print(f"{bench.name:22s} {bench.help}")
+        return
+    if args.repeat <= 0 or args.scale <= 0:
+        raise SystemExit("--repeat and --scale must be positive")
+    selected = [b for b in BENCHMARKS.values() if not args.only or any(fnmatch.fnmatchcase(b.name, p) for p in args.only)]
+    if not selected:
+        raise SystemExit("No benchmark matches --only")
+
+    baseline = None if args.save else load_baseline(args.baseline)
+    if baseline is not None and baseline.get("scale") != args.scale:
+        raise SystemExit(f"Baseline was recorded at --scale {baseline.get('scale')}; rerun with that scale or --save")
+    entries = (baseline or {}).get("benchmarks", {})
+
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory(prefix="ganmind_bench_") as tmp:
+        for bench in selected:
+            res = measure(bench, Path(tmp), args.scale, args.repeat)
+            results.append(res)
+            note = ""
+            if res.name in entries and entries[res.name]["median_s"]:
+                note = f"  ({100.0 * (res.median_s / entries[res.name]['median_s'] - 1.0):+.1f}% vs baseline)"
+            elif baseline is not None:
+                note = "  (new)"
+            print(f"{res.name:22s} median {res.median_s * 1e3:10.2f} ms  min {res.min_s * 1e3:10.2f} ms  "
+                  f"peak {res.peak_bytes / 1e6:8.2f} MB{note}")
+
+    if args.save:
+        payload = {
+            "scale": args.scale,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "benchmarks": {res.name: res._asdict() for res in results},
+        }
+        if args.baseline.exists():
+            old = json.loads(args.baseline.read_text())
+            if old.get("scale") == args.scale:
+                payload["benchmarks"] = {**old.get("benchmarks", {}), **payload["benchmarks"]}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(payload, indent=2))
+        print(f"Saved baseline for {len(results)} benchmarks to {args.baseline}")
+        return
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save to record one")
+        return
+    failures = compare(results, entries, args.threshold, args.mem_threshold)
+    for line in failures:
+        print(f"[REGRESS] {line}")
+    if failures:
+        raise SystemExit(1)
+    print(f"No regressions beyond {args.threshold:g}% time / {args.mem_threshold:g}% memory")
+
+
+if __name__ == "__main__":
+    main()
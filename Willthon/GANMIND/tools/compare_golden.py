@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Compare simulator stage dumps against the golden snapshots, stage by stage.
+
+tb/gan_serial_tb.v only prints PASS/FAIL. For triage, dump each stage the
+testbench checks with $writememh (or $fdisplay "%h") to a directory, using
+the golden file names (gan_seed.hex, gan_gen_features.hex, ...). Then run:
+
+    python tools/compare_golden.py build/sim_dump
+
+A dump may hold several frames back to back (``//`` comment lines between
+them are fine). Each file is read once, in blocks of whole frames, and every
+block is compared against the golden in a single vectorized operation. The
+golden is either one flat directory, shared by every frame, or a
+``--batch`` root written by compute_gan_serial_golden.py
+(seed_00000/, seed_00001/, ...), where frame i is checked against seed i;
+frames past the last seed set are counted and fail the stage.
+
+For every stage the report gives the frames compared, the mismatching frames
+and values, the first divergence (frame, index, expected, got) and the max
+ULP error (the largest absolute difference in Q8.8 LSBs). x/z words in a
+dump count as mismatches and are reported separately.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from compute_gan_serial_golden import GOLDEN_DIR, GOLDEN_OUTPUTS
+from hex_io import decode_hex, read_hex
+
+BLOCK_VALUES = 1 << 20  # values decoded per streaming step
+_UNKNOWN_RE = re.compile(rb"[xXzZ]")
+_COMMENT_RE = re.compile(rb"//[^\n]*")
+
+
+class Divergence(NamedTuple):
+    frame: int
+    index: int
+    expected: int
+    got: Optional[int]  # None for an x/z word
+
+
+class StageReport(NamedTuple):
+    stage: str
+    length: int
+    frames: int
+    bad_frames: int
+    mismatches: int
+    unknown: int
+    max_ulp: int
+    first: Optional[Divergence]
+    trailing: int  # values after the last complete frame
+    unmatched: int  # frames past the last golden set of a --batch root
+
+    @property
+    def ok(self) -> bool:
+        return self.frames > 0 and self.mismatches == 0 and self.trailing == 0 and self.unmatched == 0
+
+
+def load_golden(golden: Path) -> Dict[str, np.ndarray]:
+    """{stage file: (S, length) int16} from a flat golden dir or a batch root."""
+    seed_dirs = sorted(p for p in golden.glob("seed_*") if p.is_dir())
+    sources = seed_dirs or [golden]
+    out: Dict[str, np.ndarray] = {}
+    for name in GOLDEN_OUTPUTS:
+        paths = [src / name for src in sources]
+        if all(p.exists() for p in paths):
+            out[name] = np.stack([read_hex(p) for p in paths])
+    return out
+
+
+def _decode_block(data: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode hex text; x/z words become 0 with their unknown flag set."""
+    if not _UNKNOWN_RE.search(data):
+        values = decode_hex(data)
+        return values, np.zeros(values.size, dtype=bool)
+    tokens = _COMMENT_RE.sub(b"", data).split()
+    unknown = np.fromiter((_UNKNOWN_RE.search(tok) is not None for tok in tokens), dtype=bool, count=len(tokens))
+    cleaned = b"\n".join(b"0" if bad else tok for tok, bad in zip(tokens, unknown.tolist()))
+    return decode_hex(cleaned), unknown
+
+
+def compare_stage(name: str, dump: Path, golden: np.ndarray) -> StageReport:
+    """Stream `dump` in blocks of whole frames and diff each block against `golden`."""
+    length = golden.shape[1]
+    lines_per_block = max(length, BLOCK_VALUES // length * length)
+    frames = bad_frames = mismatches = unknown_total = max_ulp = unmatched = 0
+    first: Optional[Divergence] = None
+    carry_vals = np.zeros(0, dtype=np.int16)
+    carry_unk = np.zeros(0, dtype=bool)
+
+    with dump.open("rb") as fh:
+        while True:
+            lines = list(islice(fh, lines_per_block))
+            if not lines:
+                break
+            values, unknown = _decode_block(b"".join(lines))
+            values = np.concatenate((carry_vals, values))
+            unknown = np.concatenate((carry_unk, unknown))
+            count = values.size // length
+            whole = count * length
+            carry_vals, carry_unk = values[whole:], unknown[whole:]
+            if not count:
+                continue
+
+            if golden.shape[0] > 1 and frames + count > golden.shape[0]:
+                keep = max(golden.shape[0] - frames, 0)
+                unmatched += count - keep
+                count, whole = keep, keep * length
+                if not count:
+                    continue
+
+            got = values[:whole].reshape(count, length).astype(np.int32)
+            unk = unknown[:whole].reshape(count, length)
+            frame_ids = np.arange(frames, frames + count)
+            if golden.shape[0] == 1:
+                exp = np.broadcast_to(golden[0].astype(np.int32), got.shape)
+            else:
+                exp = golden[frame_ids].astype(np.int32)
+
+            diff = np.abs(got - exp)
+            wrong = (diff != 0) | unk
+            mismatches += int(wrong.sum())
+            unknown_total += int(unk.sum())
+            bad_frames += int(wrong.any(axis=1).sum())
+            known_diff = np.where(unk, 0, diff)
+            if known_diff.size:
+                max_ulp = max(max_ulp, int(known_diff.max()))
+            if first is None and wrong.any():
+                row, col = np.unravel_index(int(np.argmax(wrong)), wrong.shape)
+                first = Divergence(
+                    frame=int(frame_ids[row]),
+                    index=int(col),
+                    expected=int(exp[row, col]),
+                    got=None if unk[row, col] else int(got[row, col]),
+                )
+            frames += count
+
+    return StageReport(name, length, frames, bad_frames, mismatches, unknown_total, max_ulp, first,
+                       carry_vals.size, unmatched)
+
+
+def compare(sim_dir: Path, golden_dir: Path = GOLDEN_DIR) -> Tuple[List[StageReport], List[str]]:
+    """Reports for every stage dumped in `sim_dir`, plus the stages with no dump."""
+    golden = load_golden(golden_dir)
+    reports: List[StageReport] = []
+    missing: List[str] = []
+    for name in GOLDEN_OUTPUTS:
+        dump = sim_dir / name
+        if name not in golden or not dump.exists():
+            missing.append(name)
+            continue
+        reports.append(compare_stage(name, dump, golden[name]))
+    return reports, missing
+
+
+def _fmt_first(first: Optional[Divergence]) -> str:
+    if first is None:
+        return "-"
+    got = "x" if first.got is None else f"{first.got & 0xFFFF:04x}"
+    return f"frame {first.frame} idx {first.index}: exp {first.expected & 0xFFFF:04x} got {got}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Diff simulator stage dumps against golden snapshots")
+    parser.add_argument("sim_dir", type=Path, help="Directory with gan_*.hex stage dumps")
+    parser.add_argument("--golden", type=Path, default=GOLDEN_DIR,
+                        help="Golden dir, or a --batch root with seed_* subdirs (default: tb/golden)")
+    parser.add_argument("--json", type=Path, default=None, help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    reports, missing = compare(args.sim_dir, args.golden)
+    for rep in reports:
+        status = "PASS" if rep.ok else "FAIL"
+        print(f"[{status}] {rep.stage:22s} frames={rep.frames:<6d} bad_frames={rep.bad_frames:<6d} "
+              f"mismatches={rep.mismatches:<8d} x/z={rep.unknown:<6d} max_ulp={rep.max_ulp:<6d} "
+              f"first={_fmt_first(rep.first)}")
+        if rep.trailing:
+            print(f"       {rep.trailing} trailing values do not form a complete {rep.length}-value frame")
+        if rep.unmatched:
+            print(f"       {rep.unmatched} frames past the last golden set were not compared")
+    for name in missing:
+        print(f"[SKIP] {name:22s} no dump or no golden")
+
+    if args.json:
+        payload = {
+            "stages": [
+                {**rep._asdict(), "first": rep.first._asdict() if rep.first else None, "ok": rep.ok}
+                for rep in reports
+            ],
+            "missing": missing,
+        }
+        args.json.write_text(json.dumps(payload, indent=2))
+    if not reports or not all(rep.ok for rep in reports):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
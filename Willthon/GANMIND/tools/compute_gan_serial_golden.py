@@ -6,21 +6,63 @@ runs a software model of the generator + discriminator pipelines using the same
 hex weight/bias dumps that the RTL consumes. The resulting vectors/scores are
 written to tb/golden/*.hex so the testbench can compare every major pipeline
 stage against a known-good snapshot.
+
+The pipeline is modelled as a small DAG (PIPELINE). Stage results are cached in
+build/golden_manifest.json under a key derived from their parameters, weight
+file hashes and upstream keys, so a rerun only recomputes stale stages and only
+rewrites golden files whose contents actually changed.
 """
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
 from pathlib import Path
-from typing import List, Sequence, Tuple
+from typing import Callable, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy engine is optional; the python engine has no deps
+    np = None
+
+if np is not None:
+    # The numpy engine's helpers all need numpy, so they are only importable with
+    # it; any ImportError from them is a real bug and must not be swallowed above.
+    import activation_lut
+    import gather_plan
+    import hex_io
+    import lfsr_jump
+    import qformat
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 HEX_DIR = REPO_ROOT / "src" / "layers" / "hex_data"
 GOLDEN_DIR = REPO_ROOT / "tb" / "golden"
+MANIFEST_PATH = REPO_ROOT / "build" / "golden_manifest.json"
 
 DATA_WIDTH = 16
 Q_FRAC = 8
 ONE_Q = 1 << Q_FRAC
 HALF_Q = 1 << (Q_FRAC - 1)
 SIGMOID_SAT = 1024  # matches sigmoid_approx SAT_LIMIT
+# Each int16 x int16 product is at most 2**30 in magnitude, so a float64 dot
+# product of up to 2**22 terms stays below 2**53 and is computed exactly.
+EXACT_FLOAT_TERMS = 1 << 22
+
+# Weight/bias tensors consumed by the RTL, keyed as the dense-layer callers use them.
+WEIGHT_FILES: Dict[str, str] = {
+    "gen_l1_w": "layer1_gen_weights.hex",
+    "gen_l1_b": "layer1_gen_bias.hex",
+    "gen_l2_w": "Generator_Layer2_Weights_All.hex",
+    "gen_l2_b": "Generator_Layer2_Biases_All.hex",
+    "gen_l3_w": "Generator_Layer3_Weights_All.hex",
+    "gen_l3_b": "Generator_Layer3_Biases_All.hex",
+    "disc_l1_w": "Discriminator_Layer1_Weights_All.hex",
+    "disc_l1_b": "Discriminator_Layer1_Biases_All.hex",
+    "disc_l2_w": "Discriminator_Layer2_Weights_All.hex",
+    "disc_l2_b": "Discriminator_Layer2_Biases_All.hex",
+    "disc_l3_w": "Discriminator_Layer3_Weights_All.hex",
+    "disc_l3_b": "Discriminator_Layer3_Biases_All.hex",
+}
 
 
 def ensure_dir(path: Path) -> None:
@@ -47,6 +89,8 @@ def slice_q(acc: int) -> int:
 
 
 def load_hex(path: Path) -> List[int]:
+    if np is not None:
+        return hex_io.read_hex(path).tolist()
     values: List[int] = []
     with path.open() as fh:
         for raw in fh:
@@ -58,6 +102,9 @@ def load_hex(path: Path) -> List[int]:
 
 
 def write_hex(path: Path, values: Sequence[int]) -> None:
+    if np is not None:
+        hex_io.write_hex(path, values)
+        return
     with path.open("w") as fh:
         for val in values:
             fh.write(f"{val & 0xFFFF:04x}\n")
@@ -91,6 +138,55 @@ def dense_layer(
     return out
 
 
+def dense_layer_numpy(
+    vec_in: Sequence[int],
+    weights: Sequence[int],
+    bias: Sequence[int],
+    in_count: int,
+) -> List[int]:
+    """Vectorized equivalent of dense_layer.
+
+    Every product fits in 31 bits and a 32-bit two's-complement accumulator is
+    plain arithmetic modulo 2**32, so summing exactly in int64 and wrapping once
+    yields the same bits as wrapping after every MAC.
+    """
+    vec = np.asarray(vec_in[:in_count], dtype=np.int64)
+    return dense_layer_batch(vec[np.newaxis, :], weights, bias, in_count)[0].tolist()
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy engine requested but numpy is not installed")
+
+
+def dense_layer_batch(
+    mat_in: "np.ndarray",
+    weights: Sequence[int],
+    bias: Sequence[int],
+    in_count: int,
+) -> "np.ndarray":
+    """Run dense_layer over every row of an (N, in_count) matrix in one matmul."""
+    _require_numpy()
+    out_count = len(bias)
+    vecs = np.asarray(mat_in)[:, :in_count]
+    mat = np.asarray(weights[: out_count * in_count]).reshape(out_count, in_count)
+    if in_count <= EXACT_FLOAT_TERMS:
+        # BLAS float64 matmul is exact here and far faster than numpy's int64 loop.
+        dots = (vecs.astype(np.float64) @ mat.T.astype(np.float64)).astype(np.int64)
+    else:
+        dots = vecs.astype(np.int64) @ mat.T.astype(np.int64)
+    acc = qformat.wrap((np.asarray(bias, dtype=np.int64) << Q_FRAC) + dots, 32)
+    return qformat.requantize(acc, qformat.Q16_16, qformat.Q8_8)
+
+
+DenseFn = Callable[[Sequence[int], Sequence[int], Sequence[int], int], List[int]]
+
+ENGINES: Dict[str, DenseFn] = {
+    "python": dense_layer,
+    "numpy": dense_layer_numpy,
+}
+
+
 def sigmoid_vector(vec: Sequence[int]) -> List[int]:
     result: List[int] = []
     for sample in vec:
@@ -114,6 +210,27 @@ def lut_expand(vec: Sequence[int], out_count: int) -> List[int]:
     return expanded
 
 
+def sigmoid_batch(mat: "np.ndarray") -> "np.ndarray":
+    """sigmoid_vector over an array of any shape, as one gather from the full-domain LUT.
+
+    Inputs are taken as 16-bit words, as sigmoid_approx sees them.
+    """
+    _require_numpy()
+    return activation_lut.apply("sigmoid", mat, q_frac=Q_FRAC, sat_limit=SIGMOID_SAT)
+
+
+def lut_expand_batch(mat: "np.ndarray", out_count: int) -> "np.ndarray":
+    """Vectorized lut_expand applied to every row of an (N, in_count) matrix."""
+    _require_numpy()
+    return gather_plan.gather(mat, "rom", out_count)
+
+
+def frame_sampler_batch(mat: "np.ndarray", out_count: int = 256) -> "np.ndarray":
+    """Vectorized frame_sampler applied to every row of an (N, input_count) matrix."""
+    _require_numpy()
+    return gather_plan.gather(mat, "accumulator", out_count)
+
+
 def build_frame_pattern() -> List[int]:
     frame: List[int] = []
     for idx in range(28 * 28):
@@ -143,58 +260,395 @@ def frame_sampler(frame: Sequence[int], out_count: int = 256) -> List[int]:
     return out
 
 
-def discriminator_head(vec: Sequence[int], golden: dict) -> Tuple[int, int]:
-    l1 = dense_layer(vec, golden["disc_l1_w"], golden["disc_l1_b"], 256)
-    l2 = dense_layer(l1, golden["disc_l2_w"], golden["disc_l2_b"], 128)
-    l3_acc = wrap32(golden["disc_l3_b"][0] << Q_FRAC)
+def discriminator_head(
+    vec: Sequence[int],
+    golden: dict,
+    dense: DenseFn = dense_layer,
+) -> Tuple[int, int]:
+    l1 = dense(vec, golden["disc_l1_w"], golden["disc_l1_b"], 256)
+    l2 = dense(l1, golden["disc_l2_w"], golden["disc_l2_b"], 128)
+    l3_acc = wrap32(int(golden["disc_l3_b"][0]) << Q_FRAC)
     for i in range(32):
-        prod = wrap32(l2[i] * golden["disc_l3_w"][i])
+        prod = wrap32(l2[i] * int(golden["disc_l3_w"][i]))
         l3_acc = wrap32(l3_acc + prod)
     score = slice_q(l3_acc)
     decision = 1 if score > 0 else 0
     return score, decision
 
 
-def main() -> None:
-    ensure_dir(GOLDEN_DIR)
+def discriminator_head_batch(mat: "np.ndarray", golden: dict) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Score every row of an (N, 256) matrix; returns (scores, decisions)."""
+    l1 = dense_layer_batch(mat, golden["disc_l1_w"], golden["disc_l1_b"], 256)
+    l2 = dense_layer_batch(l1, golden["disc_l2_w"], golden["disc_l2_b"], 128)
+    l3 = dense_layer_batch(l2, golden["disc_l3_w"][:32], golden["disc_l3_b"][:1], 32)
+    scores = l3[:, 0]
+    return scores, (scores > 0).astype(np.int16)
+
+
+def load_golden_weights(
+    source: str = "hex",
+    as_lists: bool = True,
+    keys: Iterable[str] | None = None,
+) -> dict:
+    """Load the RTL weight/bias tensors keyed as dense_layer callers expect.
+
+    source: "hex" parses the ASCII dumps directly, "cache" goes through the
+    content-hashed parse cache and "bundle" maps the compiled weight bundle
+    (see tools/weight_store.py). Arrays are flattened; as_lists converts them to
+    Python ints for the reference engine, whose shifts assume unbounded ints.
+    keys restricts loading to a subset of WEIGHT_FILES.
+    """
+    keys = list(WEIGHT_FILES) if keys is None else list(keys)
+    if source == "hex":
+        return {key: load_hex(HEX_DIR / WEIGHT_FILES[key]) for key in keys}
+
+    _require_numpy()
+    import weight_store
+
+    if source == "cache":
+        tensors = weight_store.load_tensors(HEX_DIR, keys=keys)
+    elif source == "bundle":
+        bundle = open_checked_bundle(keys)
+        tensors = {key: bundle[key] for key in keys}
+    else:
+        raise ValueError(f"Unknown weight source '{source}'")
+    return {key: _flatten(values, as_lists) for key, values in tensors.items()}
+
+
+def _flatten(values: "np.ndarray", as_lists: bool):
+    flat = values.reshape(-1)
+    return flat.tolist() if as_lists else flat
+
+
+def open_checked_bundle(keys: Iterable[str]):
+    """Map the compiled weight bundle, refusing it if any of `keys` is stale."""
+    import weight_store
+
+    if not weight_store.BUNDLE_PATH.exists():
+        raise SystemExit(f"{weight_store.BUNDLE_PATH} missing; run tools/weight_store.py compile")
+    bundle = weight_store.open_bundle()
+    keys = set(keys)
+    stale = [key for key in bundle.stale_entries(HEX_DIR) if key in keys]
+    if stale:
+        raise SystemExit(f"Weight bundle is stale for {', '.join(stale)}; recompile it")
+    return bundle
+
+
+class LazyWeights(dict):
+    """Weight dict that loads each tensor on first access.
+
+    Incremental runs only touch the tensors of stale stages, so untouched layers
+    are never read from disk. With the "bundle" source the bundle is mapped and
+    checked for staleness once, on the first access, and then indexed.
+    """
+
+    def __init__(self, source: str, as_lists: bool) -> None:
+        super().__init__()
+        self.source = source
+        self.as_lists = as_lists
+        self._bundle = None
+
+    def __missing__(self, key: str):
+        if self.source == "bundle":
+            if self._bundle is None:
+                _require_numpy()
+                self._bundle = open_checked_bundle(WEIGHT_FILES)
+            value = _flatten(self._bundle[key], self.as_lists)
+        else:
+            value = load_golden_weights(self.source, self.as_lists, keys=(key,))[key]
+        self[key] = value
+        return value
+
+
+def lfsr_seed_matrix(count: int, seed: int = 0xACE1, width: int = 64, start: int = 0) -> "np.ndarray":
+    """Return seed vectors start..start+count-1 of one LFSR stream as (count, width).
+
+    Vector 0 is the one lfsr_sequence() produces, so the batch goldens extend the
+    single-seed golden rather than replacing it. The first vector is reached by
+    jump-ahead (lfsr_jump), so a deep `start` costs no more than start=0.
+    """
+    _require_numpy()
+    return lfsr_jump.seed_vectors(range(start, start + count), seed, width)
+
+
+class Stage(NamedTuple):
+    """One node of the golden pipeline DAG.
+
+    fn receives the values of `deps` (in order), the weight dict and the dense
+    engine. A stage is stale when its params, its weight files, the source of
+    this script or of any tools module in `modules`, or any upstream stage key
+    changes.
+    """
+
+    name: str
+    deps: Tuple[str, ...]
+    weights: Tuple[str, ...]
+    params: Dict[str, object]
+    fn: Callable[[List[List[int]], dict, DenseFn], List[int]]
+    modules: Tuple[str, ...] = ()
+
+
+# Tools modules behind the weighted stages: weight parsing and loading (hex_io,
+# weight_store) and the numpy dense engine's fixed-point arithmetic (qformat).
+WEIGHT_MODULES = ("hex_io", "qformat", "weight_store")
+
+
+def _dense_stage(w_key: str, b_key: str, in_count: int):
+    return lambda ins, gold, dense: dense(ins[0], gold[w_key], gold[b_key], in_count)
+
+
+DISC_WEIGHTS = ("disc_l1_w", "disc_l1_b", "disc_l2_w", "disc_l2_b", "disc_l3_w", "disc_l3_b")
+
+PIPELINE: Tuple[Stage, ...] = (
+    Stage("seed", (), (), {"seed": 0xACE1, "count": 64},
+          lambda ins, gold, dense: lfsr_sequence()),
+    Stage("gen_l1", ("seed",), ("gen_l1_w", "gen_l1_b"), {"in_count": 64},
+          _dense_stage("gen_l1_w", "gen_l1_b", 64), WEIGHT_MODULES),
+    Stage("gen_l2", ("gen_l1",), ("gen_l2_w", "gen_l2_b"), {"in_count": 256},
+          _dense_stage("gen_l2_w", "gen_l2_b", 256), WEIGHT_MODULES),
+    Stage("gen_l3", ("gen_l2",), ("gen_l3_w", "gen_l3_b"), {"in_count": 256},
+          _dense_stage("gen_l3_w", "gen_l3_b", 256), WEIGHT_MODULES),
+    Stage("sigmoid", ("gen_l3",), (), {"sat": SIGMOID_SAT, "q_frac": Q_FRAC},
+          lambda ins, gold, dense: sigmoid_vector(ins[0])),
+    Stage("fake_disc_vec", ("sigmoid",), (), {"out_count": 256},
+          lambda ins, gold, dense: lut_expand(ins[0], 256)),
+    Stage("fake_frame", ("sigmoid",), (), {"out_count": 784},
+          lambda ins, gold, dense: lut_expand(ins[0], 784)),
+    Stage("frame", (), (), {"size": 28 * 28, "period": 7},
+          lambda ins, gold, dense: build_frame_pattern()),
+    Stage("real_sample", ("frame",), (), {"out_count": 256},
+          lambda ins, gold, dense: frame_sampler(ins[0])),
+    Stage("fake_head", ("fake_disc_vec",), DISC_WEIGHTS, {},
+          lambda ins, gold, dense: list(discriminator_head(ins[0], gold, dense)), WEIGHT_MODULES),
+    Stage("real_head", ("real_sample",), DISC_WEIGHTS, {},
+          lambda ins, gold, dense: list(discriminator_head(ins[0], gold, dense)), WEIGHT_MODULES),
+)
+
+# Golden file -> stages whose values are concatenated into it.
+GOLDEN_OUTPUTS: Dict[str, Tuple[str, ...]] = {
+    "gan_seed.hex": ("seed",),
+    "gan_gen_features.hex": ("gen_l3",),
+    "gan_sigmoid.hex": ("sigmoid",),
+    "gan_fake_disc_vec.hex": ("fake_disc_vec",),
+    "gan_fake_frame.hex": ("fake_frame",),
+    "gan_real_sample.hex": ("real_sample",),
+    "gan_scores.hex": ("fake_head", "real_head"),
+}
+
+
+def _digest(payload: object) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def stage_keys(overrides: Dict[str, List[int]] | None = None) -> Dict[str, str]:
+    """Content key per stage: params, weight file hashes, upstream keys, this
+    script's own source (so any model change invalidates everything) and the
+    source of each tools module the stage computes with."""
+    overrides = overrides or {}
+    code = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+    file_hashes: Dict[str, str] = {}
+    module_hashes: Dict[str, str] = {}
+    keys: Dict[str, str] = {}
+    for stage in PIPELINE:
+        for w_key in stage.weights:
+            if w_key not in file_hashes:
+                file_hashes[w_key] = hashlib.sha256((HEX_DIR / WEIGHT_FILES[w_key]).read_bytes()).hexdigest()
+        for module in stage.modules:
+            if module not in module_hashes:
+                source = Path(__file__).with_name(f"{module}.py")
+                module_hashes[module] = hashlib.sha256(source.read_bytes()).hexdigest()
+        keys[stage.name] = _digest({
+            "stage": stage.name,
+            "code": code,
+            "modules": {module: module_hashes[module] for module in stage.modules},
+            "params": stage.params,
+            "override": overrides.get(stage.name),
+            "weights": [file_hashes[w_key] for w_key in stage.weights],
+            "deps": [keys[dep] for dep in stage.deps],
+        })
+    return keys
+
+
+def run_pipeline(
+    gold: dict,
+    dense: DenseFn = dense_layer,
+    overrides: Dict[str, List[int]] | None = None,
+    keys: Dict[str, str] | None = None,
+    cache: Dict[str, dict] | None = None,
+) -> Tuple[Dict[str, List[int]], List[str]]:
+    """Evaluate PIPELINE in order, reusing cached stage values whose key matches.
+
+    Returns (values per stage, names of stages actually recomputed). Without
+    keys/cache every stage is computed.
+    """
+    overrides = overrides or {}
+    values: Dict[str, List[int]] = {}
+    recomputed: List[str] = []
+    for stage in PIPELINE:
+        entry = cache.get(stage.name) if cache is not None else None
+        if keys is not None and entry is not None and entry["key"] == keys[stage.name]:
+            values[stage.name] = entry["values"]
+            continue
+        if stage.name in overrides:
+            result = list(overrides[stage.name])
+        else:
+            result = stage.fn([values[dep] for dep in stage.deps], gold, dense)
+        values[stage.name] = [int(v) for v in result]
+        recomputed.append(stage.name)
+        if keys is not None and cache is not None:
+            cache[stage.name] = {"key": keys[stage.name], "values": values[stage.name]}
+    return values, recomputed
+
+
+def golden_files(values: Dict[str, List[int]]) -> Dict[str, List[int]]:
+    return {
+        name: [v for stage in stages for v in values[stage]]
+        for name, stages in GOLDEN_OUTPUTS.items()
+    }
+
 
-    gold = {
-        "gen_l1_w": load_hex(HEX_DIR / "layer1_gen_weights.hex"),
-        "gen_l1_b": load_hex(HEX_DIR / "layer1_gen_bias.hex"),
-        "gen_l2_w": load_hex(HEX_DIR / "Generator_Layer2_Weights_All.hex"),
-        "gen_l2_b": load_hex(HEX_DIR / "Generator_Layer2_Biases_All.hex"),
-        "gen_l3_w": load_hex(HEX_DIR / "Generator_Layer3_Weights_All.hex"),
-        "gen_l3_b": load_hex(HEX_DIR / "Generator_Layer3_Biases_All.hex"),
-        "disc_l1_w": load_hex(HEX_DIR / "Discriminator_Layer1_Weights_All.hex"),
-        "disc_l1_b": load_hex(HEX_DIR / "Discriminator_Layer1_Biases_All.hex"),
-        "disc_l2_w": load_hex(HEX_DIR / "Discriminator_Layer2_Weights_All.hex"),
-        "disc_l2_b": load_hex(HEX_DIR / "Discriminator_Layer2_Biases_All.hex"),
-        "disc_l3_w": load_hex(HEX_DIR / "Discriminator_Layer3_Weights_All.hex"),
-        "disc_l3_b": load_hex(HEX_DIR / "Discriminator_Layer3_Biases_All.hex"),
+def compute_stages(
+    gold: dict,
+    dense: DenseFn = dense_layer,
+    seeds: Sequence[int] | None = None,
+) -> Dict[str, List[int]]:
+    overrides = None if seeds is None else {"seed": list(seeds)}
+    values, _ = run_pipeline(gold, dense, overrides)
+    return golden_files(values)
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Dict[str, dict]:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())["stages"]
+    except (ValueError, KeyError):
+        return {}
+
+
+def save_manifest(stages: Dict[str, dict], path: Path = MANIFEST_PATH) -> None:
+    ensure_dir(path.parent)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"stages": stages}))
+    tmp.replace(path)
+
+
+def write_hex_if_changed(path: Path, values: Sequence[int]) -> bool:
+    """Write `values` unless `path` already holds exactly these bytes."""
+    if np is not None:
+        content = hex_io.encode_hex(values)
+    else:
+        content = "".join(f"{val & 0xFFFF:04x}\n" for val in values).encode()
+    if path.exists() and path.read_bytes() == content:
+        return False
+    path.write_bytes(content)
+    return True
+
+
+def compute_stages_batch(gold: dict, seeds: "np.ndarray") -> Dict[str, "np.ndarray"]:
+    """Batched compute_stages: every generator stage as an (N, ...) array.
+
+    Each layer is one (N, in) x (in, out) matmul, so N seeds cost about as much
+    Python overhead as one. The real-frame path does not depend on the seed and is
+    computed once, then broadcast into the per-seed score rows.
+    """
+    _require_numpy()
+    seeds = np.asarray(seeds, dtype=np.int16)
+    g_l1 = dense_layer_batch(seeds, gold["gen_l1_w"], gold["gen_l1_b"], 64)
+    g_l2 = dense_layer_batch(g_l1, gold["gen_l2_w"], gold["gen_l2_b"], 256)
+    g_l3 = dense_layer_batch(g_l2, gold["gen_l3_w"], gold["gen_l3_b"], 256)
+    g_sigmoid = sigmoid_batch(g_l3)
+    fake_disc_vec = lut_expand_batch(g_sigmoid, 256)
+    fake_frame = lut_expand_batch(g_sigmoid, 784)
+
+    sampled_real = frame_sampler_batch(np.asarray(build_frame_pattern(), dtype=np.int16))
+    real_score, real_flag = discriminator_head_batch(sampled_real[np.newaxis, :], gold)
+    fake_score, fake_flag = discriminator_head_batch(fake_disc_vec, gold)
+
+    count = seeds.shape[0]
+    scores = np.stack(
+        [fake_score, fake_flag, np.repeat(real_score, count), np.repeat(real_flag, count)],
+        axis=1,
+    )
+    return {
+        "gan_seed.hex": seeds,
+        "gan_gen_features.hex": g_l3,
+        "gan_sigmoid.hex": g_sigmoid,
+        "gan_fake_disc_vec.hex": fake_disc_vec,
+        "gan_fake_frame.hex": fake_frame,
+        "gan_real_sample.hex": np.broadcast_to(sampled_real, (count, sampled_real.size)),
+        "gan_scores.hex": scores,
     }
 
-    seeds = lfsr_sequence()
-    g_l1 = dense_layer(seeds, gold["gen_l1_w"], gold["gen_l1_b"], 64)
-    g_l2 = dense_layer(g_l1, gold["gen_l2_w"], gold["gen_l2_b"], 256)
-    g_l3 = dense_layer(g_l2, gold["gen_l3_w"], gold["gen_l3_b"], 256)
-    g_sigmoid = sigmoid_vector(g_l3)
-    fake_disc_vec = lut_expand(g_sigmoid, 256)
-    fake_frame = lut_expand(g_sigmoid, 784)
 
-    frame = build_frame_pattern()
-    sampled_real = frame_sampler(frame)
+def cross_check(gold: dict, stages: Dict[str, List[int]], seeds: Sequence[int] | None = None) -> None:
+    reference = compute_stages(gold, dense_layer, seeds)
+    for name, values in reference.items():
+        if list(stages[name]) != values:
+            raise SystemExit(f"Engine mismatch against python reference in {name}")
+
+
+def write_batch(batch_dir: Path, stages: Dict[str, "np.ndarray"], start: int = 0) -> None:
+    count = stages["gan_seed.hex"].shape[0]
+    for row in range(count):
+        seed_dir = batch_dir / f"seed_{start + row:05d}"
+        ensure_dir(seed_dir)
+        for name, values in stages.items():
+            write_hex(seed_dir / name, values[row].tolist())
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate gan_serial_top golden vectors")
+    parser.add_argument("--engine", choices=sorted(ENGINES),
+                        default="numpy" if np is not None else "python",
+                        help="Dense-layer implementation (default: numpy when available)")
+    parser.add_argument("--cross-check", action="store_true",
+                        help="Also run the python reference engine and compare every stage")
+    parser.add_argument("--weights", choices=("hex", "cache", "bundle"),
+                        default="cache" if np is not None else "hex",
+                        help="Weight source: raw hex, hashed parse cache, or compiled bundle")
+    parser.add_argument("--force", action="store_true",
+                        help="Ignore the stage manifest and recompute every stage")
+    parser.add_argument("--batch", type=int, metavar="N",
+                        help="Emit N per-seed golden sets from consecutive LFSR seed vectors")
+    parser.add_argument("--batch-start", type=int, default=0, metavar="I",
+                        help="Index of the first seed vector for --batch (default: 0)")
+    parser.add_argument("--batch-dir", type=Path, default=GOLDEN_DIR / "batch",
+                        help="Output root for --batch (default: tb/golden/batch)")
+    return parser.parse_args()
 
-    fake_score, fake_flag = discriminator_head(fake_disc_vec, gold)
-    real_score, real_flag = discriminator_head(sampled_real, gold)
 
-    write_hex(GOLDEN_DIR / "gan_seed.hex", seeds)
-    write_hex(GOLDEN_DIR / "gan_gen_features.hex", g_l3)
-    write_hex(GOLDEN_DIR / "gan_sigmoid.hex", g_sigmoid)
-    write_hex(GOLDEN_DIR / "gan_fake_disc_vec.hex", fake_disc_vec)
-    write_hex(GOLDEN_DIR / "gan_fake_frame.hex", fake_frame)
-    write_hex(GOLDEN_DIR / "gan_real_sample.hex", sampled_real)
-    write_hex(GOLDEN_DIR / "gan_scores.hex", [fake_score, fake_flag, real_score, real_flag])
+def main() -> None:
+    args = parse_args()
+    ensure_dir(GOLDEN_DIR)
 
+    if args.batch is not None:
+        gold = load_golden_weights(args.weights, as_lists=args.cross_check)
+        if args.batch <= 0 or args.batch_start < 0:
+            raise SystemExit("--batch must be positive and --batch-start non-negative")
+        stages = compute_stages_batch(gold, lfsr_seed_matrix(args.batch, start=args.batch_start))
+        if args.cross_check:
+            for row in range(args.batch):
+                row_stages = {name: values[row].tolist() for name, values in stages.items()}
+                cross_check(gold, row_stages, row_stages["gan_seed.hex"])
+            print("Cross-check against python reference: OK")
+        write_batch(args.batch_dir, stages, args.batch_start)
+        print(f"Generated {args.batch} golden sets in", args.batch_dir)
+        return
+
+    keys = stage_keys()
+    cache = {} if args.force else load_manifest()
+    lazy = LazyWeights(args.weights, as_lists=args.engine == "python")
+    values, recomputed = run_pipeline(lazy, ENGINES[args.engine], keys=keys, cache=cache)
+    stages = golden_files(values)
+    if args.cross_check and args.engine != "python":
+        cross_check(load_golden_weights(args.weights, as_lists=True), stages)
+        print("Cross-check against python reference: OK")
+    save_manifest(cache)
+
+    rewritten = [name for name, vals in stages.items() if write_hex_if_changed(GOLDEN_DIR / name, vals)]
+    print("Recomputed stages:", ", ".join(recomputed) or "none")
+    print("Rewrote golden files:", ", ".join(rewritten) or "none")
     print("Generated golden data in", GOLDEN_DIR)
 
 
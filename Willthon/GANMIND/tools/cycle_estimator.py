@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""Analytic cycle and throughput estimate for one frame through gan_serial_top.
+
+Every stage on the frame path either runs a sequential MAC (one multiply per
+clock over a neuron x input weight array) or streams one element per clock.
+The workload of each stage is read from the RTL itself: weight/bias array
+depths in src/layers/*.v, ``parameter``/``localparam`` defaults in the
+interface and pipeline modules, and the instantiation order inside the
+generator and discriminator pipelines. A small per-stage overhead covers the
+start/done handshakes and FIFO read latency.
+
+gan_serial_top processes one frame at a time (S_IDLE -> S_SEED -> S_GEN ->
+S_FAKE_LOAD -> S_DISC_FAKE -> S_REAL_LOAD -> S_DISC_REAL -> S_DONE), so the
+end-to-end latency is the sum of its phases, with parallel branches (expander
+and upsampler) taking the longer one. The only work that overlaps across
+frames is pixel_serial_loader prefetching the next frame, so the initiation
+interval is the larger of the latency and the loader's per-frame time.
+
+Frames/s is quoted at the Fmax found in the Vivado timing summaries in the
+tree (1000 / (period - WNS)), or at ``--clock-mhz``. ``calibrate`` measures a
+reference simulation (a VCD via vcd_reader, or a JSON of measured cycles),
+replaces the overhead of every stage it can observe, and stores a residual
+for the rest in build/cycle_calibration.json, which later estimates pick up.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from mac_cycle_model import LATENCY as MAC_LATENCY
+from vivado_reports import parse_report
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+CALIBRATION_PATH = REPO_ROOT / "build" / "cycle_calibration.json"
+DEFAULT_CLOCK_MHZ = 100.0  # the 10 ns clock of tb/gan_serial_tb.v
+TOP_SCOPE = "gan_serial_tb.dut"
+
+LOADER_CYCLES_PER_PIXEL = 3  # LOAD_REQ -> FIFO read -> LOAD_CAP per pixel
+
+_PARAM_RE = re.compile(
+    r"(?:parameter|localparam)\s+(?:integer\s+|signed\s+)?(?:\[[^\]]*\]\s*)?(\w+)\s*=\s*(-?\d+)(?!['\w])"
+)
+_ARRAY_RE = re.compile(r"reg\s+signed\s+\[15:0\]\s+(\w+)\s*\[\s*0\s*:\s*(\d+)\s*\]")
+_INSTANCE_RE = re.compile(r"^\s*(layer\d_\w+)\s+(u_\w+)\s*\(", re.M)
+_TIMESCALE_RE = re.compile(r"(\d+)\s*(s|ms|us|ns|ps|fs)")
+_UNIT_S = {"s": 1.0, "ms": 1e-3, "us": 1e-6, "ns": 1e-9, "ps": 1e-12, "fs": 1e-15}
+
+
+class Stage(NamedTuple):
+    name: str
+    scope: str      # instance path under gan_serial_top with start/done, "" if none
+    work: int       # cycles doing useful work (MACs or streamed elements)
+    overhead: int   # handshake / FIFO latency cycles
+    detail: str
+
+    @property
+    def cycles(self) -> int:
+        return self.work + self.overhead
+
+
+class Phase(NamedTuple):
+    name: str
+    branches: Tuple[Tuple[Stage, ...], ...]  # parallel branches of sequential stages
+
+    @property
+    def cycles(self) -> int:
+        return max(sum(s.cycles for s in branch) for branch in self.branches)
+
+
+class Timing(NamedTuple):
+    report: Path
+    period_ns: float
+    wns_ns: float
+
+    @property
+    def fmax_mhz(self) -> float:
+        return 1000.0 / (self.period_ns - self.wns_ns)
+
+
+class Estimate(NamedTuple):
+    phases: List[Phase]
+    background: List[Stage]  # overlapped with the critical path
+    residual: int
+    latency: int
+    interval: int
+
+
+# ---------------------------------------------------------------------------
+# RTL scraping
+# ---------------------------------------------------------------------------
+
+def module_params(path: Path, module: Optional[str] = None) -> Dict[str, int]:
+    """Integer parameter and localparam defaults declared in `path`.
+
+    Files such as activations.v hold several modules; `module` restricts the
+    scan to the body of that one.
+    """
+    text = path.read_text()
+    if module is not None:
+        match = re.search(rf"\bmodule\s+{re.escape(module)}\b(.*?)\bendmodule\b", text, re.S)
+        if match is None:
+            raise SystemExit(f"{path}: no module {module}")
+        text = match.group(1)
+    return {name: int(value) for name, value in _PARAM_RE.findall(text)}
+
+
+class LayerShape(NamedTuple):
+    module: str
+    neurons: int
+    inputs: int
+    pipelined: bool  # all inputs issued at once to pipelined_mac
+
+
+def layer_shape(module: str, layer_dir: Path = SRC_DIR / "layers") -> LayerShape:
+    """Neuron and input counts of one layer module from its weight and bias arrays."""
+    text = (layer_dir / f"{module}.v").read_text()
+    arrays = {name: int(last) + 1 for name, last in _ARRAY_RE.findall(text)}
+    if len(arrays) != 2:
+        raise SystemExit(f"{module}.v: expected a weight and a bias array, found {sorted(arrays)}")
+    neurons = min(arrays.values())
+    return LayerShape(module, neurons, max(arrays.values()) // neurons, "pipelined_mac" in text)
+
+
+def layer_stage(module: str, scope: str, layer_dir: Path = SRC_DIR / "layers") -> Stage:
+    """Workload of one layer module."""
+    shape = layer_shape(module, layer_dir)
+    if shape.pipelined:
+        # All inputs in one issue; result and done are registered once more.
+        return Stage(module, scope, MAC_LATENCY + 1, 1, f"{shape.inputs}-lane pipelined MAC")
+    return Stage(module, scope, shape.neurons * shape.inputs, 1,
+                 f"{shape.neurons} x {shape.inputs} sequential MAC")
+
+
+def pipeline_modules(path: Path) -> List[Tuple[str, str]]:
+    """(layer module, instance name) in the order `path` instantiates them."""
+    return _INSTANCE_RE.findall(path.read_text())
+
+
+def pipeline_layers(path: Path, prefix: str) -> List[Stage]:
+    """Layer stages in the order `path` instantiates them."""
+    layer_dir = path.parents[1] / "layers"
+    return [layer_stage(module, f"{prefix}.{inst}", layer_dir) for module, inst in pipeline_modules(path)]
+
+
+def build_phases(src: Path = SRC_DIR) -> Tuple[List[Phase], List[Stage]]:
+    iface = src / "interfaces"
+    seed = module_params(src / "generator" / "seed_lfsr_bank.v")["SEED_COUNT"]
+    gen_path = src / "generator" / "generator_pipeline.v"
+    gen = module_params(gen_path)
+    disc_path = src / "discriminator" / "discriminator_pipeline.v"
+    disc = module_params(disc_path)
+    sigmoid = module_params(iface / "vector_sigmoid.v")["ELEMENT_COUNT"]
+    expander = module_params(iface / "vector_expander.v")["OUTPUT_COUNT"]
+    upsampler = module_params(iface / "vector_upsampler.v")["OUTPUT_COUNT"]
+    sampler = module_params(iface / "frame_sampler.v")["OUTPUT_COUNT"]
+    pixels = module_params(iface / "pixel_serial_loader.v")["PIXEL_COUNT"]
+    samples = disc["SAMPLE_COUNT"]
+
+    generator = (
+        Stage("gen load", "", gen["SEED_COUNT"], 3, "seed FIFO -> buffer, 1-cycle read latency"),
+        *pipeline_layers(gen_path, "u_generator"),
+        Stage("gen output", "", gen["FEATURE_COUNT"], 2, "features -> FIFO"),
+    )
+
+    def discriminator(run: str) -> Tuple[Stage, ...]:
+        return (
+            Stage(f"{run} disc load", "", samples, 3, "sample FIFO -> buffer"),
+            *pipeline_layers(disc_path, "u_discriminator"),
+            Stage(f"{run} disc output", "", 1, 2, "score -> FIFO"),
+        )
+
+    phases = [
+        Phase("S_SEED", ((
+            Stage("seed_lfsr_bank", "u_seed_bank", seed, 1, f"{seed} LFSR states"),
+            Stage("seed stream", "", seed, 2, "bank -> generator seed FIFO"),
+        ),)),
+        Phase("S_GEN", (generator + (
+            Stage("feature collect", "", gen["FEATURE_COUNT"], 2, "feature FIFO -> top buffer"),
+            Stage("vector_sigmoid", "u_vector_sigmoid", sigmoid, 2, "feed/capture pipeline"),
+        ),)),
+        Phase("S_GEN expand", (
+            (Stage("vector_expander", "u_vector_expander", expander, 1, f"-> {expander}"),),
+            (Stage("vector_upsampler", "u_vector_upsampler", upsampler, 1, f"-> {upsampler}"),),
+        )),
+        Phase("S_FAKE_LOAD", ((Stage("fake sample stream", "", samples, 2, "top -> disc sample FIFO"),),)),
+        Phase("S_DISC_FAKE", (discriminator("fake"),)),
+        Phase("S_REAL_LOAD", ((Stage("real sample stream", "", samples, 2, "top -> disc sample FIFO"),),)),
+        Phase("S_DISC_REAL", (discriminator("real"),)),
+        Phase("S_DONE", ((Stage("done", "", 1, 1, "S_DONE -> S_IDLE"),),)),
+    ]
+    background = [
+        Stage("frame_sampler", "u_frame_sampler", sampler, 1, "runs from S_SEED, needed at S_REAL_LOAD"),
+        Stage("pixel_serial_loader", "u_loader", pixels * LOADER_CYCLES_PER_PIXEL, 2,
+              "prefetches the next frame"),
+    ]
+    return phases, background
+
+
+# ---------------------------------------------------------------------------
+# Estimate and calibration
+# ---------------------------------------------------------------------------
+
+def load_calibration(path: Path = CALIBRATION_PATH) -> Dict[str, object]:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _apply_overheads(stages: Sequence[Stage], overheads: Dict[str, int]) -> Tuple[Stage, ...]:
+    return tuple(s._replace(overhead=overheads.get(s.scope or s.name, s.overhead)) for s in stages)
+
+
+def estimate(calibration: Optional[Dict[str, object]] = None, src: Path = SRC_DIR) -> Estimate:
+    phases, background = build_phases(src)
+    calibration = calibration or {}
+    overheads: Dict[str, int] = dict(calibration.get("overheads", {}))  # type: ignore[arg-type]
+    phases = [p._replace(branches=tuple(_apply_overheads(b, overheads) for b in p.branches)) for p in phases]
+    background = list(_apply_overheads(background, overheads))
+    residual = int(calibration.get("residual", 0))  # type: ignore[arg-type]
+    latency = sum(p.cycles for p in phases) + residual
+    interval = max([latency] + [s.cycles for s in background if s.scope == "u_loader"])
+    return Estimate(phases, background, residual, latency, interval)
+
+
+def _timescale_seconds(timescale: str) -> float:
+    match = _TIMESCALE_RE.search(timescale)
+    if not match:
+        raise SystemExit(f"Cannot parse VCD timescale {timescale!r}")
+    return int(match.group(1)) * _UNIT_S[match.group(2)]
+
+
+def measure_vcd(path: Path, clock_period_ns: float, top: str = TOP_SCOPE) -> Tuple[Dict[str, int], Optional[int]]:
+    """Median start->done cycles per top-relative scope, plus the top's own."""
+    from vcd_reader import VcdFile  # only calibration needs the VCD reader
+
+    with VcdFile(path) as vcd:
+        ticks = clock_period_ns * 1e-9 / _timescale_seconds(vcd.timescale or "1ns")
+        intervals = vcd.handshakes()
+    measured: Dict[str, int] = {}
+    total: Optional[int] = None
+    for scope, iv in intervals.items():
+        if not iv.starts.size or not scope.startswith(top):
+            continue
+        cycles = int(round(float(np.median(iv.ends - iv.starts)) / ticks))
+        if scope == top:
+            total = cycles
+        else:
+            measured[scope[len(top) + 1:]] = cycles
+    return measured, total
+
+
+def calibrate(measured: Dict[str, int], total: Optional[int], src: Path = SRC_DIR) -> Dict[str, object]:
+    """Overheads for the stages `measured` covers; a residual makes the total match."""
+    phases, background = build_phases(src)
+    stages = [s for p in phases for b in p.branches for s in b] + background
+    overheads: Dict[str, int] = {}
+    for stage in stages:
+        key = stage.scope or stage.name
+        if key in measured:
+            overheads[key] = max(0, measured[key] - stage.work)
+    calibration: Dict[str, object] = {"overheads": overheads, "residual": 0}
+    if total is not None:
+        calibration["residual"] = total - estimate(calibration, src).latency
+        calibration["total"] = total
+    return calibration
+
+
+# ---------------------------------------------------------------------------
+# Fmax from Vivado timing summaries
+# ---------------------------------------------------------------------------
+
+def parse_timing(path: Path) -> Optional[Timing]:
+    """Period and WNS of a constrained timing summary, or None."""
+    report = parse_report(path)
+    if report is None or report.kind != "timing" or report.metrics.get("fmax_mhz") is None:
+        return None
+    return Timing(path, report.metrics["period_ns"], report.metrics["wns_ns"])
+
+
+def find_timing(root: Path = REPO_ROOT) -> Tuple[Optional[Timing], List[Path]]:
+    """Slowest constrained design among the timing summaries, plus every report seen."""
+    reports = sorted(p for p in root.rglob("*timing*.rpt") if ".Xil" not in p.parts)
+    timings = [t for t in (parse_timing(p) for p in reports) if t is not None]
+    best = min(timings, key=lambda t: t.fmax_mhz) if timings else None
+    return best, reports
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def _print_estimate(est: Estimate, clock_mhz: float, clock_note: str) -> None:
+    print(f"{'phase':14s} {'stage':22s} {'work':>8s} {'ovh':>5s} {'cycles':>8s}  detail")
+    for phase in est.phases:
+        for idx, branch in enumerate(phase.branches):
+            tag = phase.name if idx == 0 else "  (parallel)"
+            for stage in branch:
+                print(f"{tag:14s} {stage.name:22s} {stage.work:8d} {stage.overhead:5d} {stage.cycles:8d}  {stage.detail}")
+                tag = ""
+        print(f"{'':14s} {'= ' + phase.name:22s} {'':8s} {'':5s} {phase.cycles:8d}")
+    for stage in est.background:
+        print(f"{'overlapped':14s} {stage.name:22s} {stage.work:8d} {stage.overhead:5d} {stage.cycles:8d}  {stage.detail}")
+    if est.residual:
+        print(f"{'calibration':14s} {'residual':22s} {'':8s} {'':5s} {est.residual:8d}")
+
+    period_us = 1.0 / clock_mhz
+    print()
+    print(f"clock            : {clock_mhz:.2f} MHz ({clock_note})")
+    print(f"latency          : {est.latency} cycles = {est.latency * period_us:.1f} us")
+    print(f"initiation intvl : {est.interval} cycles")
+    print(f"throughput       : {clock_mhz * 1e6 / est.interval:.1f} frames/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cycle/throughput estimate for gan_serial_top")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    est = sub.add_parser("estimate", help="Per-stage and end-to-end cycles, II and frames/s")
+    est.add_argument("--clock-mhz", type=float, default=None,
+                     help="Clock to quote frames/s at (default: Fmax from timing reports, else 100)")
+    est.add_argument("--calibration", type=Path, default=CALIBRATION_PATH)
+    est.add_argument("--raw", action="store_true", help="Ignore the stored calibration")
+    est.add_argument("--json", type=Path, default=None, help="Also write the estimate as JSON")
+
+    cal = sub.add_parser("calibrate", help="Fit overheads to one reference simulation")
+    cal.add_argument("reference", type=Path, help="gan_serial_tb VCD, or JSON {stages: {...}, total: N}")
+    cal.add_argument("--clock-period-ns", type=float, default=10.0, help="Testbench clock period")
+    cal.add_argument("--out", type=Path, default=CALIBRATION_PATH)
+
+    sub.add_parser("fmax", help="List timing summaries and the Fmax each implies")
+
+    args = parser.parse_args()
+
+    if args.cmd == "fmax":
+        _, reports = find_timing()
+        for path in reports:
+            timing = parse_timing(path)
+            rel = path.relative_to(REPO_ROOT)
+            if timing is None:
+                print(f"{str(rel):90s} unconstrained")
+            else:
+                print(f"{str(rel):90s} period {timing.period_ns:.3f} ns WNS {timing.wns_ns:+.3f} ns "
+                      f"-> Fmax {timing.fmax_mhz:.1f} MHz")
+    elif args.cmd == "calibrate":
+        if args.reference.suffix == ".json":
+            payload = json.loads(args.reference.read_text())
+            measured, total = {k: int(v) for k, v in payload.get("stages", {}).items()}, payload.get("total")
+        else:
+            try:
+                measured, total = measure_vcd(args.reference, args.clock_period_ns)
+            except ValueError as exc:
+                raise SystemExit(str(exc))
+        calibration = calibrate(measured, total)
+        calibration["reference"] = str(args.reference)
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(calibration, indent=2))
+        fitted = calibration["overheads"]
+        print(f"Fitted {len(fitted)} stage overheads, residual {calibration['residual']} cycles -> {args.out}")
+    else:
+        calibration = {} if args.raw else load_calibration(args.calibration)
+        result = estimate(calibration)
+        if args.clock_mhz is not None:
+            clock_mhz, note = args.clock_mhz, "--clock-mhz"
+        else:
+            timing, _ = find_timing()
+            if timing is not None:
+                clock_mhz, note = timing.fmax_mhz, f"Fmax from {timing.report.relative_to(REPO_ROOT)}"
+            else:
+                clock_mhz, note = DEFAULT_CLOCK_MHZ, "no constrained timing report; testbench clock"
+        _print_estimate(result, clock_mhz, note if calibration else note + ", uncalibrated")
+        if args.json:
+            payload = {
+                "phases": {p.name: p.cycles for p in result.phases},
+                "stages": {s.name: s.cycles for p in result.phases for b in p.branches for s in b},
+                "residual": result.residual,
+                "latency_cycles": result.latency,
+                "interval_cycles": result.interval,
+                "clock_mhz": clock_mhz,
+                "frames_per_s": clock_mhz * 1e6 / result.interval,
+            }
+            args.json.write_text(json.dumps(payload, indent=2))
+
+
+if __name__ == "__main__":
+    main()
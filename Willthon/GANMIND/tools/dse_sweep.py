@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Design-space sweep over MAC lanes, parallel neurons and batch size.
+
+Today every layer runs one neuron at a time with one multiply per clock
+(layer3_discriminator issues all 32 inputs to pipelined_mac at once). This
+tool models a generalised datapath with ``lanes`` multipliers per neuron (a
+pipelined_mac-style adder tree), ``neurons`` such neurons working side by
+side, and ``batch`` frames sharing each weight fetch. Each point is evaluated
+against the xc7z020 part that src/VivadoSynthesis/run_all_modules.tcl targets:
+
+* cycles per batch: for every layer run (generator once, discriminator twice
+  per frame), ceil(N / neurons) * ceil(K / lanes) issues per frame plus the
+  tree fill, plus the non-MAC streaming stages from cycle_estimator;
+* DSP48E1: one per 16x16 multiplier (lanes * neurons);
+* BRAM: every layer's weights are banked ``lanes * neurons`` words wide, two
+  words per RAMB18 per cycle; banks of 32 words or fewer go to LUTRAM. Each
+  frame beyond the first in a batch needs its activations in BRAM;
+* weight bandwidth: bytes read per batch at the clock (Fmax from the timing
+  reports, or ``--clock-mhz``), with each word reused by the whole batch.
+
+Points are evaluated in a process pool. The report is the Pareto front of
+throughput against DSP and BRAM over the points that fit the device.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import product
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from cycle_estimator import (
+    DEFAULT_CLOCK_MHZ,
+    SRC_DIR,
+    estimate,
+    find_timing,
+    layer_shape,
+    load_calibration,
+    pipeline_modules,
+)
+
+TCL_PATH = SRC_DIR / "VivadoSynthesis" / "run_all_modules.tcl"
+WORD_BYTES = 2
+BRAM18_WORDS = 1024   # 1K x 18 per RAMB18
+BRAM18_PORTS = 2      # words read per RAMB18 per cycle
+LUTRAM_MAX_WORDS = 32  # smaller banks are cheaper as distributed RAM
+
+_PART_RE = re.compile(r'set\s+part\s+"([^"]+)"')
+
+
+class Device(NamedTuple):
+    part: str
+    dsp: int
+    bram36: int
+    lut: int
+
+
+DEVICES: Dict[str, Device] = {
+    "xc7z007s": Device("xc7z007s", 66, 50, 14400),
+    "xc7z010": Device("xc7z010", 80, 60, 17600),
+    "xc7z020": Device("xc7z020", 220, 140, 53200),
+}
+
+
+class LayerRun(NamedTuple):
+    module: str
+    neurons: int
+    inputs: int
+    runs: int  # executions per frame
+
+
+class Model(NamedTuple):
+    layers: Tuple[LayerRun, ...]
+    stream_cycles: int  # per-frame cycles outside the layers
+    clock_mhz: float
+
+
+class Point(NamedTuple):
+    lanes: int
+    neurons: int
+    batch: int
+
+
+class Result(NamedTuple):
+    lanes: int
+    neurons: int
+    batch: int
+    cycles_per_batch: int
+    cycles_per_frame: float
+    frames_per_s: float
+    dsp: int
+    bram36: float
+    bandwidth_gbs: float
+    fits: bool
+
+
+def target_device(tcl: Path = TCL_PATH) -> Device:
+    match = _PART_RE.search(tcl.read_text())
+    part = match.group(1) if match else "xc7z020"
+    for prefix, device in DEVICES.items():
+        if part.startswith(prefix):
+            return device
+    raise SystemExit(f"No resource table for part {part}")
+
+
+def build_model(clock_mhz: float, src: Path = SRC_DIR) -> Model:
+    """Layer shapes from the pipelines, plus the non-MAC cycles of one frame."""
+    layers: List[LayerRun] = []
+    layer_cycles = 0
+    for path, runs in ((src / "generator" / "generator_pipeline.v", 1),
+                       (src / "discriminator" / "discriminator_pipeline.v", 2)):
+        for module, _ in pipeline_modules(path):
+            shape = layer_shape(module, src / "layers")
+            layers.append(LayerRun(module, shape.neurons, shape.inputs, runs))
+    est = estimate(load_calibration(), src)
+    layer_names = {layer.module for layer in layers}
+    for phase in est.phases:
+        for branch in phase.branches:
+            layer_cycles += sum(s.cycles for s in branch if s.name in layer_names)
+    return Model(tuple(layers), est.latency - layer_cycles, clock_mhz)
+
+
+def tree_fill(lanes: int) -> int:
+    """Pipeline depth of a `lanes`-wide MAC: operand and product registers, the
+    adder tree, and the bias/output stages (7 for pipelined_mac's 32 lanes)."""
+    return 0 if lanes == 1 else math.ceil(math.log2(lanes)) + 2
+
+
+def layer_bram18(layer: LayerRun, width: int) -> int:
+    words = layer.neurons * layer.inputs
+    bank = math.ceil(words / width)
+    if bank <= LUTRAM_MAX_WORDS:
+        return 0
+    pairs, single = divmod(width, BRAM18_PORTS)
+    return pairs * math.ceil(BRAM18_PORTS * bank / BRAM18_WORDS) + single * math.ceil(bank / BRAM18_WORDS)
+
+
+def batch_bram18(model: Model, batch: int) -> int:
+    """Activations of the extra frames in a batch (the first lives in registers)."""
+    words = sum(layer.inputs + layer.neurons for layer in model.layers)
+    return math.ceil((batch - 1) * words / BRAM18_WORDS)
+
+
+def evaluate(model: Model, device: Device, point: Point) -> Result:
+    cycles = point.batch * model.stream_cycles
+    bram18 = batch_bram18(model, point.batch)
+    weight_words = 0
+    for layer in model.layers:
+        lanes = min(point.lanes, layer.inputs)
+        par = min(point.neurons, layer.neurons)
+        issues = math.ceil(layer.neurons / par) * math.ceil(layer.inputs / lanes)
+        cycles += layer.runs * (point.batch * issues + tree_fill(lanes) + 1)
+        bram18 += layer_bram18(layer, lanes * par)
+        weight_words += layer.runs * layer.neurons * layer.inputs
+    dsp = point.lanes * point.neurons
+    bram36 = bram18 / 2
+    seconds = cycles / (model.clock_mhz * 1e6)
+    return Result(
+        lanes=point.lanes,
+        neurons=point.neurons,
+        batch=point.batch,
+        cycles_per_batch=cycles,
+        cycles_per_frame=cycles / point.batch,
+        frames_per_s=point.batch / seconds,
+        dsp=dsp,
+        bram36=bram36,
+        bandwidth_gbs=weight_words * WORD_BYTES / seconds / 1e9,
+        fits=dsp <= device.dsp and bram36 <= device.bram36,
+    )
+
+
+def sweep(model: Model, device: Device, points: Sequence[Point], workers: int = 0) -> List[Result]:
+    workers = workers or os.cpu_count() or 1
+    job = partial(evaluate, model, device)
+    if workers == 1:
+        return [job(p) for p in points]
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(job, points, chunksize=max(1, len(points) // (4 * workers))))
+
+
+def pareto_front(results: Sequence[Result]) -> List[Result]:
+    """Points no other point beats on throughput, DSP and BRAM at once."""
+    if not results:
+        return []
+    gain = np.array([r.frames_per_s for r in results])
+    cost = np.array([(r.dsp, r.bram36) for r in results])
+    no_worse = (gain[None, :] >= gain[:, None]) & (cost[None, :, :] <= cost[:, None, :]).all(axis=2)
+    better = (gain[None, :] > gain[:, None]) | (cost[None, :, :] < cost[:, None, :]).any(axis=2)
+    dominated = (no_worse & better).any(axis=1)
+    front = [r for r, dom in zip(results, dominated.tolist()) if not dom]
+    return sorted(front, key=lambda r: (r.frames_per_s, -r.dsp))
+
+
+def _print_table(results: Sequence[Result]) -> None:
+    print(f"{'lanes':>5s} {'neur':>5s} {'batch':>5s} {'cyc/frame':>11s} {'frames/s':>11s} "
+          f"{'DSP':>5s} {'BRAM36':>7s} {'GB/s':>7s} fits")
+    for r in results:
+        print(f"{r.lanes:5d} {r.neurons:5d} {r.batch:5d} {r.cycles_per_frame:11.1f} {r.frames_per_s:11.1f} "
+              f"{r.dsp:5d} {r.bram36:7.1f} {r.bandwidth_gbs:7.3f} {'yes' if r.fits else 'no'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sweep MAC lanes / neuron parallelism / batch size")
+    parser.add_argument("--lanes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--neurons", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--clock-mhz", type=float, default=None,
+                        help="Clock (default: Fmax from timing reports, else 100)")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: all cores)")
+    parser.add_argument("--all", action="store_true", help="Print every point, not just the front")
+    parser.add_argument("--csv", type=Path, default=None, help="Write every point as CSV")
+    parser.add_argument("--json", type=Path, default=None, help="Write the Pareto front as JSON")
+    args = parser.parse_args()
+    if min(args.lanes + args.neurons + args.batch) <= 0:
+        raise SystemExit("--lanes, --neurons and --batch must be positive")
+
+    clock_mhz = args.clock_mhz
+    if clock_mhz is None:
+        timing, _ = find_timing()
+        clock_mhz = timing.fmax_mhz if timing else DEFAULT_CLOCK_MHZ
+    device = target_device()
+    model = build_model(clock_mhz)
+    points = [Point(*p) for p in product(args.lanes, args.neurons, args.batch)]
+    results = sweep(model, device, points, args.workers)
+    front = pareto_front([r for r in results if r.fits])
+
+    print(f"{device.part}: {device.dsp} DSP48E1, {device.bram36} BRAM36 at {clock_mhz:.1f} MHz; "
+          f"{len(points)} points, {sum(r.fits for r in results)} fit")
+    _print_table(results if args.all else front)
+    if args.csv:
+        with args.csv.open("w", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(Result._fields)
+            writer.writerows(results)
+    if args.json:
+        args.json.write_text(json.dumps([r._asdict() for r in front], indent=2))
+
+
+if __name__ == "__main__":
+    main()
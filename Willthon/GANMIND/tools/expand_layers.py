@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Expand per-neuron hex dumps into the *_All.hex arrays the layer RTL loads.
+
+Each layer is described once in LAYERS: its per-neuron weight file, its bias
+file and the weight_store.TENSORS key whose (out, in) shape and file name the
+RTL uses. A source weight file holding a full (out, in) matrix is used
+unchanged. Otherwise it is treated as one neuron: truncated or zero-padded to
+`in` values and broadcast across all `out` neurons. Biases are truncated or
+zero-padded to `out`. Every result is checked against the depth of the
+``reg [15:0] name [0:N-1]`` array that the layer's ``$readmemh`` fills, parsed
+from src/layers/*.v, before anything is written.
+
+This replaces the hand-unrolled src/layers/expand_discriminator_hex.py, which
+is now a wrapper for ``--layers disc``.
+
+Expanding the generator layers is destructive: hex_data holds their trained
+(out, in) matrices under the same names, and a broadcast neuron would replace
+them. A target that already exists with different contents is therefore
+never overwritten unless ``--force`` is given; write to ``--out-dir`` instead.
+The discriminator expansion reproduces the checked-in files and is unaffected.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence
+
+import numpy as np
+
+from hex_io import encode_hex, read_hex
+from weight_store import TENSORS
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LAYER_DIR = REPO_ROOT / "src" / "layers"
+HEX_DIR = LAYER_DIR / "hex_data"
+
+_ARRAY_RE = re.compile(r"reg\s+signed\s+\[15:0\]\s+(\w+)\s*\[\s*0\s*:\s*(\d+)\s*\]")
+_READMEM_RE = re.compile(r'\$readmemh\s*\(\s*\{\s*`HEX_DATA_ROOT\s*,\s*"/([^"]+)"\s*\}\s*,\s*(\w+)\s*\)')
+
+
+class LayerSource(NamedTuple):
+    key: str           # weight_store layer key, e.g. "disc_l1"
+    weights: str       # per-neuron (or full-matrix) weight file
+    biases: str        # bias file; extra entries are dropped
+
+
+LAYERS: Dict[str, LayerSource] = {
+    src.key: src
+    for src in (
+        LayerSource("gen_l1", "Generator_Layer1_Weights_Neuron1.hex", "Generator_Layer1_Biases.hex"),
+        LayerSource("gen_l2", "Generator_Layer2_Weights_Neuron1.hex", "Generator_Layer2_Biases.hex"),
+        LayerSource("gen_l3", "Generator_Layer3_Weights_Neuron1.hex", "Generator_Layer3_Biases.hex"),
+        LayerSource("disc_l1", "Discriminator_Layer1_Weights_Neuron1.hex", "Discriminator_Layer1_Biases.hex"),
+        LayerSource("disc_l2", "Discriminator_Layer2_Weights_Neuron1.hex", "Discriminator_Layer2_Biases.hex"),
+        LayerSource("disc_l3", "Discriminator_Layer3_Weights_Neuron1.hex", "Discriminator_Layer3_Biases.hex"),
+    )
+}
+
+
+def rtl_depths(layer_dir: Path = LAYER_DIR) -> Dict[str, int]:
+    """Map each hex file loaded by a layer module to the depth of its target array."""
+    depths: Dict[str, int] = {}
+    for path in sorted(layer_dir.glob("layer*.v")):
+        if path.stem.endswith("_tb"):
+            continue
+        text = path.read_text()
+        arrays = {name: int(last) + 1 for name, last in _ARRAY_RE.findall(text)}
+        for fname, target in _READMEM_RE.findall(text):
+            if target in arrays:
+                depths[fname] = arrays[target]
+    return depths
+
+
+def fit(values: np.ndarray, length: int) -> np.ndarray:
+    """Truncate or zero-pad a 1-D array to `length`."""
+    if values.size >= length:
+        return values[:length]
+    return np.pad(values, (0, length - values.size))
+
+
+def expand_layer(src: LayerSource, hex_dir: Path = HEX_DIR) -> Dict[str, np.ndarray]:
+    """Return {output file: values} for one layer."""
+    out_count, in_count = TENSORS[f"{src.key}_w"][1]
+    neuron = read_hex(hex_dir / src.weights)
+    if neuron.size == out_count * in_count:
+        weights = neuron.reshape(out_count, in_count)
+    else:
+        weights = np.broadcast_to(fit(neuron, in_count), (out_count, in_count))
+    biases = fit(read_hex(hex_dir / src.biases), out_count)
+    return {
+        TENSORS[f"{src.key}_w"][0]: weights,
+        TENSORS[f"{src.key}_b"][0]: biases,
+    }
+
+
+def select_layers(names: Sequence[str]) -> List[LayerSource]:
+    chosen: List[LayerSource] = []
+    for name in names:
+        if name == "all":
+            matches = list(LAYERS)
+        elif name in ("gen", "disc"):
+            matches = [key for key in LAYERS if key.startswith(name + "_")]
+        elif name in LAYERS:
+            matches = [name]
+        else:
+            raise SystemExit(f"Unknown layer {name!r}; choose from all, gen, disc, {', '.join(LAYERS)}")
+        chosen.extend(LAYERS[key] for key in matches if LAYERS[key] not in chosen)
+    return chosen
+
+
+def expand(layers: Sequence[LayerSource], hex_dir: Path = HEX_DIR, out_dir: Path | None = None,
+           layer_dir: Path = LAYER_DIR, force: bool = False) -> Dict[str, int]:
+    """Expand, validate and write `layers`; returns {file: entries written}.
+
+    Refuses (SystemExit) to replace an existing file with different contents
+    unless `force` is set.
+    """
+    out_dir = hex_dir if out_dir is None else out_dir
+    depths = rtl_depths(layer_dir)
+    outputs: Dict[str, np.ndarray] = {}
+    for src in layers:
+        outputs.update(expand_layer(src, hex_dir))
+
+    for fname, values in outputs.items():
+        depth = depths.get(fname)
+        if depth is None:
+            raise SystemExit(f"No $readmemh in {layer_dir} loads {fname}")
+        if values.size != depth:
+            raise SystemExit(f"{fname}: {values.size} entries, RTL array holds {depth}")
+
+    encoded = {fname: encode_hex(values) for fname, values in outputs.items()}
+    clobbered = [
+        fname for fname, data in encoded.items()
+        if (out_dir / fname).exists() and (out_dir / fname).read_bytes() != data
+    ]
+    if clobbered and not force:
+        raise SystemExit(
+            f"Refusing to overwrite {len(clobbered)} file(s) in {out_dir} whose contents differ: "
+            f"{', '.join(clobbered)}. Use --out-dir to write elsewhere, or --force."
+        )
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for fname, data in encoded.items():
+        (out_dir / fname).write_bytes(data)
+    return {fname: values.size for fname, values in outputs.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Expand per-neuron hex dumps into RTL *_All.hex arrays")
+    parser.add_argument("--layers", nargs="+", default=["disc"],
+                        help="all, gen, disc or layer keys such as gen_l2 (default: disc)")
+    parser.add_argument("--hex-dir", type=Path, default=HEX_DIR, help="Directory with the source dumps")
+    parser.add_argument("--out-dir", type=Path, default=None, help="Output directory (default: --hex-dir)")
+    parser.add_argument("--force", action="store_true",
+                        help="Overwrite existing files that differ (destroys trained generator weights)")
+    args = parser.parse_args()
+
+    written = expand(select_layers(args.layers), args.hex_dir, args.out_dir, force=args.force)
+    for fname, count in written.items():
+        print(f"  Written {count} entries to {fname}")
+    print(f"Expanded {len(written) // 2} layers into {args.out_dir or args.hex_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""Export generator/discriminator checkpoints to the Q8.8 hex files the RTL reads.
+
+Supersedes src/layers/extract_layer3_4_weights.py, which only handled two
+discriminator layers and located them by guessing key substrings. Here every
+Linear layer is found structurally: a ``<prefix>.weight`` matrix followed by a
+``<prefix>.bias`` vector of matching length, in state-dict (= module) order.
+Each tensor is quantized in one numpy pass with round-half-even and saturation
+to int16, then written with hex_io's bulk encoder.
+
+Checkpoints are read without importing torch. Both the legacy serialization
+used by weights/*.ckpt and the zip format of torch >= 1.6 are just pickles
+plus raw little-endian storages, so a restricted unpickler rebuilds the
+tensors as numpy arrays. Anything else (custom classes, other dtypes) falls
+back to ``torch.load``, imported only then.
+
+Two layouts are supported:
+
+* ``rtl`` (default): the i-th Linear layer of the generator / discriminator
+  becomes gen_l{i} / disc_l{i} in weight_store.TENSORS. It is cropped to the
+  shape the RTL instantiates (first out rows, first in columns) and written
+  under that tensor's hex file name. ``--bundle`` also writes the packed
+  binary bundle.
+* ``full``: every Linear layer at its trained shape, written as
+  ``Generator_Layer{i}_Weights_All.hex`` / ``..._Biases_All.hex`` (and the
+  Discriminator equivalents).
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import pickle
+import struct
+import time
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from hex_io import encode_hex
+from qformat import Q8_8, from_float
+from weight_store import BUNDLE_PATH, TENSORS, write_bundle
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CKPT_DIR = REPO_ROOT / "weights"
+EXPORT_DIR = REPO_ROOT / "build" / "hex_export"
+
+NETWORKS = {"gen": "Generator", "disc": "Discriminator"}
+
+# torch storage class -> element dtype (all storages are little-endian on disk).
+_STORAGE_DTYPES = {
+    "FloatStorage": "<f4",
+    "DoubleStorage": "<f8",
+    "HalfStorage": "<f2",
+    "LongStorage": "<i8",
+    "IntStorage": "<i4",
+    "ShortStorage": "<i2",
+    "CharStorage": "i1",
+    "ByteStorage": "u1",
+    "BoolStorage": "?",
+}
+_LEGACY_MAGIC = 0x1950A86A20F9469CFC6C
+
+Linear = Tuple[str, np.ndarray, np.ndarray]  # (prefix, weight (out, in), bias (out,))
+
+
+class _StorageRef:
+    """Placeholder for a storage until its bytes are known."""
+
+    def __init__(self, key: str, dtype: str, numel: int) -> None:
+        self.key = key
+        self.dtype = np.dtype(dtype)
+        self.numel = numel
+        self.data: np.ndarray | None = None
+
+
+class _TensorRef:
+    def __init__(self, storage: _StorageRef, offset: int, size, stride) -> None:
+        self.storage = storage
+        self.offset = offset
+        self.size = tuple(size)
+        self.stride = tuple(stride)
+
+    def array(self) -> np.ndarray:
+        base = self.storage.data
+        itemsize = base.dtype.itemsize
+        return np.lib.stride_tricks.as_strided(
+            base[self.offset :],
+            shape=self.size,
+            strides=tuple(s * itemsize for s in self.stride),
+        ).copy()
+
+
+def _rebuild_tensor(storage, storage_offset, size, stride, *_):
+    return _TensorRef(storage, storage_offset, size, stride)
+
+
+def _rebuild_parameter(data, *_):
+    return data
+
+
+class _StorageType:
+    def __init__(self, name: str) -> None:
+        self.dtype = _STORAGE_DTYPES[name]
+
+
+class _CheckpointUnpickler(pickle.Unpickler):
+    """Only rebuilds plain tensors and (ordered) dicts; everything else is refused."""
+
+    def __init__(self, fh, storages: Dict[str, _StorageRef]) -> None:
+        super().__init__(fh)
+        self.storages = storages
+
+    def find_class(self, module: str, name: str):
+        if module == "collections" and name == "OrderedDict":
+            return OrderedDict
+        if module == "torch._utils" and name == "_rebuild_tensor_v2":
+            return _rebuild_tensor
+        if module == "torch._utils" and name == "_rebuild_parameter":
+            return _rebuild_parameter
+        if module == "torch" and name in _STORAGE_DTYPES:
+            return _StorageType(name)
+        raise pickle.UnpicklingError(f"unsupported global {module}.{name}")
+
+    def persistent_load(self, pid):
+        kind, storage_type, key, _location, numel = pid[:5]
+        if kind != "storage":
+            raise pickle.UnpicklingError(f"unsupported persistent id {kind!r}")
+        if key not in self.storages:
+            self.storages[key] = _StorageRef(key, storage_type.dtype, numel)
+        return self.storages[key]
+
+
+def _read_legacy(data: bytes) -> object:
+    fh = io.BytesIO(data)
+    if pickle.load(fh) != _LEGACY_MAGIC:
+        raise pickle.UnpicklingError("not a legacy torch file")
+    pickle.load(fh)  # protocol version
+    pickle.load(fh)  # sys info
+    storages: Dict[str, _StorageRef] = {}
+    obj = _CheckpointUnpickler(fh, storages).load()
+    for key in pickle.load(fh):
+        (numel,) = struct.unpack("<q", fh.read(8))
+        ref = storages[key]
+        ref.data = np.frombuffer(fh.read(numel * ref.dtype.itemsize), dtype=ref.dtype)
+    return obj
+
+
+def _read_zip(path: Path) -> object:
+    with zipfile.ZipFile(path) as zf:
+        pkl = next(name for name in zf.namelist() if name.endswith("/data.pkl") or name == "data.pkl")
+        prefix = pkl[: -len("data.pkl")]
+        storages: Dict[str, _StorageRef] = {}
+        obj = _CheckpointUnpickler(io.BytesIO(zf.read(pkl)), storages).load()
+        for key, ref in storages.items():
+            ref.data = np.frombuffer(zf.read(f"{prefix}data/{key}"), dtype=ref.dtype)
+    return obj
+
+
+def _materialize(obj):
+    if isinstance(obj, _TensorRef):
+        return obj.array()
+    if isinstance(obj, dict):
+        return OrderedDict((key, _materialize(value)) for key, value in obj.items())
+    return obj
+
+
+def _torch_load(path: Path) -> object:
+    import torch  # slow; only needed for checkpoints the fast reader refuses
+
+    obj = torch.load(path, map_location="cpu")
+
+    def convert(value):
+        if isinstance(value, torch.Tensor):
+            return value.detach().cpu().numpy()
+        if hasattr(value, "state_dict") and not isinstance(value, dict):
+            value = value.state_dict()
+        if isinstance(value, dict):
+            return OrderedDict((key, convert(item)) for key, item in value.items())
+        return value
+
+    return convert(obj)
+
+
+def load_checkpoint(path: Path) -> object:
+    """Return the checkpoint with every tensor replaced by a numpy array."""
+    path = Path(path)
+    try:
+        if zipfile.is_zipfile(path):
+            return _materialize(_read_zip(path))
+        return _materialize(_read_legacy(path.read_bytes()))
+    except (pickle.UnpicklingError, KeyError, StopIteration, struct.error, EOFError):
+        return _torch_load(path)
+
+
+def find_linear_layers(state: object) -> List[Linear]:
+    """Every (weight, bias) Linear pair in `state`, searching nested dicts in order."""
+    layers: List[Linear] = []
+    if not isinstance(state, dict):
+        return layers
+    for key, value in state.items():
+        if isinstance(value, dict):
+            layers.extend((f"{key}.{prefix}", w, b) for prefix, w, b in find_linear_layers(value))
+            continue
+        if not key.endswith(".weight") or not isinstance(value, np.ndarray) or value.ndim != 2:
+            continue
+        prefix = key[: -len(".weight")]
+        bias = state.get(f"{prefix}.bias")
+        if isinstance(bias, np.ndarray) and bias.shape == (value.shape[0],):
+            layers.append((prefix, value, bias))
+    return layers
+
+
+def quantize_q88(values: np.ndarray) -> np.ndarray:
+    """Round-half-even to Q8.8 and saturate to int16, for a whole tensor at once."""
+    return from_float(values, Q8_8, rounding="nearest_even", overflow="saturate")
+
+
+def rtl_tensors(layers: Dict[str, List[Linear]]) -> Dict[str, np.ndarray]:
+    """Map ordered Linear layers onto weight_store.TENSORS, cropped to RTL shapes."""
+    out: Dict[str, np.ndarray] = {}
+    for net, net_layers in layers.items():
+        expected = sorted({key.rsplit("_", 1)[0] for key in TENSORS if key.startswith(net + "_")})
+        if len(net_layers) != len(expected):
+            raise ValueError(f"{net}: checkpoint has {len(net_layers)} Linear layers, RTL has {len(expected)}")
+        for layer_key, (prefix, weight, bias) in zip(expected, net_layers):
+            out_count, in_count = TENSORS[f"{layer_key}_w"][1]
+            if weight.shape[0] < out_count or weight.shape[1] < in_count:
+                raise ValueError(
+                    f"{prefix}: shape {weight.shape} is smaller than the RTL's ({out_count}, {in_count})"
+                )
+            out[f"{layer_key}_w"] = quantize_q88(weight[:out_count, :in_count])
+            out[f"{layer_key}_b"] = quantize_q88(bias[:out_count])
+    return out
+
+
+def full_tensors(layers: Dict[str, List[Linear]]) -> Dict[str, np.ndarray]:
+    """Every Linear layer at its trained shape, keyed by its *_All.hex file name."""
+    out: Dict[str, np.ndarray] = {}
+    for net, net_layers in layers.items():
+        for idx, (_prefix, weight, bias) in enumerate(net_layers, start=1):
+            out[f"{NETWORKS[net]}_Layer{idx}_Weights_All.hex"] = quantize_q88(weight)
+            out[f"{NETWORKS[net]}_Layer{idx}_Biases_All.hex"] = quantize_q88(bias)
+    return out
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+
+def export(
+    checkpoints: Dict[str, Path],
+    out_dir: Path,
+    layout: str = "rtl",
+    bundle: Path | None = None,
+) -> Tuple[Dict[str, np.ndarray], List[str]]:
+    """Export the given {"gen"/"disc": checkpoint} files; returns (tensors, rewritten files)."""
+    layers = {net: find_linear_layers(load_checkpoint(path)) for net, path in checkpoints.items()}
+    for net, net_layers in layers.items():
+        if not net_layers:
+            raise ValueError(f"No Linear layers found in {checkpoints[net]}")
+
+    if layout == "rtl":
+        tensors = rtl_tensors(layers)
+        files = {TENSORS[key][0]: values for key, values in tensors.items()}
+    else:
+        tensors = full_tensors(layers)
+        files = tensors
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rewritten: List[str] = []
+    digests: Dict[str, str] = {}
+    for fname, values in files.items():
+        data = encode_hex(values)
+        digests[fname] = hashlib.sha256(data).hexdigest()
+        if write_if_changed(out_dir / fname, data):
+            rewritten.append(fname)
+
+    if bundle is not None:
+        if layout != "rtl" or set(tensors) != set(TENSORS):
+            raise ValueError("--bundle needs the rtl layout and both checkpoints")
+        write_bundle(bundle, tensors, {key: digests[TENSORS[key][0]] for key in tensors})
+    return tensors, rewritten
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export checkpoints to Q8.8 *_All.hex files")
+    parser.add_argument("--gen", type=Path, default=CKPT_DIR / "G--300.ckpt", help="Generator checkpoint")
+    parser.add_argument("--disc", type=Path, default=CKPT_DIR / "D--300.ckpt", help="Discriminator checkpoint")
+    parser.add_argument("--only", choices=sorted(NETWORKS), default=None, help="Export just one network")
+    parser.add_argument("--out-dir", type=Path, default=EXPORT_DIR,
+                        help="Output directory (default: build/hex_export; src/layers/hex_data to update the RTL)")
+    parser.add_argument("--layout", choices=("rtl", "full"), default="rtl",
+                        help="rtl: crop to the RTL tensor shapes/names; full: every layer as trained")
+    parser.add_argument("--bundle", type=Path, nargs="?", const=BUNDLE_PATH, default=None,
+                        help="Also write the binary weight bundle (default path: build/weights.gwb)")
+    parser.add_argument("--list", action="store_true", help="Only list the Linear layers found")
+    args = parser.parse_args()
+
+    checkpoints = {"gen": args.gen, "disc": args.disc}
+    if args.only:
+        checkpoints = {args.only: checkpoints[args.only]}
+
+    if args.list:
+        for net, path in checkpoints.items():
+            print(f"{path}:")
+            for prefix, weight, bias in find_linear_layers(load_checkpoint(path)):
+                print(f"  {prefix:24s} weight {weight.shape} bias {bias.shape}")
+        return
+
+    start = time.perf_counter()
+    tensors, rewritten = export(checkpoints, args.out_dir, args.layout, args.bundle)
+    elapsed = time.perf_counter() - start
+    print(f"Exported {len(tensors)} tensors to {args.out_dir} in {elapsed * 1000:.0f} ms")
+    print("Rewrote:", ", ".join(rewritten) or "none")
+
+
+if __name__ == "__main__":
+    main()
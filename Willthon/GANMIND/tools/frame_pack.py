@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""Bit-packed, indexed container for binary 28x28 frames.
+
+pixel_serial_loader consumes frames as one bit per pixel, but the notebook
+stores them as ASCII ``0``/``1`` digits (two bytes per pixel with spaces).
+A frame pack keeps each frame as 784 bits = 98 bytes, row-major, pixel 0 in
+the MSB of byte 0 (``np.packbits`` order, i.e. the order pixels are shifted
+into the loader). The file layout follows weight_store's bundle:
+
+    magic | u32 index length | JSON index | pad to 64 | N x 98 frame bytes
+
+The JSON index holds the frame count and the frame names in file order, so
+``FramePack.offset(name)`` is a dictionary lookup plus one multiply. Frames
+and batches come back as zero-copy views into the read-only mmap; popcounts
+and Q8.8 expansion (0 / ONE_Q, as the loader writes into frame_flat) are
+vectorized over whole batches.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from hex_io import write_hex
+
+FRAME_SIZE = 28
+FRAME_PIXELS = FRAME_SIZE * FRAME_SIZE
+FRAME_BYTES = FRAME_PIXELS // 8
+Q_FRAC = 8
+ONE_Q = 1 << Q_FRAC
+
+PACK_MAGIC = b"GANFP001"
+PACK_ALIGN = 64
+PACK_SUFFIX = ".gfp"
+
+# Number of set bits in every byte value.
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint16)
+
+FrameKey = Union[int, str]
+
+
+def parse_binary_text(data: bytes, default_name: str) -> Tuple[List[str], np.ndarray]:
+    """Parse notebook-style text frames into (names, (N, 784) uint8 bits).
+
+    Accepts ``# Image: <name>`` headers (optional) and rows of 28 ``0``/``1``
+    digits with or without spaces, which covers both the converter output and
+    the header-less cleaned dataset.
+    """
+    names: List[str] = []
+    rows: List[bytes] = []
+    pending_name = None
+    for line in data.splitlines():
+        line = line.strip()
+        if line.startswith(b"#"):
+            if line.startswith(b"# Image:"):
+                pending_name = line[len(b"# Image:"):].strip().decode()
+            continue
+        if not line:
+            continue
+        if len(rows) % FRAME_SIZE == 0:
+            names.append(pending_name or f"{default_name}[{len(names)}]")
+            pending_name = None
+        rows.append(line.replace(b" ", b""))
+    if len(rows) % FRAME_SIZE:
+        raise ValueError(f"{default_name}: {len(rows)} pixel rows is not a multiple of {FRAME_SIZE}")
+    bits = np.frombuffer(b"".join(rows), dtype=np.uint8) - ord("0")
+    if bits.size != len(names) * FRAME_PIXELS or np.any(bits > 1):
+        raise ValueError(f"{default_name}: rows must hold {FRAME_SIZE} binary digits")
+    return names, bits.reshape(-1, FRAME_PIXELS)
+
+
+def pack_bits(bits: np.ndarray) -> np.ndarray:
+    """(N, 784) 0/1 pixels -> (N, 98) packed bytes."""
+    bits = np.asarray(bits, dtype=np.uint8).reshape(-1, FRAME_PIXELS)
+    return np.packbits(bits, axis=1)
+
+
+def unpack_bits(packed: np.ndarray) -> np.ndarray:
+    """(N, 98) or (98,) packed bytes -> matching (N, 784) / (784,) uint8 pixels."""
+    return np.unpackbits(np.asarray(packed, dtype=np.uint8), axis=-1)
+
+
+def to_q88(packed: np.ndarray) -> np.ndarray:
+    """Packed frames -> flattened Q8.8 int16 frames holding 0 or ONE_Q."""
+    return unpack_bits(packed).astype(np.int16) << Q_FRAC
+
+
+def popcount(packed: np.ndarray) -> np.ndarray:
+    """Number of 1 pixels per frame (last axis is the 98 packed bytes)."""
+    return _POPCOUNT[np.asarray(packed, dtype=np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def _align(offset: int) -> int:
+    return (offset + PACK_ALIGN - 1) // PACK_ALIGN * PACK_ALIGN
+
+
+def write_pack(path: Path, names: Sequence[str], bits: np.ndarray) -> Path:
+    """Write frames (0/1 pixels, (N, 784)) and their names as a frame pack."""
+    packed = pack_bits(bits)
+    if len(names) != packed.shape[0]:
+        raise ValueError(f"{len(names)} names for {packed.shape[0]} frames")
+    index = json.dumps({"frame_bytes": FRAME_BYTES, "count": len(names), "names": list(names)}).encode()
+    data_start = _align(len(PACK_MAGIC) + 4 + len(index))
+
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as fh:
+        fh.write(PACK_MAGIC)
+        fh.write(struct.pack("<I", len(index)))
+        fh.write(index)
+        fh.write(b"\0" * (data_start - fh.tell()))
+        fh.write(packed.tobytes())
+    tmp.replace(path)
+    return path
+
+
+class FramePack:
+    """Read-only mapping of a frame pack; frames are (98,) uint8 views."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[: len(PACK_MAGIC)] != PACK_MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a frame pack")
+        (index_len,) = struct.unpack_from("<I", self._mm, len(PACK_MAGIC))
+        start = len(PACK_MAGIC) + 4
+        index = json.loads(self._mm[start : start + index_len])
+        if index["frame_bytes"] != FRAME_BYTES:
+            self._mm.close()
+            raise ValueError(f"{path}: unsupported frame size {index['frame_bytes']}")
+        self.names: List[str] = index["names"]
+        self.data_start = _align(start + index_len)
+        self._frames = np.frombuffer(
+            self._mm, dtype=np.uint8, count=index["count"] * FRAME_BYTES, offset=self.data_start
+        ).reshape(index["count"], FRAME_BYTES)
+        # First occurrence wins if a name repeats.
+        self._index: Dict[str, int] = {}
+        for idx, name in enumerate(self.names):
+            self._index.setdefault(name, idx)
+
+    def __len__(self) -> int:
+        return self._frames.shape[0]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return iter(self._frames)
+
+    def position(self, key: FrameKey) -> int:
+        return self._index[key] if isinstance(key, str) else int(key)
+
+    def offset(self, key: FrameKey) -> int:
+        """Byte offset of a frame (by index or name) within the file."""
+        return self.data_start + self.position(key) * FRAME_BYTES
+
+    def frame(self, key: FrameKey) -> np.ndarray:
+        return self._frames[self.position(key)]
+
+    def batch(self, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Frames [start, stop) as an (n, 98) view."""
+        return self._frames[start:stop]
+
+    def __getitem__(self, key):
+        if isinstance(key, (str, int, np.integer)):
+            return self.frame(key)
+        return self._frames[key]
+
+    def q88(self, start: int = 0, stop: int | None = None) -> np.ndarray:
+        return to_q88(self.batch(start, stop))
+
+    def popcounts(self) -> np.ndarray:
+        return popcount(self._frames)
+
+    def close(self) -> None:
+        self._frames = None
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # caller still holds views; the map is released with the last one
+
+    def __enter__(self) -> "FramePack":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_pack(path: Path) -> FramePack:
+    return FramePack(path)
+
+
+def load_text_frames(paths: Sequence[Path]) -> Tuple[List[str], np.ndarray]:
+    names: List[str] = []
+    chunks: List[np.ndarray] = []
+    for path in paths:
+        part_names, bits = parse_binary_text(Path(path).read_bytes(), Path(path).name)
+        names.extend(part_names)
+        chunks.append(bits)
+    return names, np.concatenate(chunks) if chunks else np.zeros((0, FRAME_PIXELS), dtype=np.uint8)
+
+
+def write_text_frames(path: Path, names: Sequence[str], packed: np.ndarray) -> None:
+    """Write packed frames back in the notebook's spaced 0/1 format."""
+    bits = unpack_bits(packed).reshape(-1, FRAME_SIZE, FRAME_SIZE)
+    chars = np.full(bits.shape[:2] + (2 * FRAME_SIZE,), ord(" "), dtype=np.uint8)
+    chars[:, :, 0::2] = bits + ord("0")
+    chars[:, :, -1] = ord("\n")
+    with Path(path).open("wb") as fh:
+        for name, rows in zip(names, chars):
+            fh.write(f"# Image: {name}\n".encode() + rows.tobytes() + b"\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pack/inspect bit-packed 28x28 frame datasets")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    pack = sub.add_parser("pack", help="Pack notebook .mem text frames")
+    pack.add_argument("inputs", type=Path, nargs="+")
+    pack.add_argument("--out", type=Path, required=True)
+
+    info = sub.add_parser("info", help="Frame count and per-frame ones statistics")
+    info.add_argument("pack", type=Path)
+    info.add_argument("--thresholds", type=int, nargs="*", default=[128, 256, 512],
+                      help="Report P(ones > t) for each t")
+
+    unpack = sub.add_parser("unpack", help="Export frames as text .mem or Q8.8 hex")
+    unpack.add_argument("pack", type=Path)
+    unpack.add_argument("--mem", type=Path, help="Notebook-style 0/1 text output")
+    unpack.add_argument("--q88", type=Path, help="784 Q8.8 hex values per frame")
+    unpack.add_argument("--frame", default=None, help="Only this frame (index or name)")
+
+    args = parser.parse_args()
+
+    if args.cmd == "pack":
+        names, bits = load_text_frames(args.inputs)
+        out = write_pack(args.out, names, bits)
+        print(f"Packed {len(names)} frames ({out.stat().st_size} bytes) to {out}")
+    elif args.cmd == "info":
+        with open_pack(args.pack) as frames:
+            ones = frames.popcounts()
+            print(f"frames      : {len(frames)}")
+            if ones.size:
+                print(f"mean ones   : {ones.mean():.3f}")
+                print(f"std ones    : {ones.std():.3f}")
+                print(f"min/max ones: {int(ones.min())}/{int(ones.max())}")
+                for t in args.thresholds:
+                    print(f"P(X > {t:4d}): {np.mean(ones > t):.4f}")
+    elif args.cmd == "unpack":
+        if not (args.mem or args.q88):
+            raise SystemExit("Give --mem and/or --q88")
+        with open_pack(args.pack) as frames:
+            if args.frame is None:
+                names, packed = frames.names, frames.batch()
+            else:
+                key = int(args.frame) if args.frame.isdigit() else args.frame
+                pos = frames.position(key)
+                names, packed = [frames.names[pos]], frames.batch(pos, pos + 1)
+            if args.mem:
+                write_text_frames(args.mem, names, packed)
+            if args.q88:
+                write_hex(args.q88, to_q88(packed))
+            print(f"Exported {len(names)} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Warm, reusable fixed-point model of the gan_serial_top datapath.
+
+compute_gan_serial_golden passes a dict of weight lists (or flat arrays) around
+by string key, and every caller loads it again. ``GANModel`` loads the twelve
+tensors once, checks them against weight_store.TENSORS, and keeps each layer
+as a contiguous (out, in) int16 matrix with its bias pre-shifted to Q16.16 in
+int32. The resident size is close to the raw parameter bytes (about 300 KB).
+With ``cache_float=True`` the model also keeps the float64 transposes the
+matmuls use, so they are not rebuilt per call. That costs about 4x the memory
+and pays off for many small batches.
+
+All arithmetic is bit-exact with compute_gan_serial_golden (dense_layer,
+sigmoid_vector, lut_expand, discriminator_head):
+
+    model = GANModel.load()
+    out = model.generate(seeds)           # (N, 64) int16 -> GeneratorOutput
+    scores, flags = model.discriminate(vectors)
+    stages = model.full_pipeline(seeds)   # {golden file: (N, ...) array}
+"""
+from __future__ import annotations
+
+import argparse
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+import compute_gan_serial_golden as golden
+import gather_plan
+import qformat
+from weight_store import TENSORS
+
+LAYERS = ("gen_l1", "gen_l2", "gen_l3", "disc_l1", "disc_l2", "disc_l3")
+FEATURES = 128
+DISC_IN = 256
+FRAME_PIXELS = 28 * 28
+
+
+class Layer(NamedTuple):
+    weights: np.ndarray            # (out, in) int16, C-contiguous
+    bias_q: np.ndarray             # (out,) int32, bias << Q_FRAC
+    weights_t: Optional[np.ndarray]  # (in, out) float64 when cache_float
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.weights.shape  # type: ignore[return-value]
+
+
+class GeneratorOutput(NamedTuple):
+    features: np.ndarray  # (N, 128) layer-3 outputs
+    sigmoid: np.ndarray   # (N, 128)
+    disc_vec: np.ndarray  # (N, 256) vector_expander output
+    frame: np.ndarray     # (N, 784) vector_upsampler output
+
+
+def _validated(key: str, values) -> np.ndarray:
+    _, shape = TENSORS[key]
+    arr = np.asarray(values)
+    expected = int(np.prod(shape))
+    if arr.size != expected:
+        raise ValueError(f"{key}: expected {expected} values for shape {shape}, found {arr.size}")
+    if arr.dtype != np.int16:
+        if arr.min(initial=0) < -32768 or arr.max(initial=0) > 32767:
+            raise ValueError(f"{key}: values outside int16")
+        arr = arr.astype(np.int16)
+    return np.ascontiguousarray(arr.reshape(shape))
+
+
+class GANModel:
+    """Generator and discriminator weights held as compact arrays."""
+
+    def __init__(self, tensors: Dict[str, object], cache_float: bool = False) -> None:
+        self.layers: Dict[str, Layer] = {}
+        for name in LAYERS:
+            weights = _validated(f"{name}_w", tensors[f"{name}_w"])
+            bias = _validated(f"{name}_b", tensors[f"{name}_b"])
+            bias_q = bias.astype(np.int32) << golden.Q_FRAC
+            weights_t = np.ascontiguousarray(weights.T, dtype=np.float64) if cache_float else None
+            self.layers[name] = Layer(weights, bias_q, weights_t)
+        self._expand_disc = gather_plan.plan("rom", FEATURES, DISC_IN)
+        self._expand_frame = gather_plan.plan("rom", FEATURES, FRAME_PIXELS)
+        self._sampler = gather_plan.plan("accumulator", FRAME_PIXELS, DISC_IN)
+
+    @classmethod
+    def load(cls, source: str = "cache", cache_float: bool = False) -> "GANModel":
+        """Load via compute_gan_serial_golden.load_golden_weights ("hex", "cache" or "bundle")."""
+        return cls(golden.load_golden_weights(source, as_lists=False), cache_float)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the weight arrays (and float caches, if any)."""
+        total = 0
+        for layer in self.layers.values():
+            total += layer.weights.nbytes + layer.bias_q.nbytes
+            total += layer.weights_t.nbytes if layer.weights_t is not None else 0
+        return total
+
+    def dense(self, name: str, mat_in: np.ndarray) -> np.ndarray:
+        """One layer over every row of (N, in): the RTL's wrapped 32-bit MAC, sliced to Q8.8."""
+        layer = self.layers[name]
+        out_count, in_count = layer.shape
+        vecs = np.asarray(mat_in)[:, :in_count]
+        weights_t = layer.weights_t if layer.weights_t is not None else layer.weights.T.astype(np.float64)
+        # Products fit in 31 bits and in_count is tiny, so the float64 matmul is exact.
+        dots = (vecs.astype(np.float64) @ weights_t).astype(np.int64)
+        acc = qformat.wrap(dots + layer.bias_q, 32)
+        return qformat.requantize(acc, qformat.Q16_16, qformat.Q8_8)
+
+    def generate(self, seeds: np.ndarray) -> GeneratorOutput:
+        """Generator path for (N, 64) or (64,) seed vectors."""
+        seeds = np.atleast_2d(np.asarray(seeds, dtype=np.int16))
+        features = self.dense("gen_l3", self.dense("gen_l2", self.dense("gen_l1", seeds)))
+        sigmoid = golden.sigmoid_batch(features)
+        return GeneratorOutput(features, sigmoid, sigmoid[:, self._expand_disc], sigmoid[:, self._expand_frame])
+
+    def discriminate(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(scores, real flags) for (N, 256) or (256,) discriminator inputs."""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.int16))
+        scores = self.dense("disc_l3", self.dense("disc_l2", self.dense("disc_l1", vectors)))[:, 0]
+        return scores, (scores > 0).astype(np.int16)
+
+    def sample_frames(self, frames: np.ndarray) -> np.ndarray:
+        """frame_sampler (784 -> 256) over every row of (N, 784)."""
+        return np.atleast_2d(np.asarray(frames, dtype=np.int16))[:, self._sampler]
+
+    def full_pipeline(self, seeds: Optional[np.ndarray] = None,
+                      real_frames: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Every golden stage for each seed, keyed by golden file name.
+
+        Defaults reproduce the testbench: the single LFSR seed vector and the
+        every-7th-pixel real frame. One real frame is shared by all seeds;
+        otherwise `real_frames` needs a row per seed.
+        """
+        if seeds is None:
+            seeds = np.asarray(golden.lfsr_sequence(), dtype=np.int16)
+        if real_frames is None:
+            real_frames = np.asarray(golden.build_frame_pattern(), dtype=np.int16)
+        gen = self.generate(seeds)
+        count = gen.features.shape[0]
+        real = self.sample_frames(real_frames)
+        if real.shape[0] not in (1, count):
+            raise ValueError(f"{real.shape[0]} real frames for {count} seeds")
+        fake_score, fake_flag = self.discriminate(gen.disc_vec)
+        real_score, real_flag = self.discriminate(real)
+        scores = np.stack(np.broadcast_arrays(fake_score, fake_flag, real_score, real_flag), axis=1)
+        return {
+            "gan_seed.hex": np.atleast_2d(np.asarray(seeds, dtype=np.int16)),
+            "gan_gen_features.hex": gen.features,
+            "gan_sigmoid.hex": gen.sigmoid,
+            "gan_fake_disc_vec.hex": gen.disc_vec,
+            "gan_fake_frame.hex": gen.frame,
+            "gan_real_sample.hex": np.broadcast_to(real, (count, DISC_IN)),
+            "gan_scores.hex": scores,
+        }
+
+
+def _self_check(model: GANModel, count: int) -> None:
+    """Compare against the golden files and the batch golden engine."""
+    single = model.full_pipeline()
+    for name in golden.GOLDEN_OUTPUTS:
+        path = golden.GOLDEN_DIR / name
+        if path.exists() and single[name][0].tolist() != golden.load_hex(path):
+            raise SystemExit(f"{name} differs from {path}")
+    gold = golden.load_golden_weights("cache", as_lists=False)
+    seeds = golden.lfsr_seed_matrix(count)
+    reference = golden.compute_stages_batch(gold, seeds)
+    ours = model.full_pipeline(seeds)
+    for name, values in reference.items():
+        if not np.array_equal(values, ours[name]):
+            raise SystemExit(f"{name} differs from compute_stages_batch")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load the GAN model once and check it")
+    parser.add_argument("--weights", choices=("hex", "cache", "bundle"), default="cache")
+    parser.add_argument("--cache-float", action="store_true", help="Also keep float64 weight transposes")
+    parser.add_argument("--count", type=int, default=16, help="Seed vectors for the batch check")
+    args = parser.parse_args()
+
+    model = GANModel.load(args.weights, args.cache_float)
+    for name, layer in model.layers.items():
+        print(f"{name:8s} {layer.shape[0]:4d} x {layer.shape[1]:<4d}")
+    print(f"resident weights: {model.nbytes / 1024:.1f} KiB")
+    _self_check(model, args.count)
+    print(f"Matches tb/golden and compute_stages_batch for {args.count} seeds")
+
+
+if __name__ == "__main__":
+    main()
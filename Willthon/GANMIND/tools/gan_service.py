@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""Long-lived local inference service for the fixed-point GAN model.
+
+Loading the weights costs more than scoring a handful of frames, so jobs that
+only need a few results per run can ask this service instead. It keeps one
+GANModel warm and answers two requests:
+
+* ``generate``: {"seed": <LFSR vector index> | [64 Q8.8 words]}
+  -> {"frame": [784 words], "score": int, "real": 0|1}
+* ``score``:    {"frame": [784 Q8.8 words]} -> {"score": int, "real": 0|1}
+
+Requests of one kind that arrive within ``--window-ms`` of the first are
+coalesced into one micro-batch (at most ``--max-batch`` rows) and run as a
+single batched pass, bit-exact with compute_gan_serial_golden. ``stats``
+reports per-request latency and batch-size histograms for each kind.
+
+The transport is either localhost HTTP (POST /generate, POST /score,
+GET /stats, JSON bodies) or a Unix socket carrying one JSON object per line
+with an extra "op" key.
+
+    python tools/gan_service.py serve --http 127.0.0.1:8765
+    python tools/gan_service.py serve --unix build/gan_service.sock
+    python tools/gan_service.py request http://127.0.0.1:8765 generate --seed 3
+    python tools/gan_service.py request unix:build/gan_service.sock score --frame-file f.mem
+    python tools/gan_service.py load http://127.0.0.1:8765 --clients 32 --requests 2000 --check
+    python tools/gan_service.py stats http://127.0.0.1:8765
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import stat
+import threading
+import time
+import traceback
+import urllib.error
+import urllib.request
+from bisect import bisect_left
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import lfsr_jump
+from gan_model import FRAME_PIXELS, GANModel
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_HTTP = "127.0.0.1:8765"
+DEFAULT_SOCKET = REPO_ROOT / "build" / "gan_service.sock"
+SEED_WIDTH = lfsr_jump.SEED_COUNT
+# The LFSR is maximal length (lfsr_jump check), so seed vector i + LFSR_PERIOD
+# starts LFSR_PERIOD * SEED_WIDTH shifts later, i.e. at the same state as i.
+LFSR_PERIOD = 0xFFFF
+LISTEN_BACKLOG = 128  # socketserver's default of 5 drops bursts of concurrent clients
+
+LATENCY_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class Histogram:
+    """Counts per upper bound (the last bucket is open-ended), plus sum and count."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def add(self, value: float, times: int = 1) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.bounds, value)] += times
+            self.total += value * times
+            self.count += times
+
+    def _quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding quantile `q` (None if in the open bucket)."""
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"<={bound:g}" for bound in self.bounds] + [f">{self.bounds[-1]:g}"]
+            return {
+                "count": self.count,
+                "mean": self.total / self.count if self.count else 0.0,
+                "p50": self._quantile(0.5) if self.count else None,
+                "p99": self._quantile(0.99) if self.count else None,
+                "buckets": {label: count for label, count in zip(labels, self.counts) if count},
+            }
+
+
+class _Pending:
+    __slots__ = ("row", "future", "submitted")
+
+    def __init__(self, row: np.ndarray) -> None:
+        self.row = row
+        self.future: Future = Future()
+        self.submitted = time.perf_counter()
+
+
+class MicroBatcher:
+    """Coalesce single-row requests into batches for one batched function.
+
+    `run` maps a stacked (N, width) int16 batch to one result per row. A
+    worker thread takes the first queued row, keeps collecting until
+    `window_s` has passed or `max_batch` rows are in hand, runs the batch and
+    resolves every caller's future.
+    """
+
+    def __init__(self, name: str, run: Callable[[np.ndarray], List[dict]],
+                 window_s: float, max_batch: int) -> None:
+        self.name = name
+        self.run = run
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self.latency_ms = Histogram(LATENCY_BOUNDS_MS)
+        self.batch_size = Histogram([1 << k for k in range(max(max_batch - 1, 1).bit_length() + 1)])
+        self._queue: "queue.Queue[Optional[_Pending]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name=f"batcher-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, row: np.ndarray) -> Future:
+        pending = _Pending(row)
+        self._queue.put(pending)
+        return pending.future
+
+    def __call__(self, row: np.ndarray) -> dict:
+        return self.submit(row).result()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first: _Pending) -> Tuple[List[_Pending], bool]:
+        batch = [first]
+        deadline = first.submitted + self.window_s
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _loop(self) -> None:
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stop = self._collect(first)
+            try:
+                results = self.run(np.stack([item.row for item in batch]))
+            except Exception as exc:  # noqa: BLE001 - reported to every caller
+                for item in batch:
+                    item.future.set_exception(exc)
+                continue
+            done = time.perf_counter()
+            for item, result in zip(batch, results):
+                item.future.set_result(result)
+                self.latency_ms.add((done - item.submitted) * 1000.0)
+            self.batch_size.add(len(batch))
+
+
+def _words(values, count: int, what: str) -> np.ndarray:
+    arr = np.asarray(values)
+    if arr.shape != (count,) or not np.issubdtype(arr.dtype, np.integer):
+        raise ValueError(f"{what} must be a list of {count} integers")
+    if arr.min() < -32768 or arr.max() > 32767:
+        raise ValueError(f"{what} has values outside int16")
+    return arr.astype(np.int16)
+
+
+class GANService:
+    """A warm GANModel behind one MicroBatcher per request kind."""
+
+    def __init__(self, model: GANModel, window_ms: float = 2.0, max_batch: int = 64) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.model = model
+        self.started = time.time()
+        window_s = window_ms / 1000.0
+        self.batchers: Dict[str, MicroBatcher] = {
+            "generate": MicroBatcher("generate", self._generate_batch, window_s, max_batch),
+            "score": MicroBatcher("score", self._score_batch, window_s, max_batch),
+        }
+
+    def _generate_batch(self, seeds: np.ndarray) -> List[dict]:
+        gen = self.model.generate(seeds)
+        scores, flags = self.model.discriminate(gen.disc_vec)
+        return [
+            {"frame": frame, "score": score, "real": flag}
+            for frame, score, flag in zip(gen.frame.tolist(), scores.tolist(), flags.tolist())
+        ]
+
+    def _score_batch(self, frames: np.ndarray) -> List[dict]:
+        scores, flags = self.model.discriminate(self.model.sample_frames(frames))
+        return [{"score": score, "real": flag} for score, flag in zip(scores.tolist(), flags.tolist())]
+
+    def handle(self, op: str, payload: dict) -> dict:
+        """Answer one request; raises ValueError for malformed ones."""
+        if op == "stats":
+            return self.stats()
+        if op == "generate":
+            seed = payload.get("seed", 0)
+            if isinstance(seed, int) and not isinstance(seed, bool):
+                if seed < 0:
+                    raise ValueError("seed index must be non-negative")
+                # Reduced so any index fits lfsr_jump's uint64 offsets.
+                row = lfsr_jump.seed_vectors([seed % LFSR_PERIOD])[0]
+            else:
+                row = _words(seed, SEED_WIDTH, "seed")
+        elif op == "score":
+            row = _words(payload.get("frame"), FRAME_PIXELS, "frame")
+        else:
+            raise ValueError(f"Unknown op {op!r}; known: generate, score, stats")
+        return self.batchers[op](row)
+
+    def stats(self) -> dict:
+        return {
+            "uptime_s": round(time.time() - self.started, 3),
+            "window_ms": self.batchers["generate"].window_s * 1000.0,
+            "max_batch": self.batchers["generate"].max_batch,
+            "ops": {
+                name: {"latency_ms": b.latency_ms.snapshot(), "batch_size": b.batch_size.snapshot()}
+                for name, b in self.batchers.items()
+            },
+        }
+
+    def close(self) -> None:
+        for batcher in self.batchers.values():
+            batcher.close()
+
+
+# ---------------------------------------------------------------------------
+# Transports
+# ---------------------------------------------------------------------------
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    service: GANService  # set on the subclass built by make_http_server
+    quiet = True
+
+    def _reply(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, op: str, payload: dict) -> None:
+        try:
+            self._reply(200, self.service.handle(op, payload))
+        except ValueError as exc:
+            self._reply(400, {"error": str(exc)})
+        except Exception as exc:  # noqa: BLE001 - answer instead of dropping the connection
+            traceback.print_exc()
+            self._reply(500, {"error": f"internal error: {type(exc).__name__}: {exc}"})
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        if self.path.rstrip("/") == "/stats":
+            self._dispatch("stats", {})
+        else:
+            self._reply(404, {"error": f"No such endpoint {self.path}"})
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server API
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as exc:
+            self._reply(400, {"error": f"Bad JSON: {exc}"})
+            return
+        if not isinstance(payload, dict):
+            self._reply(400, {"error": "request body must be a JSON object"})
+            return
+        self._dispatch(self.path.strip("/"), payload)
+
+    def log_message(self, fmt: str, *args) -> None:
+        if not self.quiet:
+            super().log_message(fmt, *args)
+
+
+class _UnixHandler(socketserver.StreamRequestHandler):
+    service: GANService
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                payload = json.loads(line)
+                if not isinstance(payload, dict):
+                    raise ValueError("request must be a JSON object")
+                reply = self.service.handle(str(payload.pop("op", "")), payload)
+            except (ValueError, json.JSONDecodeError) as exc:
+                reply = {"error": str(exc)}
+            except Exception as exc:  # noqa: BLE001 - answer instead of dropping the connection
+                traceback.print_exc()
+                reply = {"error": f"internal error: {type(exc).__name__}: {exc}"}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    request_queue_size = LISTEN_BACKLOG
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    request_queue_size = LISTEN_BACKLOG
+    daemon_threads = True
+
+
+def make_http_server(service: GANService, address: str, quiet: bool = True) -> ThreadingHTTPServer:
+    host, _, port = address.rpartition(":")
+    handler = type("Handler", (_HTTPHandler,), {"service": service, "quiet": quiet})
+    return _HTTPServer((host or "127.0.0.1", int(port)), handler)
+
+
+def _remove_stale_socket(path: Path) -> None:
+    """Unlink `path` only if it is a socket nobody is listening on."""
+    try:
+        mode = path.lstat().st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise SystemExit(f"{path} exists and is not a socket; refusing to replace it")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except OSError:
+        path.unlink()  # left behind by a service that exited without cleaning up
+        return
+    finally:
+        probe.close()
+    raise SystemExit(f"Another service is already listening on {path}")
+
+
+def make_unix_server(service: GANService, path: Path) -> socketserver.UnixStreamServer:
+    _remove_stale_socket(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handler = type("Handler", (_UnixHandler,), {"service": service})
+    return _UnixServer(str(path), handler)
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+class Client:
+    """Blocking client; `address` is "http://host:port" or "unix:<path>"."""
+
+    def __init__(self, address: str, timeout: float = 30.0) -> None:
+        self.address = address
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+
+    def _unix_call(self, op: str, payload: dict) -> dict:
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(self.timeout)
+            self._sock.connect(self.address[len("unix:"):])
+            self._reader = self._sock.makefile("rb")
+        self._sock.sendall(json.dumps({"op": op, **payload}).encode() + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("service closed the connection")
+        return json.loads(line)
+
+    def _http_call(self, op: str, payload: dict) -> dict:
+        url = f"{self.address.rstrip('/')}/{op}"
+        data = None if op == "stats" else json.dumps(payload).encode()
+        req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return json.loads(resp.read())
+        except urllib.error.HTTPError as exc:
+            return json.loads(exc.read() or b"{}")
+
+    def call(self, op: str, **payload) -> dict:
+        reply = self._unix_call(op, payload) if self.address.startswith("unix:") else self._http_call(op, payload)
+        if "error" in reply:
+            raise ValueError(reply["error"])
+        return reply
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+            self._sock = None
+
+
+def _normalize_address(address: str) -> str:
+    if address.startswith(("http://", "unix:")):
+        return address
+    if "/" in address or address.endswith(".sock"):
+        return f"unix:{address}"
+    return f"http://{address}"
+
+
+def format_stats(stats: dict) -> str:
+    lines = [f"uptime {stats['uptime_s']:.1f} s, window {stats['window_ms']:g} ms, max batch {stats['max_batch']}"]
+    for op, hists in stats["ops"].items():
+        for name, hist in hists.items():
+            lines.append(f"{op} {name}: n={hist['count']} mean={hist['mean']:.3f} "
+                         f"p50<={hist['p50'] or '-'} p99<={hist['p99'] or '-'}")
+            peak = max(hist["buckets"].values(), default=0)
+            for label, count in hist["buckets"].items():
+                lines.append(f"  {label:>8s} {count:8d} {'#' * max(1, round(40 * count / peak))}")
+    return "\n".join(lines)
+
+
+def _load(address: str, clients: int, requests: int, score_share: float, check: Optional[GANModel]) -> None:
+    """Fire `requests` mixed requests from `clients` threads and report the service's histograms."""
+    rng = np.random.default_rng(0)
+    frames = rng.integers(0, 257, (64, FRAME_PIXELS)).astype(np.int16)
+    kinds = rng.random(requests) < score_share
+    local = threading.local()
+
+    def one(idx: int) -> Tuple[int, dict]:
+        if not hasattr(local, "client"):
+            local.client = Client(address)
+        if kinds[idx]:
+            return idx, local.client.call("score", frame=frames[idx % len(frames)].tolist())
+        return idx, local.client.call("generate", seed=idx)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        replies = dict(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+    print(f"{requests} requests from {clients} clients in {elapsed:.2f} s ({requests / elapsed:.0f} req/s)")
+
+    if check is not None:
+        score_idx = np.flatnonzero(kinds)
+        gen_idx = np.flatnonzero(~kinds)
+        scores, _ = check.discriminate(check.sample_frames(frames[score_idx % len(frames)]))
+        gen = check.generate(lfsr_jump.seed_vectors(gen_idx))
+        fake, _ = check.discriminate(gen.disc_vec)
+        bad = [i for i, s in zip(score_idx.tolist(), scores.tolist()) if replies[i]["score"] != s]
+        bad += [i for i, f, s in zip(gen_idx.tolist(), gen.frame.tolist(), fake.tolist())
+                if replies[i]["frame"] != f or replies[i]["score"] != s]
+        if bad:
+            raise SystemExit(f"{len(bad)} replies differ from a local GANModel (first: request {bad[0]})")
+        print("Every reply matches a local GANModel")
+    print(format_stats(Client(address).call("stats")))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-batching local inference service for the GAN model")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="Load the model once and serve requests")
+    where = serve.add_mutually_exclusive_group()
+    where.add_argument("--http", default=None, help=f"host:port to listen on (default {DEFAULT_HTTP})")
+    where.add_argument("--unix", type=Path, default=None, help="Unix socket path")
+    serve.add_argument("--weights", choices=("hex", "cache", "bundle"), default="cache")
+    serve.add_argument("--window-ms", type=float, default=2.0, help="Coalescing window after the first request")
+    serve.add_argument("--max-batch", type=int, default=64)
+    serve.add_argument("--verbose", action="store_true", help="Log every HTTP request")
+
+    request = sub.add_parser("request", help="Send one request and print the JSON reply")
+    request.add_argument("address", help="http://host:port, host:port or unix:<path>")
+    request.add_argument("op", choices=("generate", "score"))
+    request.add_argument("--seed", type=lambda v: int(v, 0), default=0, help="LFSR vector index for generate")
+    request.add_argument("--frame-file", type=Path, help="784-word $readmemh frame for score")
+
+    load = sub.add_parser("load", help="Drive the service with concurrent clients and show its histograms")
+    load.add_argument("address")
+    load.add_argument("--clients", type=int, default=16)
+    load.add_argument("--requests", type=int, default=1000)
+    load.add_argument("--score-share", type=float, default=0.5, help="Fraction of score requests")
+    load.add_argument("--check", action="store_true", help="Compare every reply with a local GANModel")
+
+    stats = sub.add_parser("stats", help="Print the service's latency and batch-size histograms")
+    stats.add_argument("address")
+    stats.add_argument("--json", action="store_true")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        service = GANService(GANModel.load(args.weights, cache_float=True), args.window_ms, args.max_batch)
+        if args.unix is not None:
+            server = make_unix_server(service, args.unix)
+            where_desc = f"unix:{args.unix}"
+        else:
+            server = make_http_server(service, args.http or DEFAULT_HTTP, quiet=not args.verbose)
+            where_desc = f"http://{server.server_address[0]}:{server.server_address[1]}"
+        print(f"Serving on {where_desc} (window {args.window_ms:g} ms, max batch {args.max_batch}); Ctrl+C to stop")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.close()
+            if args.unix is not None and args.unix.exists():
+                os.unlink(args.unix)
+        return
+
+    address = _normalize_address(args.address)
+    if args.command == "request":
+        client = Client(address)
+        if args.op == "score":
+            if args.frame_file is None:
+                raise SystemExit("score needs --frame-file")
+            from score_dataset import load_frames
+
+            _, frames = load_frames(args.frame_file)
+            reply = client.call("score", frame=frames[0].tolist())
+        else:
+            reply = client.call("generate", seed=args.seed)
+        print(json.dumps(reply))
+    elif args.command == "load":
+        _load(address, args.clients, args.requests, args.score_share,
+              GANModel.load() if args.check else None)
+    else:
+        reply = Client(address).call("stats")
+        print(json.dumps(reply, indent=2) if args.json else format_stats(reply))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Precomputed gather-index plans for the RTL resamplers.
+
+Three interface blocks move words between vectors of different lengths:
+
+* vector_expander (128 -> 256) and vector_upsampler (128 -> 784) read from a
+  constant ROM, ``src_index_lut[i] = (i * INPUT_COUNT) / OUTPUT_COUNT``;
+* frame_sampler (784 -> 256) walks the frame with a base step plus a
+  remainder accumulator, clamped to the last pixel.
+
+A plan is the source index of every output, computed once per
+(kind, input_count, output_count) by replaying the block's own address rule
+and kept in memory. ``gather`` applies it to a batch of any leading shape as
+one numpy fancy index. ``export`` writes a plan as a $readmemh index ROM.
+
+    python tools/gather_plan.py check              # plans vs the reference loops
+    python tools/gather_plan.py export             # build/index_rom/*.hex at RTL defaults
+    python tools/gather_plan.py show frame_sampler
+"""
+from __future__ import annotations
+
+import argparse
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+import hex_io
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RTL_DIR = REPO_ROOT / "src" / "interfaces"
+ROM_DIR = REPO_ROOT / "build" / "index_rom"
+
+# RTL module -> address rule it implements.
+MODULES: Dict[str, str] = {
+    "vector_expander": "rom",
+    "vector_upsampler": "rom",
+    "frame_sampler": "accumulator",
+}
+
+
+def _rom_plan(in_count: int, out_count: int) -> np.ndarray:
+    return (np.arange(out_count, dtype=np.int64) * in_count) // out_count
+
+
+def _accumulator_plan(in_count: int, out_count: int) -> np.ndarray:
+    base_step, step_rem = divmod(in_count, out_count)
+    plan = np.empty(out_count, dtype=np.int64)
+    src_index = rem_accum = 0
+    for out_idx in range(out_count):
+        plan[out_idx] = src_index
+        next_idx = src_index + base_step
+        if step_rem:
+            rem_accum += step_rem
+            if rem_accum >= out_count:
+                rem_accum -= out_count
+                next_idx += 1
+        src_index = min(in_count - 1, next_idx)
+    return plan
+
+
+_RULES = {"rom": _rom_plan, "accumulator": _accumulator_plan}
+
+
+@lru_cache(maxsize=None)
+def plan(kind: str, in_count: int, out_count: int) -> np.ndarray:
+    """Read-only (out_count,) intp source indices; `kind` is "rom" or "accumulator"."""
+    if in_count <= 0 or out_count <= 0:
+        raise ValueError(f"{kind}: input and output counts must be positive")
+    try:
+        rule = _RULES[kind]
+    except KeyError:
+        raise ValueError(f"Unknown plan kind {kind!r}; known: {', '.join(sorted(_RULES))}") from None
+    index = rule(in_count, out_count).astype(np.intp)
+    index.setflags(write=False)
+    return index
+
+
+def module_plan(module: str, in_count: int | None = None, out_count: int | None = None) -> np.ndarray:
+    """Plan of an RTL module, at its declared parameter defaults unless overridden."""
+    if in_count is None or out_count is None:
+        declared = rtl_counts(module)
+        in_count = declared[0] if in_count is None else in_count
+        out_count = declared[1] if out_count is None else out_count
+    return plan(MODULES[module], in_count, out_count)
+
+
+def gather(mat: np.ndarray, kind: str, out_count: int) -> np.ndarray:
+    """Resample the last axis of `mat` to `out_count` words."""
+    mat = np.asarray(mat)
+    return mat[..., plan(kind, mat.shape[-1], out_count)]
+
+
+def rtl_counts(module: str, rtl_dir: Path = RTL_DIR) -> Tuple[int, int]:
+    """(INPUT_COUNT, OUTPUT_COUNT) defaults declared by `module`."""
+    from cycle_estimator import module_params
+
+    declared = module_params(rtl_dir / f"{module}.v")
+    return declared["INPUT_COUNT"], declared["OUTPUT_COUNT"]
+
+
+def export(module: str, out_dir: Path = ROM_DIR) -> Path:
+    """Write the module's plan as a one-index-per-line hex ROM."""
+    in_count, out_count = rtl_counts(module)
+    path = out_dir / f"{module}_{in_count}x{out_count}.hex"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    hex_io.write_hex(path, module_plan(module, in_count, out_count))
+    return path
+
+
+def _reference(module: str, in_count: int, out_count: int) -> np.ndarray:
+    """The golden model's loops, run on the indices themselves."""
+    import compute_gan_serial_golden as golden
+
+    indices = list(range(in_count))
+    if MODULES[module] == "accumulator":
+        return np.asarray(golden.frame_sampler(indices, out_count))
+    return np.asarray(golden.lut_expand(indices, out_count))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gather-index plans for the RTL resamplers")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("check", help="Compare every plan with the golden model's loops")
+    export_p = sub.add_parser("export", help="Write the plans as $readmemh index ROMs")
+    export_p.add_argument("--out-dir", type=Path, default=ROM_DIR)
+    show_p = sub.add_parser("show", help="Print one module's plan")
+    show_p.add_argument("module", choices=sorted(MODULES))
+    args = parser.parse_args()
+
+    if args.command == "show":
+        in_count, out_count = rtl_counts(args.module)
+        print(f"{args.module} {in_count} -> {out_count}: {module_plan(args.module).tolist()}")
+        return
+    failures = 0
+    for module in MODULES:
+        if args.command == "export":
+            print(f"{module:17s} -> {export(module, args.out_dir)}")
+            continue
+        in_count, out_count = rtl_counts(module)
+        if np.array_equal(module_plan(module), _reference(module, in_count, out_count)):
+            print(f"[ OK ] {module}: {in_count} -> {out_count}")
+        else:
+            print(f"[FAIL] {module}: plan differs from the golden model")
+            failures += 1
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
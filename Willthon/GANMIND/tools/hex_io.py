@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Bulk readers/writers for $readmemh-style hex files (weights, .mem frames, goldens).
+
+Every data file in this repo is one 16-bit two's-complement value per line,
+written as lowercase hex. Decoding those with ``int(line, 16)`` per line is
+what dominated load time in the tools, so this module converts a whole file
+with a handful of numpy operations:
+
+* ``decode_hex`` drops ``//`` comments and blank lines, then turns the ASCII
+  digits into values through a byte lookup table. Values keep their low 16 bits
+  and are reinterpreted as signed, exactly like ``to_signed16(int(line, 16))``.
+* ``encode_hex`` does the reverse, producing ``f"{v & 0xFFFF:04x}\\n"`` per
+  value in one buffer so the file is written with a single call.
+
+Both take ``width`` (hex digits per value, 2/4/8) for the 8- and 32-bit
+formats in tools/qformat.py; the default is the repo's 16-bit layout.
+
+Multi-frame containers (ingest_images --mode q88, mem_image_tools join) name
+each frame with a ``// Image: <name>`` comment line right before its values;
+$readmemh and ``decode_hex`` skip it, ``image_names`` reads it back and
+``encode_image_frame`` writes it.
+"""
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+
+HEX_WIDTH = 4
+_COMMENT_RE = re.compile(rb"//[^\n]*")
+IMAGE_HEADER = "// Image:"
+_IMAGE_RE = re.compile(rb"^[ \t]*//[ \t]*Image:[ \t]*([^\r\n]*?)[ \t\r]*$", re.M)
+
+_DIGIT_LUT = np.full(256, 0xFF, dtype=np.uint8)
+for _idx, _char in enumerate(b"0123456789abcdef"):
+    _DIGIT_LUT[_char] = _idx
+for _idx, _char in enumerate(b"ABCDEF"):
+    _DIGIT_LUT[_char] = 10 + _idx
+_HEX_CHARS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+_UINT_FOR_WIDTH = {2: np.uint8, 4: np.uint16, 8: np.uint32}
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def _fixed_width_digits(data: bytes, width: int) -> np.ndarray | None:
+    """Return an (N, width) digit view when `data` is strictly `width` chars + LF per line."""
+    stride = width + 1
+    if not data or len(data) % stride:
+        return None
+    rows = np.frombuffer(data, dtype=np.uint8).reshape(-1, stride)
+    if not np.all(rows[:, width] == ord("\n")):
+        return None
+    return rows[:, :width]
+
+
+def _digits_to_values(digits: np.ndarray, tokens: list | None = None, width: int = HEX_WIDTH) -> np.ndarray:
+    nibbles = _DIGIT_LUT[digits]
+    bad = np.flatnonzero((nibbles == 0xFF).any(axis=1))
+    if bad.size:
+        idx = int(bad[0])
+        token = tokens[idx].decode() if tokens is not None else bytes(digits[idx]).decode()
+        raise ValueError(f"Entry {idx + 1}: '{token}' is not hex")
+    # Only the low `width` digits matter (four for a 16-bit value).
+    dtype = _UINT_FOR_WIDTH[width]
+    nibbles = nibbles[:, -width:].astype(dtype)
+    values = np.zeros(nibbles.shape[0], dtype=dtype)
+    for col in range(nibbles.shape[1]):
+        values = (values << 4) | nibbles[:, col]
+    return values
+
+
+def decode_hex(data: BytesLike, signed: bool = True, width: int = HEX_WIDTH) -> np.ndarray:
+    """Decode hex text into int16 (or uint16 when signed is False); int8/int32 for width 2/8."""
+    data = bytes(data)
+    digits = _fixed_width_digits(data, width)
+    if digits is not None:
+        values = _digits_to_values(digits, width=width)
+    else:
+        if b"//" in data:
+            data = _COMMENT_RE.sub(b"", data)
+        tokens = data.split()
+        if not tokens:
+            values = np.zeros(0, dtype=_UINT_FOR_WIDTH[width])
+        else:
+            pad = max(width, max(len(tok) for tok in tokens))
+            padded = b"".join(tok.rjust(pad, b"0") for tok in tokens)
+            digits = np.frombuffer(padded, dtype=np.uint8).reshape(len(tokens), pad)
+            values = _digits_to_values(digits, tokens, width)
+    if not signed:
+        return values
+    return values.view(np.dtype(values.dtype.name[1:]))
+
+
+def read_hex(path: Path, signed: bool = True, width: int = HEX_WIDTH) -> np.ndarray:
+    return decode_hex(Path(path).read_bytes(), signed, width)
+
+
+def encode_hex(values, width: int = HEX_WIDTH) -> bytes:
+    """Encode values as `width`-digit lowercase hex, one per line, wrapping to 4*width bits."""
+    raw = np.asarray(values).astype(np.int64, copy=False).reshape(-1) & ((1 << (4 * width)) - 1)
+    out = np.empty((raw.size, width + 1), dtype=np.uint8)
+    for col in range(width):
+        shift = 4 * (width - 1 - col)
+        out[:, col] = _HEX_CHARS[(raw >> shift) & 0xF]
+    out[:, width] = ord("\n")
+    return out.tobytes()
+
+
+def write_hex(path: Path, values, width: int = HEX_WIDTH) -> None:
+    Path(path).write_bytes(encode_hex(values, width))
+
+
+def image_names(data: BytesLike, frame_words: int, count: int) -> List[Optional[str]]:
+    """Name of each of `count` frames from ``// Image:`` headers (None where absent).
+
+    A header names the frame whose first value follows it; one that does not
+    sit on a frame boundary is an error.
+    """
+    data = bytes(data)
+    names: List[Optional[str]] = [None] * count
+    if b"Image:" not in data:
+        return names
+    words = pos = 0
+    for match in _IMAGE_RE.finditer(data):
+        words += len(_COMMENT_RE.sub(b"", data[pos:match.start()]).split())
+        pos = match.end()
+        frame, offset = divmod(words, frame_words)
+        if offset or frame >= count:
+            raise ValueError(f"'{match.group(0).decode().strip()}' is not at the start of a frame")
+        names[frame] = match.group(1).decode()
+    return names
+
+
+def encode_image_frame(name: str, values, width: int = HEX_WIDTH) -> bytes:
+    """One frame as a ``// Image: <name>`` header followed by its hex values."""
+    return f"{IMAGE_HEADER} {name}\n".encode() + encode_hex(values, width)
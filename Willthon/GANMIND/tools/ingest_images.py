@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Convert a folder of images into 28x28 frames, streaming and resumable.
+
+This replaces the serial converter cell in Interface.ipynb. Images are decoded
+by a pool of worker processes (JPEGs use Pillow's draft mode, so the decoder
+only produces roughly the target size), converted to grayscale and resized to
+28x28. The main process then writes them in batches to a single output file in
+one of two formats:
+
+* ``binary`` (default): the notebook format. Each frame is a ``# Image: <name>``
+  header, then 28 rows of space-separated 0/1 digits (pixel > threshold), then
+  a blank line.
+* ``q88``: 784 Q8.8 hex values per frame (pixel << 8), each frame preceded by a
+  ``// Image: <name>`` comment, so $readmemh and tools/hex_io.py both accept it.
+
+Only a bounded number of batches is in flight at once, so memory does not grow
+with the dataset. After each batch is written and fsync'd, the content hash,
+name and end offset of every frame in it are appended to ``<output>.journal``.
+A rerun truncates any partially written batch past the last journaled offset
+and skips images whose SHA-256 is already journaled. Duplicate images within a
+run are skipped the same way. An image that cannot be read or decoded is
+reported by path and left out; the rest of its batch and the run carry on.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Deque, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from PIL import Image
+
+from hex_io import encode_image_frame
+from qformat import Q8_8, from_int
+
+WIDTH = 28
+HEIGHT = 28
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+DEFAULT_THRESHOLD = 128  # same cutoff as the notebook
+
+# Hashes already present in the journal, installed in each worker by _init_worker.
+_KNOWN: Set[str] = set()
+
+# (path, sha256, pixels or None if already known, error message or None)
+Decoded = Tuple[str, str, Optional[np.ndarray], Optional[str]]
+
+
+def _init_worker(known: Set[str]) -> None:
+    global _KNOWN
+    _KNOWN = known
+
+
+def decode_image(data: bytes, draft: bool = True) -> np.ndarray:
+    """Decode, grayscale and resize one image to a (28, 28) uint8 array."""
+    img = Image.open(io.BytesIO(data))
+    if draft and img.format == "JPEG":
+        # Let libjpeg downscale by 1/2..1/8 while decoding; never below 28x28.
+        img.draft("L", (WIDTH, HEIGHT))
+    img = img.convert("L").resize((WIDTH, HEIGHT))
+    return np.asarray(img, dtype=np.uint8)
+
+
+def _decode_batch(paths: Sequence[str], draft: bool) -> List[Decoded]:
+    out: List[Decoded] = []
+    for path in paths:
+        digest = ""
+        try:
+            data = Path(path).read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if digest in _KNOWN:
+                out.append((path, digest, None, None))
+                continue
+            out.append((path, digest, decode_image(data, draft), None))
+        except Exception as exc:  # noqa: BLE001 - Pillow plugins raise OSError, ValueError, SyntaxError...
+            out.append((path, digest, None, f"{type(exc).__name__}: {exc}"))
+    return out
+
+
+def encode_binary(name: str, frame: np.ndarray, threshold: int) -> bytes:
+    """One (28, 28) uint8 frame in the notebook text format."""
+    chars = np.full((HEIGHT, 2 * WIDTH), ord(" "), dtype=np.uint8)
+    chars[:, 0::2] = (frame > threshold).astype(np.uint8) + ord("0")
+    chars[:, -1] = ord("\n")
+    return f"# Image: {name}\n".encode() + chars.tobytes() + b"\n"
+
+
+def encode_q88(name: str, frame: np.ndarray) -> bytes:
+    """One frame as 784 Q8.8 hex lines introduced by a // comment."""
+    return encode_image_frame(name, from_int(frame.reshape(-1), Q8_8))
+
+
+def read_journal(journal: Path) -> Tuple[Set[str], int]:
+    """Return (journaled hashes, committed byte length of the output).
+
+    A torn final line left by a crash is dropped and the journal rewritten
+    without it, so later appends start on a clean line.
+    """
+    known: Set[str] = set()
+    committed = 0
+    if not journal.exists():
+        return known, committed
+    text = journal.read_text()
+    valid: List[str] = []
+    for line in text.splitlines(keepends=True):
+        parts = line.split(" ", 2)
+        if not line.endswith("\n") or len(parts) != 3:
+            break
+        known.add(parts[0])
+        committed = int(parts[1])
+        valid.append(line)
+    if len(valid) != len(text.splitlines()):
+        journal.write_text("".join(valid))
+    return known, committed
+
+
+def list_images(image_dir: Path) -> List[str]:
+    return sorted(
+        entry.path for entry in os.scandir(image_dir)
+        if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTS)
+    )
+
+
+def _batches(items: Sequence[str], size: int) -> Iterator[List[str]]:
+    for start in range(0, len(items), size):
+        yield list(items[start : start + size])
+
+
+def ingest(
+    image_dir: Path,
+    output: Path,
+    mode: str = "binary",
+    threshold: int = DEFAULT_THRESHOLD,
+    workers: int = 0,
+    batch: int = 256,
+    draft: bool = True,
+) -> Tuple[int, int, int]:
+    """Convert every image in `image_dir` into `output`; returns (written, skipped, failed)."""
+    image_dir, output = Path(image_dir), Path(output)
+    journal = output.with_name(output.name + ".journal")
+    known, committed = read_journal(journal)
+    if not output.exists():
+        known, committed = set(), 0
+        journal.unlink(missing_ok=True)
+    elif output.stat().st_size < committed:
+        raise SystemExit(f"{output} is shorter than its journal records; delete both to restart")
+
+    workers = workers or os.cpu_count() or 1
+    paths = list_images(image_dir)
+    written = skipped = failed = 0
+
+    with output.open("ab") as out, journal.open("a") as jnl:
+        out.truncate(committed)  # discard a batch that was cut off mid-write
+        out.seek(committed)
+        offset = committed
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(known,)) as pool:
+            pending: Deque[Future] = deque()
+            source = _batches(paths, batch)
+            for chunk in source:
+                pending.append(pool.submit(_decode_batch, chunk, draft))
+                if len(pending) >= 2 * workers:
+                    break
+            while pending:
+                results = pending.popleft().result()
+                nxt = next(source, None)
+                if nxt is not None:
+                    pending.append(pool.submit(_decode_batch, nxt, draft))
+
+                names: List[str] = []
+                digests: List[str] = []
+                frames: List[np.ndarray] = []
+                for path, digest, pixels, error in results:
+                    if error is not None:
+                        print(f"[SKIP] {path}: {error}")
+                        failed += 1
+                        continue
+                    if pixels is None or digest in known:
+                        skipped += 1
+                        continue
+                    known.add(digest)
+                    names.append(Path(path).name)
+                    digests.append(digest)
+                    frames.append(pixels)
+                if not frames:
+                    continue
+
+                if mode == "binary":
+                    blocks = [encode_binary(n, f, threshold) for n, f in zip(names, frames)]
+                else:
+                    blocks = [encode_q88(n, f) for n, f in zip(names, frames)]
+                out.write(b"".join(blocks))
+                out.flush()
+                os.fsync(out.fileno())
+                for name, digest, block in zip(names, digests, blocks):
+                    offset += len(block)
+                    jnl.write(f"{digest} {offset} {name}\n")
+                jnl.flush()
+                os.fsync(jnl.fileno())
+                written += len(frames)
+    return written, skipped, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream a folder of images into 28x28 frame files")
+    parser.add_argument("image_dir", type=Path)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--mode", choices=("binary", "q88"), default="binary",
+                        help="binary: notebook 0/1 rows; q88: Q8.8 hex per pixel")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD,
+                        help="Brightness cutoff for --mode binary (pixel > threshold is 1)")
+    parser.add_argument("--workers", type=int, default=0, help="Decoder processes (default: all cores)")
+    parser.add_argument("--batch", type=int, default=256, help="Images per worker task / write")
+    parser.add_argument("--exact", action="store_true",
+                        help="Disable JPEG draft decoding (full-size decode before resize)")
+    args = parser.parse_args()
+    if args.batch <= 0:
+        raise SystemExit("--batch must be positive")
+
+    written, skipped, failed = ingest(args.image_dir, args.output, args.mode, args.threshold,
+                                      args.workers, args.batch, not args.exact)
+    print(f"Wrote {written} frames to {args.output} ({skipped} already converted, {failed} unreadable)")
+
+
+if __name__ == "__main__":
+    main()
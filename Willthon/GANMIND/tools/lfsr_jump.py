@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Jump-ahead and multi-stream generation for the seed_lfsr_bank LFSR.
+
+src/generator/seed_lfsr_bank.v shifts a 16-bit Fibonacci LFSR left by one bit
+per cycle with feedback lfsr[15] ^ lfsr[13] ^ lfsr[12] ^ lfsr[10] and latches
+SEED_COUNT consecutive states as one latent vector. One step is linear over
+GF(2), so it is a 16x16 bit matrix M, and the state after n steps is M^n
+applied to the seed. This module keeps M^(2^k) for every k, so any offset is
+reached with at most 64 matrix applications instead of n shifts, and applies
+the matrices to whole numpy arrays of states at once.
+
+Matrices are stored as 16 column masks: column b is the image of the state
+with only bit b set, so applying a matrix is an XOR of the columns selected by
+the state's set bits. The taps give a maximal-length sequence (period 65535,
+checked by ``check``); offsets may still be arbitrarily large.
+"""
+from __future__ import annotations
+
+import argparse
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from hex_io import write_hex
+
+WIDTH = 16
+TAPS = (15, 13, 12, 10)
+RESET_SEED = 0xACE1  # value seed_lfsr_bank loads on rst and on every start
+SEED_COUNT = 64      # seed_lfsr_bank default: states per latent vector
+MAX_JUMP_BITS = 64
+
+Matrix = Tuple[int, ...]  # WIDTH column masks
+
+
+def lfsr_step(state: int) -> int:
+    feedback = 0
+    for tap in TAPS:
+        feedback ^= state >> tap
+    return ((state << 1) & 0xFFFF) | (feedback & 1)
+
+
+def _apply(matrix: Matrix, state: int) -> int:
+    out = 0
+    for bit in range(WIDTH):
+        if state >> bit & 1:
+            out ^= matrix[bit]
+    return out
+
+
+def _compose(outer: Matrix, inner: Matrix) -> Matrix:
+    """Matrix for applying `inner` then `outer`."""
+    return tuple(_apply(outer, column) for column in inner)
+
+
+STEP_MATRIX: Matrix = tuple(lfsr_step(1 << bit) for bit in range(WIDTH))
+IDENTITY: Matrix = tuple(1 << bit for bit in range(WIDTH))
+
+
+def _power_table() -> List[Matrix]:
+    table = [STEP_MATRIX]
+    for _ in range(MAX_JUMP_BITS - 1):
+        table.append(_compose(table[-1], table[-1]))
+    return table
+
+
+# JUMP_TABLE[k] advances the LFSR by 2**k steps.
+JUMP_TABLE: List[Matrix] = _power_table()
+
+
+def jump_matrix(steps: int) -> Matrix:
+    """M**steps by square-and-multiply over the cached powers."""
+    if steps < 0:
+        raise ValueError("LFSR cannot step backwards")
+    if steps >> MAX_JUMP_BITS:
+        raise ValueError(f"Offset must be below 2**{MAX_JUMP_BITS}")
+    matrix = IDENTITY
+    bit = 0
+    while steps:
+        if steps & 1:
+            matrix = _compose(JUMP_TABLE[bit], matrix)
+        steps >>= 1
+        bit += 1
+    return matrix
+
+
+def lfsr_state(offset: int, seed: int = RESET_SEED) -> int:
+    """State after `offset` shifts from `seed`, in O(log offset)."""
+    return _apply(jump_matrix(offset), seed & 0xFFFF)
+
+
+def _apply_array(matrix: Matrix, states: np.ndarray) -> np.ndarray:
+    out = np.zeros_like(states)
+    for bit in range(WIDTH):
+        out ^= ((states >> bit) & 1) * np.uint16(matrix[bit])
+    return out
+
+
+def jump_states(states: np.ndarray, offsets) -> np.ndarray:
+    """Advance each uint16 state by its own offset (offsets broadcast)."""
+    states = np.asarray(states, dtype=np.uint16)
+    offsets = np.broadcast_to(np.asarray(offsets, dtype=np.uint64), states.shape)
+    states = states.copy()
+    bit = 0
+    remaining = offsets.copy()
+    while remaining.any():
+        mask = (remaining & np.uint64(1)).astype(bool)
+        if mask.any():
+            states[mask] = _apply_array(JUMP_TABLE[bit], states[mask])
+        remaining >>= np.uint64(1)
+        bit += 1
+    return states
+
+
+def step_states(states: np.ndarray, count: int) -> np.ndarray:
+    """Run every state in `states` for `count` steps; returns (..., count) uint16.
+
+    Column j holds each stream's state after j shifts, i.e. the value the bank
+    latches into seed slot j.
+    """
+    state = np.asarray(states, dtype=np.uint16).copy()
+    out = np.empty(state.shape + (count,), dtype=np.uint16)
+    for idx in range(count):
+        out[..., idx] = state
+        feedback = np.zeros_like(state)
+        for tap in TAPS:
+            feedback ^= state >> tap
+        state = (state << 1) | (feedback & 1)
+    return out
+
+
+def seed_vectors(indices: Sequence[int], seed: int = RESET_SEED, width: int = SEED_COUNT) -> np.ndarray:
+    """Latent vectors `indices` of one continuous stream, as (len(indices), width) int16.
+
+    Vector i is the `width` states starting `i * width` shifts after `seed`,
+    so index 0 is what seed_lfsr_bank latches after a start pulse and the rows
+    match consecutive rows of compute_gan_serial_golden.lfsr_seed_matrix.
+    """
+    idx = np.asarray(indices, dtype=np.uint64)
+    starts = jump_states(np.full(idx.shape, seed & 0xFFFF, dtype=np.uint16), idx * np.uint64(width))
+    return step_states(starts, width).view(np.int16)
+
+
+def stream_bank(streams: int, count: int, stride: int, seed: int = RESET_SEED) -> np.ndarray:
+    """`streams` parallel streams spaced `stride` shifts apart, each `count` long.
+
+    Returns (streams, count) int16; stream s starts at offset s * stride, so with
+    stride >= count the streams never overlap within one period.
+    """
+    offsets = np.arange(streams, dtype=np.uint64) * np.uint64(stride)
+    starts = jump_states(np.full(streams, seed & 0xFFFF, dtype=np.uint16), offsets)
+    return step_states(starts, count).view(np.int16)
+
+
+def _self_check(samples: int = 2000) -> None:
+    state = RESET_SEED
+    expected = []
+    for _ in range(samples):
+        expected.append(state)
+        state = lfsr_step(state)
+    for offset in (0, 1, 15, 16, 17, 255, samples - 1):
+        if lfsr_state(offset) != expected[offset]:
+            raise SystemExit(f"Jump to {offset} disagrees with stepping")
+    got = jump_states(np.full(samples, RESET_SEED, dtype=np.uint16), np.arange(samples))
+    if got.tolist() != expected:
+        raise SystemExit("Vectorized jump disagrees with stepping")
+    # Maximal length: M**65535 = I and no M**(65535 / p) = I for p | 65535.
+    period = 0xFFFF
+    if jump_matrix(period) != IDENTITY or any(jump_matrix(period // p) == IDENTITY for p in (3, 5, 17, 257)):
+        raise SystemExit("LFSR is not maximal length")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Jump-ahead seed generation for seed_lfsr_bank")
+    parser.add_argument("--seed", type=lambda v: int(v, 0), default=RESET_SEED)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    state = sub.add_parser("state", help="LFSR state after N shifts")
+    state.add_argument("offset", type=lambda v: int(v, 0))
+
+    vector = sub.add_parser("vector", help="Latent vector #N of a continuous stream, as hex")
+    vector.add_argument("index", type=lambda v: int(v, 0))
+    vector.add_argument("--width", type=int, default=SEED_COUNT)
+    vector.add_argument("--out", default=None, help="Write the vector to a $readmemh file")
+
+    sub.add_parser("check", help="Verify jump-ahead against bit-by-bit stepping")
+
+    args = parser.parse_args()
+
+    if args.cmd == "state":
+        print(f"{lfsr_state(args.offset, args.seed):04x}")
+    elif args.cmd == "vector":
+        values = seed_vectors([args.index], args.seed, args.width)[0]
+        if args.out:
+            write_hex(args.out, values)
+            print(f"Wrote seed vector {args.index} to {args.out}")
+        else:
+            print(" ".join(f"{v & 0xFFFF:04x}" for v in values.tolist()))
+    elif args.cmd == "check":
+        _self_check()
+        print("Jump-ahead matches bit-by-bit stepping")
+
+
+if __name__ == "__main__":
+    main()
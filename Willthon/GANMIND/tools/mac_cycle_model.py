@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""Cycle-accurate software model of src/layers/pipelined_mac.v.
+
+Each call to ``PipelinedMacModel.step`` is one rising clock edge with ``rst``
+low. The inputs are the values driven on ``start``/``a_flat``/``b_flat``/``bias``
+just before the edge, and the return value is ``(result, done)`` as the
+registers hold them just after the edge. The model mirrors the RTL register for
+register:
+
+    edge k    : start sampled -> ra/rb captured, d0
+    edge k+1  : p = ra * rb                    , d1
+    edge k+2..k+5 : adder tree s1..s4          , d2..d5
+    edge k+6  : total_sum = s4[0] + s4[1] + (bias <<< 8)   (bias sampled here), d6
+    edge k+7  : result = total_sum[23:8], done = 1
+
+so ``done`` rises LATENCY = 7 edges after the edge that sampled ``start``. The
+datapath stages only load when their valid bit is set, exactly like the
+``if (dN)`` guards in the RTL, so back-to-back issue sustains one result per
+cycle. ``run`` drives a whole stream and gathers throughput statistics.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+LANES = 32
+DATA_WIDTH = 16
+Q_FRAC = 8
+LATENCY = 7
+VALID_STAGES = 7  # d0..d6
+
+Operand = Union[int, Sequence[int]]
+
+
+def wrap32(value: int) -> int:
+    value &= 0xFFFFFFFF
+    if value & 0x80000000:
+        value -= 0x1_0000_0000
+    return value
+
+
+def to_signed16(value: int) -> int:
+    value &= 0xFFFF
+    if value & 0x8000:
+        value -= 0x10000
+    return value
+
+
+def unpack_lanes(flat: Operand) -> List[int]:
+    """Split a 512-bit bus (lane 0 in bits [15:0]) or a lane list into signed lanes."""
+    if isinstance(flat, int):
+        return [to_signed16(flat >> (DATA_WIDTH * lane)) for lane in range(LANES)]
+    lanes = [to_signed16(v) for v in flat]
+    if len(lanes) != LANES:
+        raise ValueError(f"Expected {LANES} lanes, got {len(lanes)}")
+    return lanes
+
+
+def pack_lanes(lanes: Sequence[int]) -> int:
+    flat = 0
+    for lane, value in enumerate(lanes):
+        flat |= (value & 0xFFFF) << (DATA_WIDTH * lane)
+    return flat
+
+
+def _tree_level(values: Sequence[int]) -> List[int]:
+    return [wrap32(values[i] + values[i + 1]) for i in range(0, len(values), 2)]
+
+
+class MacInput(NamedTuple):
+    """Signals driven during one cycle; `a`/`b` are ignored when start is low."""
+
+    start: bool = False
+    a: Operand = 0
+    b: Operand = 0
+    bias: int = 0
+
+
+class MacStats(NamedTuple):
+    cycles: int
+    issued: int
+    completed: int
+    first_latency: Optional[int]
+    occupancy: float
+    bubbles: int
+    macs_per_cycle: float
+    effective_macs_per_cycle: float
+
+
+class PipelinedMacModel:
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Equivalent of asserting rst; the data registers the RTL leaves alone read as 0."""
+        self.ra = [0] * LANES
+        self.rb = [0] * LANES
+        self.p = [0] * LANES
+        self.s1 = [0] * 16
+        self.s2 = [0] * 8
+        self.s3 = [0] * 4
+        self.s4 = [0] * 2
+        self.total_sum = 0
+        self.valid = [False] * VALID_STAGES
+        self.result = 0
+        self.done = False
+
+    def step(self, start: bool = False, a: Operand = 0, b: Operand = 0, bias: int = 0) -> Tuple[int, bool]:
+        d0, d1, d2, d3, d4, d5, d6 = self.valid
+        # Right-hand sides below all read pre-edge values (non-blocking semantics),
+        # so stages are updated from the output end backwards.
+        if d6:
+            self.result = to_signed16(self.total_sum >> Q_FRAC)
+        self.done = d6
+        if d5:
+            self.total_sum = wrap32(self.s4[0] + self.s4[1] + (to_signed16(bias) << Q_FRAC))
+        if d4:
+            self.s4 = _tree_level(self.s3)
+        if d3:
+            self.s3 = _tree_level(self.s2)
+        if d2:
+            self.s2 = _tree_level(self.s1)
+        if d1:
+            self.s1 = _tree_level(self.p)
+        if d0:
+            self.p = [wrap32(x * y) for x, y in zip(self.ra, self.rb)]
+        if start:
+            self.ra = unpack_lanes(a)
+            self.rb = unpack_lanes(b)
+        self.valid = [bool(start), d0, d1, d2, d3, d4, d5]
+        return self.result, self.done
+
+    def run(self, stream: Iterable[Optional[MacInput]], drain: bool = True) -> Tuple[List[Tuple[int, bool]], MacStats]:
+        """Clock every entry of `stream` and collect statistics.
+
+        None is an idle cycle: start low with the previous bias still driven, since
+        the RTL samples `bias` six edges after `start`. With drain, idle cycles
+        are appended until the pipeline is empty. Cycle numbers in the trace are
+        0-based edge indices. `bubbles` counts cycles without `done` between the
+        first and the last result. `macs_per_cycle` is LANES * results over that
+        output window (steady state); `effective_macs_per_cycle` also charges the
+        pipeline fill from the first issue edge.
+        """
+        trace: List[Tuple[int, bool]] = []
+        issue_cycles: List[int] = []
+        done_cycles: List[int] = []
+        occupied = 0
+        held_bias = 0
+
+        def clock(sig: Optional[MacInput]) -> None:
+            nonlocal held_bias, occupied
+            sig = sig or MacInput(bias=held_bias)
+            held_bias = sig.bias
+            cycle = len(trace)
+            if sig.start:
+                issue_cycles.append(cycle)
+            result, done = self.step(sig.start, sig.a, sig.b, sig.bias)
+            occupied += sum(self.valid)
+            trace.append((result, done))
+            if done:
+                done_cycles.append(cycle)
+
+        for sig in stream:
+            clock(sig)
+        if drain:
+            while any(self.valid):
+                clock(None)
+
+        cycles = len(trace)
+        first_latency = done_cycles[0] - issue_cycles[0] if issue_cycles and done_cycles else None
+        bubbles = 0
+        steady_rate = 0.0
+        effective_rate = 0.0
+        if done_cycles:
+            window = done_cycles[-1] - done_cycles[0] + 1
+            bubbles = window - len(done_cycles)
+            steady_rate = LANES * len(done_cycles) / window
+            effective_rate = LANES * len(done_cycles) / (done_cycles[-1] - issue_cycles[0] + 1)
+        stats = MacStats(
+            cycles=cycles,
+            issued=len(issue_cycles),
+            completed=len(done_cycles),
+            first_latency=first_latency,
+            occupancy=occupied / (VALID_STAGES * cycles) if cycles else 0.0,
+            bubbles=bubbles,
+            macs_per_cycle=steady_rate,
+            effective_macs_per_cycle=effective_rate,
+        )
+        return trace, stats
+
+
+def reference_dot(a: Operand, b: Operand, bias: int) -> int:
+    """Value the RTL produces for one issue, computed without the pipeline."""
+    acc = sum(x * y for x, y in zip(unpack_lanes(a), unpack_lanes(b)))
+    acc = wrap32(acc + (to_signed16(bias) << Q_FRAC))
+    return to_signed16(acc >> Q_FRAC)
+
+
+def interval_stream(count: int, interval: int, bias: int, rng: random.Random) -> List[Optional[MacInput]]:
+    """`count` issues spaced `interval` cycles apart with random operands."""
+    stream: List[Optional[MacInput]] = []
+    for idx in range(count):
+        a = [rng.randint(-32768, 32767) for _ in range(LANES)]
+        b = [rng.randint(-32768, 32767) for _ in range(LANES)]
+        stream.append(MacInput(True, a, b, bias))
+        if idx != count - 1:
+            stream.extend([None] * (interval - 1))
+    return stream
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cycle model of pipelined_mac")
+    parser.add_argument("--count", type=int, default=64, help="Number of MAC issues")
+    parser.add_argument("--interval", type=int, default=1, help="Cycles between issues (1 = back-to-back)")
+    parser.add_argument("--bias", type=lambda v: int(v, 0), default=0, help="Bias held on the port")
+    parser.add_argument("--seed", type=int, default=1, help="RNG seed for operands")
+    args = parser.parse_args()
+    if args.count <= 0 or args.interval <= 0:
+        raise SystemExit("--count and --interval must be positive")
+
+    stream = interval_stream(args.count, args.interval, args.bias, random.Random(args.seed))
+    model = PipelinedMacModel()
+    trace, stats = model.run(stream)
+
+    # The bias port is held constant here, so every result must match the
+    # straight dot product of its own operands.
+    expected = [reference_dot(sig.a, sig.b, sig.bias) for sig in stream if sig is not None]
+    produced = [result for result, done in trace if done]
+    if produced != expected:
+        raise SystemExit("Model results do not match the reference dot product")
+
+    print(f"cycles          : {stats.cycles}")
+    print(f"issued/completed: {stats.issued}/{stats.completed}")
+    print(f"latency         : {stats.first_latency} cycles")
+    print(f"occupancy       : {stats.occupancy:.1%}")
+    print(f"output bubbles  : {stats.bubbles}")
+    print(f"sustained rate  : {stats.macs_per_cycle:.2f} MACs/cycle")
+    print(f"incl. pipe fill : {stats.effective_macs_per_cycle:.2f} MACs/cycle")
+
+
+if __name__ == "__main__":
+    main()
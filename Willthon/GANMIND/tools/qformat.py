@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""Vectorized signed fixed-point (Q m.n) arrays shared by the tools.
+
+The RTL carries Q8.8 words, accumulates in a 32-bit Q16.16 MAC, and some
+blocks use Q4.4 bytes. The same conversions used to be rewritten per script
+as scalar helpers (``to_signed16``, ``float_to_q8_8``, ``float_to_hex_q88``,
+clamp-and-shift). This module does them once, over whole ndarrays:
+
+* ``QFormat`` describes a format (``Q8_8.width == 16``, ``Q8_8.one == 256``);
+* ``from_float`` / ``to_float`` / ``from_int`` / ``to_int`` / ``requantize``
+  convert with an explicit rounding mode (``floor`` like ``>>>``, ``trunc``
+  like ``int()``, ``nearest_even`` like ``round()``/``np.rint``, ``half_up``)
+  and overflow mode (``wrap`` like the RTL registers, ``saturate``);
+* ``add`` / ``sub`` / ``mul`` are element-wise with the same modes;
+* ``encode_hex`` / ``decode_hex`` / ``read_hex`` / ``write_hex`` use
+  hex_io with 2, 4 or 8 digits per value;
+* ``QArray`` bundles raw words with their format for operator-style code.
+
+Raw words are numpy integers of the format's width (int8/int16/int32).
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, NamedTuple, Union
+
+import numpy as np
+
+import hex_io
+
+ROUNDING = ("floor", "trunc", "nearest_even", "half_up")
+OVERFLOW = ("wrap", "saturate")
+_INT_DTYPES = {8: np.int8, 16: np.int16, 32: np.int32}
+
+
+class QFormat(NamedTuple):
+    int_bits: int   # including the sign bit
+    frac_bits: int
+
+    @property
+    def name(self) -> str:
+        return f"Q{self.int_bits}.{self.frac_bits}"
+
+    @property
+    def width(self) -> int:
+        return self.int_bits + self.frac_bits
+
+    @property
+    def one(self) -> int:
+        return 1 << self.frac_bits
+
+    @property
+    def min_raw(self) -> int:
+        return -(1 << (self.width - 1))
+
+    @property
+    def max_raw(self) -> int:
+        return (1 << (self.width - 1)) - 1
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(_INT_DTYPES[self.width])
+
+    @property
+    def hex_digits(self) -> int:
+        return self.width // 4
+
+
+Q4_4 = QFormat(4, 4)
+Q8_8 = QFormat(8, 8)
+Q16_16 = QFormat(16, 16)
+FORMATS: Dict[str, QFormat] = {fmt.name: fmt for fmt in (Q4_4, Q8_8, Q16_16)}
+
+
+def parse_format(name: str) -> QFormat:
+    try:
+        return FORMATS[name.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown format {name!r}; known: {', '.join(FORMATS)}") from None
+
+
+def _check(rounding: str | None = None, overflow: str | None = None) -> None:
+    if rounding is not None and rounding not in ROUNDING:
+        raise ValueError(f"rounding must be one of {ROUNDING}, not {rounding!r}")
+    if overflow is not None and overflow not in OVERFLOW:
+        raise ValueError(f"overflow must be one of {OVERFLOW}, not {overflow!r}")
+
+
+# ---------------------------------------------------------------------------
+# Integer plumbing
+# ---------------------------------------------------------------------------
+
+def wrap(values, width: int) -> np.ndarray:
+    """Two's-complement wrap to `width` bits (8, 16 or 32), as a register does."""
+    return np.asarray(values).astype(np.int64, copy=False).astype(_INT_DTYPES[width])
+
+
+def fit(values, fmt: QFormat, overflow: str = "wrap") -> np.ndarray:
+    """Integers already scaled to `fmt`, narrowed by wrapping or saturating."""
+    _check(overflow=overflow)
+    values = np.asarray(values).astype(np.int64, copy=False)
+    if overflow == "saturate":
+        values = np.clip(values, fmt.min_raw, fmt.max_raw)
+    return values.astype(fmt.dtype)
+
+
+def shift_right(values, shift: int, rounding: str = "floor") -> np.ndarray:
+    """Arithmetic right shift of int64 values with the given rounding."""
+    _check(rounding=rounding)
+    values = np.asarray(values).astype(np.int64, copy=False)
+    if shift <= 0:
+        return values << -shift
+    if rounding == "floor":
+        return values >> shift
+    if rounding == "half_up":
+        return (values + (1 << (shift - 1))) >> shift
+    if rounding == "trunc":
+        return np.where(values < 0, -((-values) >> shift), values >> shift)
+    floor = values >> shift
+    rem = values - (floor << shift)
+    half = 1 << (shift - 1)
+    return floor + ((rem > half) | ((rem == half) & (floor & 1).astype(bool)))
+
+
+def _round(scaled: np.ndarray, rounding: str) -> np.ndarray:
+    if rounding == "floor":
+        return np.floor(scaled)
+    if rounding == "trunc":
+        return np.trunc(scaled)
+    if rounding == "half_up":
+        return np.floor(scaled + 0.5)
+    return np.rint(scaled)
+
+
+# ---------------------------------------------------------------------------
+# Conversions
+# ---------------------------------------------------------------------------
+
+def from_float(values, fmt: QFormat = Q8_8, rounding: str = "nearest_even",
+               overflow: str = "saturate") -> np.ndarray:
+    """Real values -> raw words of `fmt`."""
+    _check(rounding, overflow)
+    scaled = _round(np.asarray(values, dtype=np.float64) * fmt.one, rounding)
+    if overflow == "saturate":
+        return np.clip(scaled, fmt.min_raw, fmt.max_raw).astype(fmt.dtype)
+    return wrap(scaled.astype(np.int64), fmt.width)
+
+
+def to_float(raw, fmt: QFormat = Q8_8) -> np.ndarray:
+    return np.asarray(raw).astype(np.float64) / fmt.one
+
+
+def from_int(values, fmt: QFormat = Q8_8, overflow: str = "wrap") -> np.ndarray:
+    """Integers -> raw words (``value << frac_bits``)."""
+    return fit(np.asarray(values).astype(np.int64, copy=False) << fmt.frac_bits, fmt, overflow)
+
+
+def to_int(raw, fmt: QFormat = Q8_8, rounding: str = "floor") -> np.ndarray:
+    """Raw words -> integer part (int64), rounded as requested."""
+    return shift_right(raw, fmt.frac_bits, rounding)
+
+
+def requantize(raw, src: QFormat, dst: QFormat, rounding: str = "floor",
+               overflow: str = "wrap") -> np.ndarray:
+    """Move raw words between formats (e.g. the Q16.16 accumulator slice to Q8.8)."""
+    return fit(shift_right(raw, src.frac_bits - dst.frac_bits, rounding), dst, overflow)
+
+
+# ---------------------------------------------------------------------------
+# Arithmetic on raw words of one format
+# ---------------------------------------------------------------------------
+
+def add(a, b, fmt: QFormat = Q8_8, overflow: str = "wrap") -> np.ndarray:
+    return fit(np.asarray(a).astype(np.int64) + np.asarray(b).astype(np.int64), fmt, overflow)
+
+
+def sub(a, b, fmt: QFormat = Q8_8, overflow: str = "wrap") -> np.ndarray:
+    return fit(np.asarray(a).astype(np.int64) - np.asarray(b).astype(np.int64), fmt, overflow)
+
+
+def mul(a, b, fmt: QFormat = Q8_8, rounding: str = "floor", overflow: str = "wrap") -> np.ndarray:
+    """Full-precision product, rescaled from 2*frac_bits back to `fmt`."""
+    prod = np.asarray(a).astype(np.int64) * np.asarray(b).astype(np.int64)
+    return fit(shift_right(prod, fmt.frac_bits, rounding), fmt, overflow)
+
+
+# ---------------------------------------------------------------------------
+# Hex I/O
+# ---------------------------------------------------------------------------
+
+def encode_hex(raw, fmt: QFormat = Q8_8) -> bytes:
+    return hex_io.encode_hex(raw, fmt.hex_digits)
+
+
+def decode_hex(data: bytes, fmt: QFormat = Q8_8) -> np.ndarray:
+    return hex_io.decode_hex(data, True, fmt.hex_digits)
+
+
+def read_hex(path: Path, fmt: QFormat = Q8_8) -> np.ndarray:
+    return hex_io.read_hex(path, True, fmt.hex_digits)
+
+
+def write_hex(path: Path, raw, fmt: QFormat = Q8_8) -> None:
+    hex_io.write_hex(path, raw, fmt.hex_digits)
+
+
+# ---------------------------------------------------------------------------
+# Array type
+# ---------------------------------------------------------------------------
+
+Operand = Union["QArray", np.ndarray, int]
+
+
+class QArray:
+    """Raw fixed-point words plus their format and overflow policy.
+
+    Operators act element-wise on the raw words and keep the format; mixing
+    formats is an error (convert with ``astype`` first).
+    """
+
+    __slots__ = ("raw", "fmt", "overflow")
+
+    def __init__(self, raw, fmt: QFormat = Q8_8, overflow: str = "wrap") -> None:
+        _check(overflow=overflow)
+        self.raw = fit(raw, fmt, overflow)
+        self.fmt = fmt
+        self.overflow = overflow
+
+    @classmethod
+    def from_float(cls, values, fmt: QFormat = Q8_8, rounding: str = "nearest_even",
+                   overflow: str = "saturate") -> "QArray":
+        return cls(from_float(values, fmt, rounding, overflow), fmt, overflow)
+
+    @classmethod
+    def read_hex(cls, path: Path, fmt: QFormat = Q8_8, overflow: str = "wrap") -> "QArray":
+        return cls(read_hex(path, fmt), fmt, overflow)
+
+    def to_float(self) -> np.ndarray:
+        return to_float(self.raw, self.fmt)
+
+    def to_int(self, rounding: str = "floor") -> np.ndarray:
+        return to_int(self.raw, self.fmt, rounding)
+
+    def astype(self, fmt: QFormat, rounding: str = "floor", overflow: str | None = None) -> "QArray":
+        overflow = overflow or self.overflow
+        return QArray(requantize(self.raw, self.fmt, fmt, rounding, overflow), fmt, overflow)
+
+    def write_hex(self, path: Path) -> None:
+        write_hex(path, self.raw, self.fmt)
+
+    def _other(self, other: Operand) -> np.ndarray:
+        if isinstance(other, QArray):
+            if other.fmt != self.fmt:
+                raise ValueError(f"Cannot mix {self.fmt.name} and {other.fmt.name}")
+            return other.raw
+        return np.asarray(other)
+
+    def __add__(self, other: Operand) -> "QArray":
+        return QArray(add(self.raw, self._other(other), self.fmt, self.overflow), self.fmt, self.overflow)
+
+    def __sub__(self, other: Operand) -> "QArray":
+        return QArray(sub(self.raw, self._other(other), self.fmt, self.overflow), self.fmt, self.overflow)
+
+    def __mul__(self, other: Operand) -> "QArray":
+        return QArray(mul(self.raw, self._other(other), self.fmt, "floor", self.overflow), self.fmt, self.overflow)
+
+    def __neg__(self) -> "QArray":
+        return QArray(sub(0, self.raw, self.fmt, self.overflow), self.fmt, self.overflow)
+
+    def __getitem__(self, index) -> "QArray":
+        return QArray(self.raw[index], self.fmt, self.overflow)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, QArray) and other.fmt == self.fmt and np.array_equal(other.raw, self.raw)
+
+    @property
+    def shape(self):
+        return self.raw.shape
+
+    def __repr__(self) -> str:
+        return f"QArray({self.fmt.name}, {self.overflow}, {self.to_float()!r})"
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Score a dataset of 28x28 frames with the fixed-point discriminator.
+
+Every frame goes through the same path as the real-image branch of
+gan_serial_top: frame_sampler (784 -> 256) followed by the three discriminator
+layers, all bit-exact with compute_gan_serial_golden.discriminator_head. The
+dataset is split into shards that a process pool scores in parallel. Weights
+and frames are placed in POSIX shared memory once, and workers attach to them
+by name, so nothing large is pickled per task.
+
+Accepted inputs (a file or a directory of them):
+
+* Q8.8 ``.mem``/``.hex``: 784 hex values per frame, frames back to back,
+  each optionally introduced by a ``// Image: <name>`` comment (as
+  ingest_images.py --mode q88 writes).
+* the notebook's binary ``.mem``: optional ``# Image: <name>`` headers followed
+  by 28 rows of 28 ``0``/``1`` digits (with or without spaces). Bits are
+  scaled to 0 / ONE_Q like the RTL pixel loader does.
+* a bit-packed ``.gfp`` frame pack (see frame_pack.py).
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+import compute_gan_serial_golden as golden
+import frame_pack
+import gather_plan
+from hex_io import decode_hex, image_names
+
+FRAME_SIZE = 28
+FRAME_PIXELS = FRAME_SIZE * FRAME_SIZE
+SAMPLED = 256
+DISC_KEYS = golden.DISC_WEIGHTS
+
+# Worker-side views into the shared blocks, set by _init_worker.
+_WORKER: Dict[str, object] = {}
+
+
+def _is_binary_text(data: bytes) -> bool:
+    """Binary frames have a '#' header or 28-digit rows; hex frames have 4-digit rows."""
+    for line in data[:4096].splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith(b"#"):
+            return True
+        digits = line.replace(b" ", b"")
+        return len(digits) == FRAME_SIZE and not digits.translate(None, b"01")
+    return False
+
+
+def parse_binary_frames(data: bytes, default_name: str) -> Tuple[List[str], np.ndarray]:
+    """Parse the notebook's bit-per-pixel text format into Q8.8 frames."""
+    names, bits = frame_pack.parse_binary_text(data, default_name)
+    return names, bits.astype(np.int16) * golden.ONE_Q
+
+
+def load_frames(path: Path) -> Tuple[List[str], np.ndarray]:
+    """Return (names, (N, 784) int16 frames) for a dataset file or directory."""
+    if path.is_dir():
+        names: List[str] = []
+        chunks: List[np.ndarray] = []
+        for child in sorted(path.iterdir()):
+            if child.suffix.lower() in (".mem", ".hex", frame_pack.PACK_SUFFIX):
+                child_names, frames = load_frames(child)
+                names.extend(child_names)
+                chunks.append(frames)
+        if not chunks:
+            raise ValueError(f"No .mem/.hex/.gfp frames found in {path}")
+        return names, np.concatenate(chunks)
+
+    if path.suffix.lower() == frame_pack.PACK_SUFFIX:
+        with frame_pack.open_pack(path) as frames:
+            return list(frames.names), frames.q88()
+
+    data = path.read_bytes()
+    if _is_binary_text(data):
+        return parse_binary_frames(data, path.name)
+    values = decode_hex(data)
+    if values.size % FRAME_PIXELS:
+        raise ValueError(f"{path}: {values.size} values is not a multiple of {FRAME_PIXELS}")
+    count = values.size // FRAME_PIXELS
+    try:
+        headers = image_names(data, FRAME_PIXELS, count)
+    except ValueError as exc:
+        raise ValueError(f"{path}: {exc}") from exc
+    default = [path.name] if count == 1 else [f"{path.name}[{idx}]" for idx in range(count)]
+    names = [header or fallback for header, fallback in zip(headers, default)]
+    return names, values.reshape(count, FRAME_PIXELS)
+
+
+def sampler_index() -> np.ndarray:
+    """Source pixel of each frame_sampler output (cached gather plan)."""
+    return gather_plan.plan("accumulator", FRAME_PIXELS, SAMPLED)
+
+
+def score_frames(frames: np.ndarray, gold: dict) -> Tuple[np.ndarray, np.ndarray]:
+    sampled = np.asarray(frames)[:, sampler_index()]
+    return golden.discriminator_head_batch(sampled, gold)
+
+
+def _to_shared(arrays: Dict[str, np.ndarray]) -> Tuple[shared_memory.SharedMemory, Dict[str, tuple]]:
+    """Copy `arrays` into one shared block; return it and a picklable layout."""
+    layout: Dict[str, tuple] = {}
+    offset = 0
+    for key, arr in arrays.items():
+        layout[key] = (offset, arr.shape, arr.dtype.str)
+        offset += (arr.nbytes + 63) // 64 * 64
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for key, arr in arrays.items():
+        start, shape, dtype = layout[key]
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)[...] = arr
+    return shm, layout
+
+
+def _views(shm: shared_memory.SharedMemory, layout: Dict[str, tuple]) -> Dict[str, np.ndarray]:
+    return {
+        key: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)
+        for key, (start, shape, dtype) in layout.items()
+    }
+
+
+def _init_worker(weight_shm: str, weight_layout: dict, frame_shm: str, frame_layout: dict) -> None:
+    blocks = [shared_memory.SharedMemory(name=weight_shm), shared_memory.SharedMemory(name=frame_shm)]
+    _WORKER["blocks"] = blocks  # keep the mappings alive for the worker's lifetime
+    _WORKER["gold"] = _views(blocks[0], weight_layout)
+    _WORKER["frames"] = _views(blocks[1], frame_layout)["frames"]
+
+
+def _score_shard(bounds: Tuple[int, int]) -> Tuple[int, np.ndarray, np.ndarray]:
+    start, stop = bounds
+    frames = _WORKER["frames"][start:stop]
+    scores, decisions = score_frames(frames, _WORKER["gold"])
+    return start, scores, decisions
+
+
+def score_dataset(frames: np.ndarray, gold: dict, workers: int, shard: int) -> Tuple[np.ndarray, np.ndarray]:
+    count = frames.shape[0]
+    if workers <= 1 or count <= shard:
+        return score_frames(frames, gold)
+
+    scores = np.empty(count, dtype=np.int16)
+    decisions = np.empty(count, dtype=np.int16)
+    weight_block, weight_layout = _to_shared({key: np.asarray(gold[key]) for key in DISC_KEYS})
+    frame_block, frame_layout = _to_shared({"frames": np.ascontiguousarray(frames, dtype=np.int16)})
+    try:
+        init_args = (weight_block.name, weight_layout, frame_block.name, frame_layout)
+        bounds = [(start, min(start + shard, count)) for start in range(0, count, shard)]
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init_args) as pool:
+            for start, shard_scores, shard_flags in pool.map(_score_shard, bounds):
+                scores[start : start + shard_scores.size] = shard_scores
+                decisions[start : start + shard_flags.size] = shard_flags
+    finally:
+        for block in (weight_block, frame_block):
+            block.close()
+            block.unlink()
+    return scores, decisions
+
+
+def write_scores(path: Path, names: List[str], scores: np.ndarray, decisions: np.ndarray) -> None:
+    with path.open("w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["index", "name", "score_hex", "score", "decision"])
+        for idx, (name, score, flag) in enumerate(zip(names, scores.tolist(), decisions.tolist())):
+            writer.writerow([idx, name, f"{score & 0xFFFF:04x}", f"{score / golden.ONE_Q:.6f}", flag])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Score 28x28 frames with the fixed-point discriminator")
+    parser.add_argument("dataset", type=Path, help="Frame file or directory of frame files")
+    parser.add_argument("--out", type=Path, default=None, help="CSV output (default: <dataset>.scores.csv)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard", type=int, default=4096, help="Frames per worker task")
+    parser.add_argument("--weights", choices=("hex", "cache", "bundle"), default="cache")
+    args = parser.parse_args()
+    if args.shard <= 0:
+        raise SystemExit("--shard must be positive")
+
+    names, frames = load_frames(args.dataset)
+    gold = golden.load_golden_weights(args.weights, as_lists=False, keys=DISC_KEYS)
+    scores, decisions = score_dataset(frames, gold, args.workers, args.shard)
+
+    out = args.out or args.dataset.with_name(args.dataset.name + ".scores.csv")
+    write_scores(out, names, scores, decisions)
+    real = int(decisions.sum())
+    print(f"Scored {len(names)} frames: {real} real / {len(names) - real} fake -> {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""Incremental, parallel iverilog regression runner.
+
+Testbenches are discovered under tb/ and src/layers (``*_tb.v``). For each one
+the runner finds the RTL it instantiates, follows the `include graph from
+there (relative to the including file, as ``-grelative-include`` does), and
+resolves every $readmemh path, including ``{`HEX_DATA_ROOT,"/x.hex"}``
+concatenations and ``localparam string`` paths. Two content hashes follow from
+that:
+
+* the compile key covers the simulator, its flags and the source closure, and
+  names the cached ``.vvp`` under build/tb_cache/vvp;
+* the run key adds the data files and names the cached result.
+
+A testbench whose run key has a stored result is not run again. A data-only
+change reruns the cached ``.vvp`` without recompiling. Stale testbenches run
+in a thread pool, from the repository root as the manual flow does. The
+PASS/FAIL verdicts and wall-clock times are printed and written to
+build/tb_report.json.
+
+    python tools/tb_runner.py run                  # stale testbenches, all cores
+    python tools/tb_runner.py run --only 'layer*' --force
+    python tools/tb_runner.py list                 # closure and data per testbench
+    python tools/tb_runner.py selftest             # runner checks against the stub simulator
+
+``--stub`` swaps iverilog/vvp for a small simulator built into this script
+(the ``stub-iverilog`` and ``stub-vvp`` commands). ``selftest`` uses it on a
+scratch tree to check discovery, caching and invalidation without iverilog.
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = REPO_ROOT / "build" / "tb_cache"
+REPORT_PATH = REPO_ROOT / "build" / "tb_report.json"
+
+TB_GLOBS = ("tb/*_tb.v", "src/layers/*_tb.v")
+RTL_GLOBS = ("src/*/*.v",)
+IVERILOG_FLAGS = ("-g2012", "-grelative-include")
+DEFAULT_TIMEOUT_S = 1800.0
+STUB_REVISION = "1"
+
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+_INCLUDE_RE = re.compile(r'^[ \t]*`include[ \t]+"([^"]+)"', re.M)
+_MODULE_RE = re.compile(r"^[ \t]*module[ \t]+(\w+)", re.M)
+_INSTANCE_RE = re.compile(r"^[ \t]*(\w+)\s*(?:#|\w+\s*\()", re.M)
+_READMEM_RE = re.compile(r"\$readmem[hb]\s*\(\s*(\{[^}]*\}|[^,]+?)\s*,")
+_DEFINE_RE = re.compile(r'`define[ \t]+(\w+)[ \t]+"([^"]*)"')
+_STRING_PARAM_RE = re.compile(r'(?:localparam|parameter)\s+string\s+(\w+)\s*=\s*"([^"]*)"')
+_PASS_RE = re.compile(r"\bPASS(?:ED)?\b")
+_FAIL_RE = re.compile(r"\bFAIL(?:ED)?\b|^(?:ERROR|FATAL)\b", re.M)
+
+
+class Testbench(NamedTuple):
+    name: str
+    tb: Path
+    roots: Tuple[Path, ...]    # RTL files given to the compiler after the testbench
+    sources: Tuple[Path, ...]  # full `include closure, sorted
+    data: Tuple[Path, ...]     # files read through $readmemh/$readmemb
+    unresolved: Tuple[str, ...]
+
+
+class Simulator(NamedTuple):
+    compile: Tuple[str, ...]  # prefix; "-o out.vvp" and the files are appended
+    run: Tuple[str, ...]      # prefix; the .vvp path is appended
+    ident: str                # version string folded into every key
+
+
+class Result(NamedTuple):
+    name: str
+    status: str     # PASS, FAIL, RAN (no verdict printed), COMPILE-ERROR, TIMEOUT
+    seconds: float  # compile + run wall clock of the run that produced it
+    cached: bool
+    compiled: bool
+    key: str
+    log: str
+
+
+# ---------------------------------------------------------------------------
+# Source scanning
+# ---------------------------------------------------------------------------
+
+def _code(path: Path) -> str:
+    return _COMMENT_RE.sub("", path.read_text(errors="replace"))
+
+
+def resolve_include(name: str, including: Path, root: Path) -> Path:
+    for base in (including.parent, root):
+        candidate = (base / name).resolve()
+        if candidate.exists():
+            return candidate
+    raise SystemExit(f"{including}: cannot resolve `include \"{name}\"")
+
+
+def include_closure(files: Iterable[Path], root: Path) -> List[Path]:
+    """Every file reachable from `files` through `include, the files themselves first."""
+    seen: Dict[Path, None] = {}
+    stack = [Path(f).resolve() for f in files]
+    while stack:
+        path = stack.pop(0)
+        if path in seen:
+            continue
+        seen[path] = None
+        stack.extend(resolve_include(name, path, root) for name in _INCLUDE_RE.findall(_code(path)))
+    return list(seen)
+
+
+def memory_files(sources: Sequence[Path], root: Path) -> Tuple[List[Path], List[str]]:
+    """Paths read by $readmemh/$readmemb in `sources`, relative to the run directory `root`."""
+    defines: Dict[str, str] = {}
+    strings: Dict[str, str] = {}
+    codes = [_code(path) for path in sources]
+    for code in codes:
+        for name, value in _DEFINE_RE.findall(code):
+            defines.setdefault(name, value)
+        for name, value in _STRING_PARAM_RE.findall(code):
+            strings.setdefault(name, value)
+
+    found: Dict[Path, None] = {}
+    unresolved: List[str] = []
+    for code in codes:
+        for arg in _READMEM_RE.findall(code):
+            parts = [p.strip() for p in arg.strip("{}").split(",")]
+            text = ""
+            for part in parts:
+                if part.startswith('"') and part.endswith('"'):
+                    text += part[1:-1]
+                elif part.startswith("`") and part[1:] in defines:
+                    text += defines[part[1:]]
+                elif part in strings:
+                    text += strings[part]
+                else:
+                    unresolved.append(arg)
+                    break
+            else:
+                found[(root / text).resolve()] = None
+    return list(found), unresolved
+
+
+def module_index(root: Path) -> Dict[str, Path]:
+    index: Dict[str, Path] = {}
+    for pattern in RTL_GLOBS:
+        for path in sorted(root.glob(pattern)):
+            if path.name.endswith("_tb.v"):
+                continue
+            for module in _MODULE_RE.findall(_code(path)):
+                index.setdefault(module, path.resolve())
+    return index
+
+
+def discover(root: Path = REPO_ROOT) -> List[Testbench]:
+    modules = module_index(root)
+    benches: List[Testbench] = []
+    for pattern in TB_GLOBS:
+        for tb in sorted(root.glob(pattern)):
+            tb = tb.resolve()
+            wanted = [modules[m] for m in _INSTANCE_RE.findall(_code(tb)) if m in modules]
+            candidates = list(dict.fromkeys(p for p in wanted if p != tb))
+            closures = {p: set(include_closure([p], root)) for p in candidates}
+            roots = tuple(p for p in candidates
+                          if not any(p in closures[q] for q in candidates if q != p))
+            sources = include_closure([tb, *roots], root)
+            data, unresolved = memory_files(sources, root)
+            benches.append(Testbench(tb.stem, tb, roots, tuple(sorted(sources)), tuple(sorted(data)),
+                                     tuple(unresolved)))
+    return benches
+
+
+# ---------------------------------------------------------------------------
+# Keys and cache
+# ---------------------------------------------------------------------------
+
+class Hasher:
+    """SHA-256 of file contents, memoised for one session."""
+
+    def __init__(self) -> None:
+        self._memo: Dict[Path, str] = {}
+
+    def __call__(self, path: Path) -> str:
+        if path not in self._memo:
+            try:
+                self._memo[path] = hashlib.sha256(path.read_bytes()).hexdigest()
+            except FileNotFoundError:
+                self._memo[path] = "missing"
+        return self._memo[path]
+
+
+def _digest(payload: object) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:24]
+
+
+def _rel(path: Path, root: Path) -> str:
+    try:
+        return path.relative_to(root.resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def compile_key(bench: Testbench, sim: Simulator, digest: Hasher, root: Path) -> str:
+    return _digest({
+        "sim": sim.ident,
+        "compile": list(sim.compile[1:]),
+        "order": [_rel(p, root) for p in (bench.tb, *bench.roots)],
+        "sources": {_rel(p, root): digest(p) for p in bench.sources},
+    })
+
+
+def run_key(bench: Testbench, ckey: str, sim: Simulator, digest: Hasher, root: Path) -> str:
+    return _digest({
+        "compile": ckey,
+        "run": list(sim.run[1:]),
+        "data": {_rel(p, root): digest(p) for p in bench.data},
+    })
+
+
+def verdict(output: str, returncode: int) -> str:
+    if returncode != 0 or _FAIL_RE.search(output):
+        return "FAIL"
+    return "PASS" if _PASS_RE.search(output) else "RAN"
+
+
+# ---------------------------------------------------------------------------
+# Simulators
+# ---------------------------------------------------------------------------
+
+def iverilog_simulator() -> Simulator:
+    if shutil.which("iverilog") is None or shutil.which("vvp") is None:
+        raise SystemExit("iverilog/vvp not found on PATH (use --stub to exercise the runner without them)")
+    version = subprocess.run(["iverilog", "-V"], capture_output=True, text=True).stdout.splitlines()
+    return Simulator(("iverilog", *IVERILOG_FLAGS), ("vvp", "-n"), version[0] if version else "iverilog")
+
+
+def stub_simulator() -> Simulator:
+    script = str(Path(__file__).resolve())
+    return Simulator((sys.executable, script, "stub-iverilog", *IVERILOG_FLAGS),
+                     (sys.executable, script, "stub-vvp"), f"stub-{STUB_REVISION}")
+
+
+def stub_iverilog(argv: Sequence[str]) -> int:
+    """Stand-in compiler: records the include closure; "STUB_COMPILE_ERROR" in any file fails it."""
+    parser = argparse.ArgumentParser(prog="stub-iverilog")
+    parser.add_argument("-o", dest="out", required=True)
+    parser.add_argument("files", nargs="+")
+    args, _ = parser.parse_known_args(argv)
+    sources = include_closure(map(Path, args.files), Path.cwd())
+    for path in sources:
+        if "STUB_COMPILE_ERROR" in path.read_text():
+            print(f"{path}:1: syntax error")
+            return 1
+    Path(args.out).write_text(json.dumps({"sources": [str(p) for p in sources]}))
+    return 0
+
+
+def stub_vvp(argv: Sequence[str]) -> int:
+    """Stand-in simulator: FAIL if any compiled source says "STUB_FAIL", else PASS."""
+    image = json.loads(Path(argv[-1]).read_text())
+    failing = [s for s in image["sources"] if "STUB_FAIL" in Path(s).read_text()]
+    print(f"[TB] FAIL: {len(failing)} stub failure(s)" if failing else "[TB] PASS: stub")
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _run(argv: Sequence[str], cwd: Path, timeout: float) -> Tuple[int, str]:
+    proc = subprocess.run(list(argv), cwd=cwd, capture_output=True, text=True, timeout=timeout)
+    return proc.returncode, proc.stdout + proc.stderr
+
+
+def run_bench(bench: Testbench, sim: Simulator, root: Path, cache_dir: Path,
+              timeout: float, force: bool = False, digest: Optional[Hasher] = None) -> Result:
+    digest = digest or Hasher()
+    ckey = compile_key(bench, sim, digest, root)
+    rkey = run_key(bench, ckey, sim, digest, root)
+    result_path = cache_dir / "results" / f"{rkey}.json"
+    if result_path.exists() and not force:
+        stored = json.loads(result_path.read_text())
+        return Result(**{**stored, "name": bench.name, "cached": True, "compiled": False})
+
+    vvp = cache_dir / "vvp" / f"{ckey}.vvp"
+    log_path = cache_dir / "logs" / f"{bench.name}.log"
+    for path in (vvp, log_path, result_path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    compiled = False
+    log = ""
+    status = ""
+    try:
+        if force or not vvp.exists():
+            tmp = vvp.with_suffix(f".{os.getpid()}.tmp")
+            code, log = _run([*sim.compile, "-o", str(tmp), str(bench.tb), *map(str, bench.roots)],
+                             root, timeout)
+            compiled = True
+            if code != 0:
+                tmp.unlink(missing_ok=True)
+                status = "COMPILE-ERROR"
+            else:
+                tmp.replace(vvp)
+        if not status:
+            code, out = _run([*sim.run, str(vvp)], root, timeout)
+            log += out
+            status = verdict(out, code)
+    except subprocess.TimeoutExpired:
+        status = "TIMEOUT"
+    seconds = time.perf_counter() - start
+    log_path.write_text(log)
+    result = Result(bench.name, status, seconds, False, compiled, rkey, _rel(log_path, root))
+    if status != "TIMEOUT":
+        result_path.write_text(json.dumps(result._asdict(), indent=2))
+    return result
+
+
+def run_all(benches: Sequence[Testbench], sim: Simulator, root: Path = REPO_ROOT,
+            cache_dir: Path = CACHE_DIR, jobs: int = 0, timeout: float = DEFAULT_TIMEOUT_S,
+            force: bool = False) -> List[Result]:
+    jobs = jobs or os.cpu_count() or 1
+    digest = Hasher()  # the weight dumps are shared by most testbenches
+    with ThreadPoolExecutor(jobs) as pool:
+        futures = [pool.submit(run_bench, b, sim, root, cache_dir, timeout, force, digest) for b in benches]
+        return [f.result() for f in futures]
+
+
+def print_report(results: Sequence[Result], wall: float) -> None:
+    print(f"{'testbench':28s} {'status':13s} {'seconds':>9s}  source")
+    for r in results:
+        source = "cached" if r.cached else ("compiled+ran" if r.compiled else "ran (cached vvp)")
+        print(f"{r.name:28s} {r.status:13s} {r.seconds:9.2f}  {source}")
+    counts: Dict[str, int] = {}
+    for r in results:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    summary = ", ".join(f"{n} {s}" for s, n in sorted(counts.items()))
+    fresh = sum(not r.cached for r in results)
+    print(f"{len(results)} testbenches ({summary}); {fresh} ran in {wall:.2f} s wall clock")
+
+
+def write_report(results: Sequence[Result], wall: float, sim: Simulator, path: Path = REPORT_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "simulator": sim.ident,
+        "wall_s": wall,
+        "results": [r._asdict() for r in results],
+    }, indent=2))
+
+
+def failed(results: Sequence[Result]) -> List[Result]:
+    return [r for r in results if r.status not in ("PASS", "RAN")]
+
+
+# ---------------------------------------------------------------------------
+# Self-test against the stub simulator
+# ---------------------------------------------------------------------------
+
+_SELFTEST_FILES = {
+    "src/lib/leaf.v": '`ifndef DATA_ROOT\n`define DATA_ROOT "src/data"\n`endif\n'
+                      'module leaf;\n  reg [15:0] mem [0:1];\n'
+                      '  initial $readmemh({`DATA_ROOT,"/w.hex"}, mem);\nendmodule\n',
+    "src/lib/top.v": '`ifndef TOP_LEAF_INCLUDED\n`define TOP_LEAF_INCLUDED\n`include "leaf.v"\n`endif\n'
+                     "module top;\n  leaf u_leaf ();\nendmodule\n",
+    "tb/top_tb.v": 'module top_tb;\n  localparam string EXTRA = "src/data/extra.mem";\n'
+                   "  reg [15:0] x [0:0];\n  top dut ();\n  initial $readmemh(EXTRA, x);\nendmodule\n",
+    "tb/leaf_tb.v": "module leaf_tb;\n  leaf uut ();\nendmodule\n",
+    "src/data/w.hex": "0001\n0002\n",
+    "src/data/extra.mem": "0003\n",
+}
+
+
+def selftest() -> None:
+    def check(cond: bool, what: str) -> None:
+        if not cond:
+            raise SystemExit(f"[FAIL] {what}")
+        print(f"[ OK ] {what}")
+
+    sim = stub_simulator()
+    with tempfile.TemporaryDirectory(prefix="ganmind_tb_runner_") as tmp:
+        root = Path(tmp).resolve()
+        for rel, text in _SELFTEST_FILES.items():
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            (root / rel).write_text(text)
+        cache = root / "build" / "tb_cache"
+
+        benches = {b.name: b for b in discover(root)}
+        top = benches["top_tb"]
+        check(sorted(benches) == ["leaf_tb", "top_tb"], "discovers both testbenches")
+        check(top.roots == (root / "src/lib/top.v",), "top_tb compiles against top.v only (leaf.v is included)")
+        check(set(top.sources) == {root / "tb/top_tb.v", root / "src/lib/top.v", root / "src/lib/leaf.v"},
+              "include closure of top_tb")
+        check(set(top.data) == {root / "src/data/w.hex", root / "src/data/extra.mem"},
+              "resolves `define and localparam string $readmemh paths")
+
+        def run() -> Dict[str, Result]:
+            return {r.name: r for r in run_all(list(discover(root)), sim, root, cache, jobs=2, timeout=60)}
+
+        first = run()
+        check(all(r.status == "PASS" and r.compiled and not r.cached for r in first.values()),
+              "first run compiles and passes everything")
+        second = run()
+        check(all(r.cached for r in second.values()), "second run is served from the cache")
+
+        (root / "src/data/w.hex").write_text("0001\n0004\n")
+        third = run()
+        check(all(not r.cached and not r.compiled for r in third.values()),
+              "data change reruns the cached .vvp without recompiling")
+
+        (root / "src/lib/top.v").write_text(_SELFTEST_FILES["src/lib/top.v"] + "// STUB_FAIL\n")
+        fourth = run()
+        check(fourth["top_tb"].compiled and fourth["top_tb"].status == "FAIL", "edited include is recompiled")
+        check(fourth["leaf_tb"].cached, "unaffected testbench stays cached")
+
+        (root / "src/lib/leaf.v").write_text(_SELFTEST_FILES["src/lib/leaf.v"] + "// STUB_COMPILE_ERROR\n")
+        fifth = run()
+        check(all(r.status == "COMPILE-ERROR" for r in fifth.values()), "compile errors are reported")
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def _select(benches: Sequence[Testbench], patterns: Optional[List[str]]) -> List[Testbench]:
+    if not patterns:
+        return list(benches)
+    chosen = [b for b in benches if any(fnmatch.fnmatchcase(b.name, p) for p in patterns)]
+    if not chosen:
+        raise SystemExit("No testbench matches --only")
+    return chosen
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["stub-iverilog"]:
+        raise SystemExit(stub_iverilog(argv[1:]))
+    if argv[:1] == ["stub-vvp"]:
+        raise SystemExit(stub_vvp(argv[1:]))
+
+    parser = argparse.ArgumentParser(description="Incremental iverilog regression runner")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    parser.add_argument("--stub", action="store_true", help="Use the built-in stub simulator")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_p = sub.add_parser("run", help="Compile and run stale testbenches")
+    run_p.add_argument("--only", action="append", default=None, help="fnmatch pattern on names (repeatable)")
+    run_p.add_argument("--jobs", type=int, default=0, help="Parallel testbenches (default: all cores)")
+    run_p.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S, help="Seconds per compile or run")
+    run_p.add_argument("--force", action="store_true", help="Ignore cached .vvp files and results")
+    run_p.add_argument("--report", type=Path, default=REPORT_PATH)
+    list_p = sub.add_parser("list", help="Show each testbench's roots, closure and data files")
+    list_p.add_argument("--only", action="append", default=None)
+    sub.add_parser("selftest", help="Check discovery and caching against the stub simulator")
+    args = parser.parse_args(argv)
+
+    if args.command == "selftest":
+        selftest()
+        return
+    benches = _select(discover(), args.only)
+    if args.command == "list":
+        for bench in benches:
+            roots = " ".join(_rel(p, REPO_ROOT) for p in bench.roots)
+            print(f"{bench.name}: {_rel(bench.tb, REPO_ROOT)} {roots}")
+            print(f"    {len(bench.sources)} sources, {len(bench.data)} data files")
+            for path in bench.data:
+                print(f"      {_rel(path, REPO_ROOT)}{'' if path.exists() else '  (missing)'}")
+            for arg in bench.unresolved:
+                print(f"      [WARN] unresolved $readmemh path {arg}")
+        return
+
+    sim = stub_simulator() if args.stub else iverilog_simulator()
+    start = time.perf_counter()
+    results = run_all(benches, sim, REPO_ROOT, args.cache_dir, args.jobs, args.timeout, args.force)
+    wall = time.perf_counter() - start
+    print_report(results, wall)
+    write_report(results, wall, sim, args.report)
+    bad = failed(results)
+    for r in bad:
+        print(f"[{r.status}] {r.name}: see {r.log}")
+    if bad:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
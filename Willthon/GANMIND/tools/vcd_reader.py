@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Streaming reader for the VCD dumps the testbenches write under vcd/.
+
+The header (scopes and ``$var`` declarations) is parsed once into a signal
+index: full hierarchical name -> (id code, width). Value changes are never
+materialized wholesale. ``VcdFile.query`` makes one pass over the mmap'd
+body with a compiled regex that matches only the id codes of the requested
+signals, plus ``#time`` markers. It works through fixed-size windows ending on
+a line boundary, so memory is bounded by the window plus the requested
+results. Each signal comes back as columnar numpy arrays (times, values,
+unknown mask).
+
+On top of that, ``handshakes`` pairs rising edges of a scope's ``start`` and
+``done`` into busy intervals and ``busy_percent`` turns those into busy/idle
+percentages per stage (gan_serial_top's u_generator, u_discriminator, ...).
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import fnmatch
+import mmap
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+VCD_DIR = REPO_ROOT / "vcd"
+
+WINDOW = 32 << 20  # bytes scanned per regex pass
+_TIME_RE = re.compile(rb"^#(\d+)", re.M)
+_UNKNOWN = b"xXzZ"
+_UNKNOWN_AS_ZERO = bytes.maketrans(_UNKNOWN, b"0000")
+_LFS_POINTER = b"version https://git-lfs"
+
+
+class Signal(NamedTuple):
+    name: str      # hierarchical, e.g. gan_serial_tb.dut.u_generator.done
+    scope: str
+    code: str      # VCD identifier code
+    width: int
+    kind: str      # wire, reg, integer, ...
+
+
+class Trace(NamedTuple):
+    """Value changes of one signal: values are uint64 (object for width > 64)."""
+
+    times: np.ndarray
+    values: np.ndarray
+    unknown: np.ndarray  # True where the value had x/z bits (value reads as 0)
+
+
+class Interval(NamedTuple):
+    scope: str
+    starts: np.ndarray  # time of each start rising edge that opened an interval
+    ends: np.ndarray    # time of the done rising edge that closed it
+
+
+class VcdFile:
+    """Memory-mapped VCD with a signal index built from the header."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[: len(_LFS_POINTER)] == _LFS_POINTER:
+            self._mm.close()
+            raise ValueError(f"{path} is a Git LFS pointer; run `git lfs pull` first")
+        end = self._mm.find(b"$enddefinitions")
+        if end < 0:
+            self._mm.close()
+            raise ValueError(f"{path}: no $enddefinitions in header")
+        self.body_start = self._mm.find(b"$end", end + len(b"$enddefinitions")) + len(b"$end")
+        self.timescale = ""
+        self.signals: Dict[str, Signal] = {}
+        self._parse_header(bytes(self._mm[:end]).decode(errors="replace"))
+
+    def _parse_header(self, text: str) -> None:
+        tokens = text.split()
+        scope: List[str] = []
+        pos = 0
+        while pos < len(tokens):
+            tok = tokens[pos]
+            if tok == "$scope":
+                scope.append(tokens[pos + 2])
+                pos += 4
+            elif tok == "$upscope":
+                scope.pop()
+                pos += 2
+            elif tok == "$var":
+                close = tokens.index("$end", pos)
+                kind, width, code, ref = tokens[pos + 1 : pos + 5]
+                scope_name = ".".join(scope)
+                name = f"{scope_name}.{ref}" if scope_name else ref
+                self.signals[name] = Signal(name, scope_name, code, int(width), kind)
+                pos = close + 1
+            elif tok == "$timescale":
+                close = tokens.index("$end", pos)
+                self.timescale = " ".join(tokens[pos + 1 : close])
+                pos = close + 1
+            elif tok.startswith("$"):
+                close = tokens.index("$end", pos) if tok != "$end" else pos
+                pos = close + 1
+            else:
+                pos += 1
+
+    def find(self, pattern: str) -> List[Signal]:
+        """Signals whose full name matches a glob such as ``*.u_generator.*``."""
+        return [sig for name, sig in self.signals.items() if fnmatch.fnmatchcase(name, pattern)]
+
+    def scopes(self) -> List[str]:
+        return sorted({sig.scope for sig in self.signals.values()})
+
+    def _windows(self) -> Iterable[Tuple[int, int]]:
+        size = len(self._mm)
+        start = self.body_start
+        while start < size:
+            stop = min(start + WINDOW, size)
+            if stop < size:
+                newline = self._mm.rfind(b"\n", start, stop)
+                stop = newline + 1 if newline >= start else size
+            yield start, stop
+            start = stop
+
+    def query(self, names: Sequence[str]) -> Dict[str, Trace]:
+        """Columnar value changes for `names` (full signal names), in one pass."""
+        wanted = {name: self.signals[name] for name in names}
+        codes = sorted({sig.code for sig in wanted.values()}, key=len, reverse=True)
+        if not codes:
+            return {}
+        alt = b"|".join(re.escape(code.encode()) for code in codes)
+        change_re = re.compile(rb"^(?:([01xzXZ])|[bB]([01xzXZ]+) |[rR](\S+) )(" + alt + rb")\r?$", re.M)
+
+        found: Dict[str, Tuple[List[int], List[bytes]]] = {code: ([], []) for code in codes}
+        last_time = 0
+        for start, stop in self._windows():
+            marks = [(m.start(), int(m.group(1))) for m in _TIME_RE.finditer(self._mm, start, stop)]
+            mark_pos = np.fromiter((p for p, _ in marks), dtype=np.int64, count=len(marks))
+            mark_time = np.fromiter((t for _, t in marks), dtype=np.int64, count=len(marks))
+            positions: List[int] = []
+            hits: List[Tuple[bytes, bytes]] = []
+            for m in change_re.finditer(self._mm, start, stop):
+                positions.append(m.start())
+                hits.append((m.group(4), m.group(1) or m.group(2) or m.group(3)))
+            if hits:
+                slot = np.searchsorted(mark_pos, np.asarray(positions, dtype=np.int64), side="right") - 1
+                times = np.where(slot >= 0, mark_time[np.maximum(slot, 0)], last_time)
+                for (code, raw), t in zip(hits, times.tolist()):
+                    bucket = found[code.decode()]
+                    bucket[0].append(t)
+                    bucket[1].append(raw)
+            if marks:
+                last_time = marks[-1][1]
+
+        return {name: _to_trace(sig, *found[sig.code]) for name, sig in wanted.items()}
+
+    def handshakes(self, scopes: Sequence[str] | None = None) -> Dict[str, Interval]:
+        """start->done intervals for every scope that has both signals (or `scopes`)."""
+        if scopes is None:
+            scopes = [s for s in self.scopes() if f"{s}.start" in self.signals and f"{s}.done" in self.signals]
+        names = [f"{s}.{port}" for s in scopes for port in ("start", "done")]
+        traces = self.query(names)
+        return {
+            s: pair_handshakes(s, traces[f"{s}.start"], traces[f"{s}.done"])
+            for s in scopes
+        }
+
+    def end_time(self) -> int:
+        """Time of the last #marker in the dump (scans backwards from the end)."""
+        pos = len(self._mm)
+        while pos > self.body_start:
+            hash_pos = self._mm.rfind(b"\n#", self.body_start, pos)
+            if hash_pos < 0:
+                break
+            line_end = self._mm.find(b"\n", hash_pos + 1)
+            token = self._mm[hash_pos + 2 : line_end if line_end >= 0 else len(self._mm)].strip()
+            if token.isdigit():
+                return int(token)
+            pos = hash_pos
+        return 0
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "VcdFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _to_trace(sig: Signal, times: List[int], raws: List[bytes]) -> Trace:
+    unknown = np.fromiter((any(c in _UNKNOWN for c in raw) for raw in raws), dtype=bool, count=len(raws))
+    cleaned = [raw.translate(_UNKNOWN_AS_ZERO) for raw in raws]
+    if sig.kind == "real":
+        values = np.asarray([float(raw) for raw in cleaned], dtype=np.float64)
+    elif sig.width <= 64:
+        values = np.asarray([int(raw, 2) for raw in cleaned], dtype=np.uint64)
+    else:
+        values = np.asarray([int(raw, 2) for raw in cleaned], dtype=object)
+    return Trace(np.asarray(times, dtype=np.int64), values, unknown)
+
+
+def rising_edges(trace: Trace) -> np.ndarray:
+    """Times at which a 1-bit signal changes to 1 from anything else."""
+    high = (trace.values == 1) & ~trace.unknown
+    prev = np.concatenate(([False], high[:-1]))
+    return trace.times[high & ~prev]
+
+
+def pair_handshakes(scope: str, start: Trace, done: Trace) -> Interval:
+    """Open an interval at the first start edge after the previous done; close on done."""
+    starts = rising_edges(start)
+    dones = rising_edges(done)
+    owner = np.searchsorted(dones, starts, side="right")  # first done after each start
+    keep = owner < dones.size
+    owner, starts = owner[keep], starts[keep]
+    first = np.unique(owner, return_index=True)[1]
+    return Interval(scope, starts[first], dones[owner[first]])
+
+
+def busy_percent(interval: Interval, total_time: int) -> float:
+    """Share of `total_time` the stage spent between start and done."""
+    if not total_time:
+        return 0.0
+    return 100.0 * float((interval.ends - interval.starts).sum()) / total_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect testbench VCD dumps")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    lst = sub.add_parser("list", help="List signals")
+    lst.add_argument("vcd", type=Path)
+    lst.add_argument("--pattern", default="*", help="Glob on full signal names")
+
+    dump = sub.add_parser("dump", help="Value changes of selected signals")
+    dump.add_argument("vcd", type=Path)
+    dump.add_argument("patterns", nargs="+", help="Signal names or globs")
+    dump.add_argument("--csv", type=Path, default=None, help="Write signal,time,value rows here")
+
+    stages = sub.add_parser("stages", help="start/done intervals and busy % per module")
+    stages.add_argument("vcd", type=Path)
+    stages.add_argument("--scope", action="append", default=None, help="Only these scopes")
+
+    args = parser.parse_args()
+    try:
+        vcd = VcdFile(args.vcd)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    with vcd:
+        if args.cmd == "list":
+            for sig in vcd.find(args.pattern):
+                print(f"{sig.name:60s} {sig.kind:8s} [{sig.width}] {sig.code}")
+        elif args.cmd == "dump":
+            names = list(dict.fromkeys(sig.name for pat in args.patterns for sig in vcd.find(pat)))
+            if not names:
+                raise SystemExit("No matching signals")
+            traces = vcd.query(names)
+            if args.csv:
+                with args.csv.open("w", newline="") as fh:
+                    writer = csv.writer(fh)
+                    writer.writerow(["signal", "time", "value", "unknown"])
+                    for name, tr in traces.items():
+                        for t, v, u in zip(tr.times.tolist(), tr.values.tolist(), tr.unknown.tolist()):
+                            writer.writerow([name, t, v, int(u)])
+                print(f"Wrote {sum(tr.times.size for tr in traces.values())} changes to {args.csv}")
+            else:
+                for name, tr in traces.items():
+                    print(f"{name}: {tr.times.size} changes")
+                    for t, v, u in zip(tr.times.tolist()[:20], tr.values.tolist()[:20], tr.unknown.tolist()[:20]):
+                        print(f"  {t:>12d}  {'x' if u else hex(v) if not isinstance(v, float) else v}")
+        elif args.cmd == "stages":
+            total = vcd.end_time()
+            intervals = vcd.handshakes(args.scope)
+            print(f"simulated time: {total} ({vcd.timescale or 'unknown timescale'})")
+            for scope, iv in intervals.items():
+                durations = iv.ends - iv.starts
+                busy = busy_percent(iv, total)
+                mean = f"{durations.mean():.1f}" if durations.size else "-"
+                print(f"{scope:50s} runs={iv.starts.size:<5d} mean={mean:>10s} busy={busy:5.1f}% idle={100 - busy:5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Parse Vivado timing, utilization and power reports into a SQLite history.
+
+Each report's type comes from the ``| Command :`` line in its header
+(report_timing_summary, report_utilization, report_power), so the
+``*_timing_summary_routed.rpt`` files in the project run directories and the
+ad-hoc ``build/*_timing.rpt`` / ``*_util.rpt`` exports are all recognised. A
+report becomes one record: design, device, design state, report date, and a
+flat set of numeric metrics:
+
+    timing       wns_ns, tns_ns, tns_failing, whs_ns, ths_ns, ths_failing,
+                 period_ns, fmax_mhz (clock metrics only when constrained)
+    utilization  luts, registers, bram_tiles, dsps (+ *_pct of the device)
+    power        total_w, dynamic_w, static_w, junction_c
+
+``ingest`` walks the tree and stores every report in build/vivado_history.sqlite.
+Files whose size and mtime are unchanged since the last ingest are skipped
+without being read. A file rewritten by a new Vivado run is stored as a new
+report, keyed by content hash, so its history is kept. ``trend`` and
+``regress`` query that history per design.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = REPO_ROOT / "build" / "vivado_history.sqlite"
+
+_HEADER_RE = re.compile(r"^\|[ \t]*([A-Za-z ]+?)[ \t]*:[ \t]*(.*?)[ \t]*$", re.M)
+_TIMING_ROW_RE = re.compile(r"^\s*WNS\(ns\).*\n\s*-+.*\n(.*)$", re.M)
+_CLOCK_RE = re.compile(r"^(\w+)\s+\{[\d.\s]+\}\s+([\d.]+)\s+([\d.]+)", re.M)
+_TABLE_ROW_RE = re.compile(r"^\|[ \t]*([^|\n]+?)[ \t]*\|[ \t]*([^|\n]+?)[ \t]*\|(.*)$", re.M)
+
+# Metrics where a larger value is an improvement; everything else is a cost.
+HIGHER_IS_BETTER = {"wns_ns", "tns_ns", "whs_ns", "ths_ns", "fmax_mhz"}
+
+_UTIL_ROWS = {
+    "Slice LUTs": "luts",
+    "Slice LUTs*": "luts",
+    "Slice Registers": "registers",
+    "Block RAM Tile": "bram_tiles",
+    "DSPs": "dsps",
+}
+_POWER_ROWS = {
+    "Total On-Chip Power (W)": "total_w",
+    "Dynamic (W)": "dynamic_w",
+    "Device Static (W)": "static_w",
+    "Junction Temperature (C)": "junction_c",
+}
+_KINDS = {
+    "report_timing_summary": "timing",
+    "report_utilization": "utilization",
+    "report_power": "power",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path     TEXT PRIMARY KEY,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reports (
+    id      INTEGER PRIMARY KEY,
+    sha256  TEXT UNIQUE NOT NULL,
+    path    TEXT NOT NULL,
+    kind    TEXT NOT NULL,
+    design  TEXT NOT NULL,
+    device  TEXT,
+    state   TEXT,
+    date    TEXT,
+    tool    TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    report_id INTEGER NOT NULL REFERENCES reports(id),
+    name      TEXT NOT NULL,
+    value     REAL,
+    PRIMARY KEY (report_id, name)
+);
+CREATE INDEX IF NOT EXISTS reports_design ON reports(design, kind, date);
+"""
+
+
+class Report(NamedTuple):
+    path: str
+    kind: str
+    design: str
+    device: str
+    state: str
+    date: str   # ISO 8601, "" when the header has no date
+    tool: str
+    metrics: Dict[str, Optional[float]]
+
+
+def _number(text: str) -> Optional[float]:
+    """First numeric token of a cell; None for NA/inf/blank."""
+    token = text.split()[0] if text.split() else ""
+    try:
+        value = float(token)
+    except ValueError:
+        return None
+    return None if value in (float("inf"), float("-inf")) or value != value else value
+
+
+def _header(text: str) -> Dict[str, str]:
+    head = text[: text.find("\n\n") if "\n\n" in text else len(text)]
+    return {key.strip(): value for key, value in _HEADER_RE.findall(head)}
+
+
+def _iso_date(raw: str) -> str:
+    try:
+        return datetime.strptime(" ".join(raw.split()), "%a %b %d %H:%M:%S %Y").isoformat()
+    except ValueError:
+        return ""
+
+
+def _timing_metrics(text: str) -> Dict[str, Optional[float]]:
+    section = text.split("Design Timing Summary", 1)[-1]
+    row = _TIMING_ROW_RE.search(section)
+    cells = row.group(1).split() if row else []
+    names = ("wns_ns", "tns_ns", "tns_failing", None, "whs_ns", "ths_ns", "ths_failing")
+    metrics = {name: _number(cell) for name, cell in zip(names, cells) if name}
+    clock = _CLOCK_RE.search(text.split("Clock Summary", 1)[-1]) if "Clock Summary" in text else None
+    if clock:
+        metrics["period_ns"] = float(clock.group(2))
+        wns = metrics.get("wns_ns")
+        if wns is not None:
+            metrics["fmax_mhz"] = 1000.0 / (metrics["period_ns"] - wns)
+    return metrics
+
+
+def _table_metrics(text: str, rows: Dict[str, str], with_pct: bool) -> Dict[str, Optional[float]]:
+    metrics: Dict[str, Optional[float]] = {}
+    for label, first, rest in _TABLE_ROW_RE.findall(text):
+        name = rows.get(label)
+        if name is None or name in metrics:
+            continue
+        metrics[name] = _number(first)
+        if with_pct:
+            cells = [c.strip() for c in rest.split("|")]
+            if len(cells) >= 4:
+                metrics[f"{name}_pct"] = _number(cells[3])
+    return metrics
+
+
+def parse_report(path: Path, text: Optional[str] = None) -> Optional[Report]:
+    """Structured record for one report, or None if it is not a known type."""
+    text = path.read_text(errors="replace") if text is None else text
+    header = _header(text)
+    command = header.get("Command", "").split()
+    kind = _KINDS.get(command[0]) if command else None
+    if kind is None or "Design" not in header:
+        return None
+    if kind == "timing":
+        metrics = _timing_metrics(text)
+    elif kind == "utilization":
+        metrics = _table_metrics(text, _UTIL_ROWS, with_pct=True)
+    else:
+        metrics = _table_metrics(text, _POWER_ROWS, with_pct=False)
+    return Report(
+        path=str(path),
+        kind=kind,
+        design=header["Design"],
+        device=header.get("Device", ""),
+        state=header.get("Design State", ""),
+        date=_iso_date(header.get("Date", "")),
+        tool=header.get("Tool Version", ""),
+        metrics=metrics,
+    )
+
+
+def find_reports(roots: Sequence[Path]) -> List[Path]:
+    found = set()
+    for root in roots:
+        for path in root.rglob("*.rpt"):
+            if ".Xil" not in path.parts and any(k in path.name for k in ("timing", "util", "power")):
+                found.add(path)
+    return sorted(found)
+
+
+def connect(db_path: Path = DB_PATH) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def ingest(conn: sqlite3.Connection, paths: Iterable[Path]) -> Tuple[int, int]:
+    """Store new or changed reports; returns (reports added, files skipped)."""
+    added = skipped = 0
+    for path in paths:
+        stat = path.stat()
+        key = str(path.resolve().relative_to(REPO_ROOT)) if path.resolve().is_relative_to(REPO_ROOT) else str(path)
+        row = conn.execute("SELECT size, mtime_ns FROM files WHERE path = ?", (key,)).fetchone()
+        if row == (stat.st_size, stat.st_mtime_ns):
+            skipped += 1
+            continue
+        data = path.read_bytes()
+        sha = hashlib.sha256(data).hexdigest()
+        conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (key, stat.st_size, stat.st_mtime_ns, sha))
+        if conn.execute("SELECT 1 FROM reports WHERE sha256 = ?", (sha,)).fetchone():
+            continue
+        report = parse_report(Path(key), data.decode(errors="replace"))
+        if report is None:
+            continue
+        cur = conn.execute(
+            "INSERT INTO reports (sha256, path, kind, design, device, state, date, tool) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (sha, report.path, report.kind, report.design, report.device, report.state, report.date, report.tool),
+        )
+        conn.executemany(
+            "INSERT INTO metrics VALUES (?, ?, ?)",
+            [(cur.lastrowid, name, value) for name, value in report.metrics.items()],
+        )
+        added += 1
+    conn.commit()
+    return added, skipped
+
+
+def trend(conn: sqlite3.Connection, design: str, metric: str, last: int = 10,
+          state: Optional[str] = None) -> List[Tuple[str, str, str, Optional[float]]]:
+    """(date, state, path, value) of `metric` for `design`, newest first.
+
+    `state` (e.g. "Routed", "Synthesized") keeps synthesis estimates and
+    implementation results apart.
+    """
+    return conn.execute(
+        """SELECT r.date, r.state, r.path, m.value FROM metrics m JOIN reports r ON r.id = m.report_id
+           WHERE r.design = ? AND m.name = ? AND (? IS NULL OR r.state = ? COLLATE NOCASE)
+           ORDER BY r.date DESC, r.id DESC LIMIT ?""",
+        (design, metric, state, state, last),
+    ).fetchall()
+
+
+def regressions(conn: sqlite3.Connection, last: int = 5, threshold: float = 5.0) -> List[Tuple[str, str, float, float, float]]:
+    """(design, metric, latest, baseline, change %) where the latest value is worse
+    than the median of up to `last` earlier values by more than `threshold` %.
+    Reports are only compared with others in the same design state."""
+    found = []
+    groups = conn.execute(
+        """SELECT DISTINCT r.design, r.state, m.name FROM metrics m JOIN reports r ON r.id = m.report_id
+           ORDER BY 1, 2, 3"""
+    ).fetchall()
+    for design, state, metric in groups:
+        values = [v for *_, v in trend(conn, design, metric, last + 1, state) if v is not None]
+        if len(values) < 2:
+            continue
+        latest, history = values[0], sorted(values[1:])
+        baseline = history[len(history) // 2]
+        if baseline == 0:
+            continue
+        change = 100.0 * (latest - baseline) / abs(baseline)
+        worse = -change if metric in HIGHER_IS_BETTER else change
+        if worse > threshold:
+            found.append((design, metric, latest, baseline, change))
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vivado report history")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="SQLite file (default: build/vivado_history.sqlite)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    ing = sub.add_parser("ingest", help="Parse new or changed reports under the given roots")
+    ing.add_argument("roots", type=Path, nargs="*", default=[REPO_ROOT])
+
+    show = sub.add_parser("show", help="Parse one report and print its record")
+    show.add_argument("report", type=Path)
+
+    sub.add_parser("list", help="Designs and report counts in the store")
+
+    tr = sub.add_parser("trend", help="One metric of one design over the last N reports")
+    tr.add_argument("design")
+    tr.add_argument("metric", help="e.g. fmax_mhz, wns_ns, luts, dsps, bram_tiles, total_w")
+    tr.add_argument("--last", type=int, default=10)
+    tr.add_argument("--state", default=None, help="Only reports in this design state, e.g. Routed")
+
+    reg = sub.add_parser("regress", help="Metrics whose latest value is worse than recent history")
+    reg.add_argument("--last", type=int, default=5, help="Earlier reports to take the median of")
+    reg.add_argument("--threshold", type=float, default=5.0, help="Percent change that counts")
+
+    args = parser.parse_args()
+
+    if args.cmd == "show":
+        report = parse_report(args.report)
+        if report is None:
+            raise SystemExit(f"{args.report} is not a timing, utilization or power report")
+        print(f"{report.kind} {report.design} ({report.device}, {report.state}) {report.date}")
+        for name, value in report.metrics.items():
+            print(f"  {name:16s} {'-' if value is None else f'{value:g}'}")
+        return
+
+    conn = connect(args.db)
+    try:
+        if args.cmd == "ingest":
+            added, skipped = ingest(conn, find_reports(args.roots))
+            print(f"Ingested {added} new reports ({skipped} unchanged files skipped) into {args.db}")
+        elif args.cmd == "list":
+            for design, kind, count, newest in conn.execute(
+                "SELECT design, kind, COUNT(*), MAX(date) FROM reports GROUP BY design, kind ORDER BY design, kind"
+            ):
+                print(f"{design:32s} {kind:12s} {count:4d} reports, newest {newest or '?'}")
+        elif args.cmd == "trend":
+            rows = trend(conn, args.design, args.metric, args.last, args.state)
+            if not rows:
+                raise SystemExit(f"No {args.metric} recorded for {args.design}")
+            for date, state, path, value in rows:
+                print(f"{date or '?':20s} {state:14s} {'-' if value is None else f'{value:g}':>12s}  {path}")
+        elif args.cmd == "regress":
+            rows = regressions(conn, args.last, args.threshold)
+            for design, metric, latest, baseline, change in rows:
+                print(f"[REGRESS] {design:28s} {metric:14s} {latest:g} vs median {baseline:g} ({change:+.1f}%)")
+            if rows:
+                raise SystemExit(1)
+            print("No regressions")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
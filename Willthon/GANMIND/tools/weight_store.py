@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""Binary weight bundle and hex parse cache for the Q8.8 weight/bias dumps.
+
+The RTL reads its parameters from one-value-per-line ASCII files in
+src/layers/hex_data. Parsing those ~173k lines on every tool run is the slowest
+part of most scripts, so this module offers two faster paths:
+
+* ``compile`` packs the 12 tensors the RTL consumes into a single indexed
+  bundle of little-endian int16 arrays. ``open_bundle`` maps it read-only and
+  hands out zero-copy numpy views shaped (out, in) / (out,).
+* ``load_hex_cached`` parses one hex file and stores the result as ``.npy``
+  under build/hex_cache, keyed by the SHA-256 of the file contents, so an
+  unchanged file is never parsed twice across invocations.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Tuple
+
+import numpy as np
+
+from hex_io import read_hex
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+HEX_DIR = REPO_ROOT / "src" / "layers" / "hex_data"
+BUNDLE_PATH = REPO_ROOT / "build" / "weights.gwb"
+CACHE_DIR = REPO_ROOT / "build" / "hex_cache"
+
+BUNDLE_MAGIC = b"GANWB001"
+BUNDLE_ALIGN = 64
+BUNDLE_DTYPE = "<i2"
+
+# Tensors in the order the RTL consumes them: key -> (hex file, shape).
+# Weight matrices are stored neuron-major, i.e. (out_count, in_count).
+TENSORS: Dict[str, Tuple[str, Tuple[int, ...]]] = {
+    "gen_l1_w": ("layer1_gen_weights.hex", (256, 64)),
+    "gen_l1_b": ("layer1_gen_bias.hex", (256,)),
+    "gen_l2_w": ("Generator_Layer2_Weights_All.hex", (256, 256)),
+    "gen_l2_b": ("Generator_Layer2_Biases_All.hex", (256,)),
+    "gen_l3_w": ("Generator_Layer3_Weights_All.hex", (128, 256)),
+    "gen_l3_b": ("Generator_Layer3_Biases_All.hex", (128,)),
+    "disc_l1_w": ("Discriminator_Layer1_Weights_All.hex", (128, 256)),
+    "disc_l1_b": ("Discriminator_Layer1_Biases_All.hex", (128,)),
+    "disc_l2_w": ("Discriminator_Layer2_Weights_All.hex", (32, 128)),
+    "disc_l2_b": ("Discriminator_Layer2_Biases_All.hex", (32,)),
+    "disc_l3_w": ("Discriminator_Layer3_Weights_All.hex", (1, 32)),
+    "disc_l3_b": ("Discriminator_Layer3_Biases_All.hex", (1,)),
+}
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def parse_hex(path: Path) -> np.ndarray:
+    """Parse a $readmemh-style file into int16, skipping blanks and // lines."""
+    return read_hex(path)
+
+
+def load_hex_cached(path: Path, cache_dir: Path = CACHE_DIR) -> np.ndarray:
+    """Return the int16 contents of `path`, parsing it only on a cache miss."""
+    digest = file_digest(path)
+    cached = cache_dir / f"{digest}.npy"
+    if cached.exists():
+        return np.load(cached, mmap_mode="r")
+    values = parse_hex(path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = cached.with_suffix(".tmp.npy")
+    np.save(tmp, values)
+    tmp.replace(cached)
+    return values
+
+
+def _check_shape(key: str, values: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+    expected = int(np.prod(shape))
+    if values.size != expected:
+        raise ValueError(f"{key}: expected {expected} values for shape {shape}, found {values.size}")
+    return values.reshape(shape)
+
+
+def load_tensors(
+    hex_dir: Path = HEX_DIR,
+    cache_dir: Path | None = CACHE_DIR,
+    keys: Iterable[str] | None = None,
+) -> Dict[str, np.ndarray]:
+    """Load entries of TENSORS (all, or `keys`) from hex files, via the parse cache if given."""
+    tensors: Dict[str, np.ndarray] = {}
+    for key in (TENSORS if keys is None else keys):
+        fname, shape = TENSORS[key]
+        path = hex_dir / fname
+        values = load_hex_cached(path, cache_dir) if cache_dir is not None else parse_hex(path)
+        tensors[key] = _check_shape(key, values, shape)
+    return tensors
+
+
+def _align(offset: int) -> int:
+    return (offset + BUNDLE_ALIGN - 1) // BUNDLE_ALIGN * BUNDLE_ALIGN
+
+
+def compile_bundle(hex_dir: Path = HEX_DIR, out_path: Path = BUNDLE_PATH) -> Path:
+    """Pack TENSORS from the hex files in `hex_dir` into one bundle."""
+    arrays: Dict[str, np.ndarray] = {}
+    digests: Dict[str, str] = {}
+    for key, (fname, shape) in TENSORS.items():
+        path = hex_dir / fname
+        arrays[key] = _check_shape(key, parse_hex(path), shape)
+        digests[key] = file_digest(path)
+    return write_bundle(out_path, arrays, digests)
+
+
+def write_bundle(out_path: Path, arrays: Dict[str, np.ndarray], digests: Dict[str, str]) -> Path:
+    """Write TENSORS-keyed arrays as a bundle: magic, u32 index length, JSON index, data.
+
+    Every array starts on a BUNDLE_ALIGN boundary so mapped views stay aligned.
+    The index records the SHA-256 of each source hex file (`digests`) for
+    staleness checks.
+    """
+    values_list = []
+    entries = []
+    for key, (fname, shape) in TENSORS.items():
+        values_list.append(_check_shape(key, np.asarray(arrays[key]), shape).astype(BUNDLE_DTYPE))
+        entries.append({
+            "key": key,
+            "file": fname,
+            "shape": list(shape),
+            "sha256": digests[key],
+        })
+
+    # Offsets depend on the index size, which depends on the offsets' digits;
+    # iterate until the layout is stable (converges in one or two passes).
+    data_start = 0
+    while True:
+        offset = data_start
+        for entry, values in zip(entries, values_list):
+            entry["offset"] = offset
+            offset = _align(offset + values.nbytes)
+        index = json.dumps({"dtype": BUNDLE_DTYPE, "tensors": entries}).encode()
+        needed = _align(len(BUNDLE_MAGIC) + 4 + len(index))
+        if needed == data_start:
+            break
+        data_start = needed
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+    with tmp.open("wb") as fh:
+        fh.write(BUNDLE_MAGIC)
+        fh.write(struct.pack("<I", len(index)))
+        fh.write(index)
+        for entry, values in zip(entries, values_list):
+            fh.write(b"\0" * (entry["offset"] - fh.tell()))
+            fh.write(values.tobytes())
+    tmp.replace(out_path)
+    return out_path
+
+
+class WeightBundle:
+    """Read-only mapping of a compiled bundle; arrays are views into the mmap."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[: len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a weight bundle")
+        (index_len,) = struct.unpack_from("<I", self._mm, len(BUNDLE_MAGIC))
+        start = len(BUNDLE_MAGIC) + 4
+        index = json.loads(self._mm[start : start + index_len])
+        self.entries = {entry["key"]: entry for entry in index["tensors"]}
+        self._dtype = np.dtype(index["dtype"])
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        entry = self.entries[key]
+        shape = tuple(entry["shape"])
+        count = int(np.prod(shape))
+        return np.frombuffer(self._mm, dtype=self._dtype, count=count, offset=entry["offset"]).reshape(shape)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def keys(self):
+        return self.entries.keys()
+
+    def stale_entries(self, hex_dir: Path = HEX_DIR) -> list:
+        """Keys whose source hex file is missing or changed since compilation."""
+        stale = []
+        for key, entry in self.entries.items():
+            path = hex_dir / entry["file"]
+            if not path.exists() or file_digest(path) != entry["sha256"]:
+                stale.append(key)
+        return stale
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # caller still holds views; the map is released with the last one
+
+    def __enter__(self) -> "WeightBundle":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_bundle(path: Path = BUNDLE_PATH) -> WeightBundle:
+    return WeightBundle(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile/inspect the binary weight bundle")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    comp = sub.add_parser("compile", help="Pack hex_data tensors into a bundle")
+    comp.add_argument("--hex-dir", type=Path, default=HEX_DIR)
+    comp.add_argument("--out", type=Path, default=BUNDLE_PATH)
+
+    info = sub.add_parser("info", help="List bundle contents and staleness")
+    info.add_argument("bundle", type=Path, nargs="?", default=BUNDLE_PATH)
+    info.add_argument("--hex-dir", type=Path, default=HEX_DIR)
+
+    args = parser.parse_args()
+
+    if args.cmd == "compile":
+        out = compile_bundle(args.hex_dir, args.out)
+        print(f"Wrote {len(TENSORS)} tensors ({out.stat().st_size} bytes) to {out}")
+    elif args.cmd == "info":
+        with open_bundle(args.bundle) as bundle:
+            stale = set(bundle.stale_entries(args.hex_dir))
+            for key, entry in bundle.entries.items():
+                flag = "STALE" if key in stale else "ok"
+                values = bundle[key]  # zero-copy view, still alive when the bundle closes
+                print(f"{key:10s} {str(tuple(entry['shape'])):12s} @{entry['offset']:<8d} "
+                      f"[{values.min():6d}, {values.max():6d}] {entry['file']} [{flag}]")
+
+
+if __name__ == "__main__":
+    main()